@@ -0,0 +1,301 @@
+"""Benchmarks for the hot paths of geom.
+
+Each benchmark times one operation, reports how many times per second it
+runs and how many bytes it allocates per call, and can save the results as
+JSON or compare them against a previously saved baseline::
+
+    python3 benchmarks/bench_geom.py --save baseline.json
+    python3 benchmarks/bench_geom.py --baseline baseline.json
+
+When comparing, the script exits with status 1 if any benchmark runs slower
+than the baseline by more than the tolerance, widened by how much the timed
+runs of both the benchmark and the baseline varied. Only the standard
+library is needed, so the suite runs offline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import geom
+
+BENCHMARKS = []
+"""The registered benchmarks as ``(name, setup)`` pairs.
+
+`setup()` prepares the inputs and returns the zero-argument callable to time.
+"""
+
+def benchmark(name, **params):
+    """Register the decorated setup function once for each parameter set.
+
+    Each keyword maps a parameter to the values it takes, and the benchmark
+    is registered for every combination of values, e.g. ``dim=(2, 3)``
+    registers ``name[dim=2]`` and ``name[dim=3]``.
+    """
+    def register(setup):
+        combos = [{}]
+        for key, values in params.items():
+            combos = [dict(c, **{key: v}) for c in combos for v in values]
+        for combo in combos:
+            label = ",".join("{}={}".format(k, v) for k, v in combo.items())
+            full = "{}[{}]".format(name, label) if label else name
+            BENCHMARKS.append((full, lambda c=combo: setup(**c)))
+        return setup
+    return register
+
+def _vector(dim, seed):
+    rng = random.Random(seed)
+    return geom.Vector([rng.uniform(-10, 10) for _ in range(dim)])
+
+def _circles(n, seed):
+    rng = random.Random(seed)
+    return [geom.Circle((rng.uniform(-100, 100), rng.uniform(-100, 100)),
+                        rng.uniform(0, 5)) for _ in range(n)]
+
+DIMS = (2, 3, 16)
+
+@benchmark("Vector()", dim=DIMS)
+def bench_vector_init(dim):
+    components = list(_vector(dim, 0))
+    return lambda: geom.Vector(components)
+
+@benchmark("is_numeric", size=(1, 3, 100))
+def bench_is_numeric(size):
+    value = 3.0 if size == 1 else [float(i) for i in range(size)]
+    return lambda: geom.is_numeric(value)
+
+@benchmark("Vector +", dim=DIMS)
+def bench_vector_add(dim):
+    a, b = _vector(dim, 1), _vector(dim, 2)
+    return lambda: a + b
+
+@benchmark("Vector -", dim=DIMS)
+def bench_vector_sub(dim):
+    a, b = _vector(dim, 1), _vector(dim, 2)
+    return lambda: a - b
+
+@benchmark("Vector * scalar", dim=DIMS)
+def bench_vector_mul(dim):
+    a = _vector(dim, 1)
+    return lambda: a * 2.5
+
+@benchmark("Vector / scalar", dim=DIMS)
+def bench_vector_div(dim):
+    a = _vector(dim, 1)
+    return lambda: a / 2.5
+
+@benchmark("Vector * Vector (cross)")
+def bench_vector_cross():
+    a, b = _vector(3, 1), _vector(3, 2)
+    return lambda: a * b
+
+@benchmark("Vector @", dim=DIMS)
+def bench_vector_dot(dim):
+    a, b = _vector(dim, 1), _vector(dim, 2)
+    return lambda: a @ b
+
+@benchmark("abs(Vector)", dim=DIMS)
+def bench_vector_abs(dim):
+    a = _vector(dim, 1)
+
+    # modify a component so a cached magnitude is never reused
+    def run():
+        a[0] = 1.0
+        return abs(a)
+    return run
+
+@benchmark("~Vector", dim=DIMS)
+def bench_vector_invert(dim):
+    a = _vector(dim, 1)
+
+    def run():
+        a[0] = 1.0
+        return ~a
+    return run
+
+@benchmark("-Vector", dim=DIMS)
+def bench_vector_neg(dim):
+    a = _vector(dim, 1)
+    return lambda: -a
+
+@benchmark("Vector ==", dim=DIMS)
+def bench_vector_eq(dim):
+    a, b = _vector(dim, 1), _vector(dim, 1)
+    return lambda: a == b
+
+@benchmark("Circle()")
+def bench_circle_init():
+    return lambda: geom.Circle((1.5, -2.5), 3.0)
+
+@benchmark("Circle.moved_by")
+def bench_circle_moved_by():
+    c = geom.Circle((1.5, -2.5), 3.0)
+    step = geom.Vector([0.1, 0.2])
+    return lambda: c.moved_by(step)
+
+@benchmark("Circle.intersects(point)")
+def bench_circle_intersects_point():
+    c = geom.Circle((1.5, -2.5), 3.0)
+    return lambda: c.intersects((2.0, -1.0))
+
+@benchmark("Circle.intersects(Circle)", n=(10, 100))
+def bench_circle_intersects_circle(n):
+    circles = _circles(n, 3)
+    first = circles[0]
+
+    def run():
+        for c in circles:
+            first.intersects(c)
+    return run
+
+QUICK_NUMBER = 10
+"""The number of calls timed per run with ``--quick``."""
+
+def measure(func, min_time=0.2, repeat=3, number=None):
+    """Return the best calls per second of `func` over `repeat` runs.
+
+    Each run calls `func` `number` times, or if `number` isn't given, enough
+    times to take at least `min_time` seconds. The spread of the runs, the
+    standard deviation of their times relative to their mean, is returned
+    too.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+        number = max(1, int(number * min_time / 0.2))
+    times = timer.repeat(repeat=repeat, number=number)
+    spread = statistics.pstdev(times) / statistics.fmean(times)
+    return number / min(times), spread
+
+def _peak_bytes(func, calls):
+    func()
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - current
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+def allocations(func, calls=100):
+    """Return the average peak bytes allocated by one call to `func`.
+
+    The bytes the measurement itself allocates around an empty call are
+    subtracted.
+    """
+    overhead = _peak_bytes(lambda: None, calls)
+    return max(0.0, _peak_bytes(func, calls) - overhead)
+
+def run(pattern=None, min_time=0.2, number=None):
+    """Run the benchmarks whose names contain `pattern`.
+
+    Returns a dict from benchmark name to its ``ops_per_sec``, ``spread``
+    and ``alloc_bytes``. `min_time` and `number` are passed to `measure`.
+    """
+    results = {}
+    for name, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        func = setup()
+        ops_per_sec, spread = measure(func, min_time, number=number)
+        results[name] = {'ops_per_sec': ops_per_sec, 'spread': spread,
+                         'alloc_bytes': allocations(func)}
+    return results
+
+def allowed_slowdown(result, before, tolerance):
+    """Return the fraction a benchmark may slow down from `before`.
+
+    The slowest allowed rate is the baseline's scaled by ``1 - tolerance``,
+    and then divided by one plus twice the combined spread of the two
+    measurements, so noisy benchmarks need a bigger slowdown to count as a
+    regression. Baselines saved without a spread count as exact.
+    """
+    noise = (result.get('spread', 0)**2 + before.get('spread', 0)**2)**0.5
+    return 1 - (1 - tolerance) / (1 + 2*noise)
+
+def compare(results, baseline, tolerance):
+    """Return the names of the benchmarks that regressed from `baseline`.
+
+    A benchmark regresses if its ops/sec fell by more than its
+    `allowed_slowdown` from its baseline value.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        allowed = allowed_slowdown(result, before, tolerance)
+        if result['ops_per_sec'] < before['ops_per_sec'] * (1 - allowed):
+            regressions.append(name)
+    return regressions
+
+def report(results, baseline=None, out=sys.stdout):
+    """Print a table of `results`, with the change from `baseline` if given."""
+    width = max([len(name) for name in results] + [9])
+    header = "{:<{w}}  {:>14}  {:>12}".format("benchmark", "ops/sec",
+                                              "bytes/call", w=width)
+    if baseline:
+        header += "  {:>8}".format("change")
+    print(header, file=out)
+    for name, result in results.items():
+        line = "{:<{w}}  {:>14,.0f}  {:>12,.0f}".format(
+            name, result['ops_per_sec'], result['alloc_bytes'], w=width)
+        if baseline and name in baseline:
+            change = result['ops_per_sec']/baseline[name]['ops_per_sec'] - 1
+            line += "  {:>+7.1%}".format(change)
+        print(line, file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', metavar='TEXT',
+                        help="only run benchmarks whose names contain TEXT")
+    parser.add_argument('--quick', action='store_true',
+                        help="time {} calls of each benchmark, for smoke "
+                             "tests".format(QUICK_NUMBER))
+    parser.add_argument('--save', metavar='PATH',
+                        help="save the results as JSON to PATH")
+    parser.add_argument('--baseline', metavar='PATH',
+                        help="compare the results with the JSON at PATH")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="fractional slowdown allowed before a "
+                             "benchmark counts as a regression, on top of "
+                             "its measured noise (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, number=QUICK_NUMBER if args.quick else None)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)['results']
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': results}, fp, indent=2, sort_keys=True)
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS (slower than baseline by more than "
+                  "{:.0%}):".format(args.tolerance), file=sys.stderr)
+            for name in regressions:
+                print("  " + name, file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
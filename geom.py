@@ -3,14 +3,80 @@ __docformat__ = 'reStructuredText'
 
 import numbers
 import math
+import array
+import collections
+import contextlib
+import functools
+import heapq
+import json
+import os
+import pickle
+import random
+import struct
+import sys
+import time
 
 from typing import TypeVar
 from collections.abc import Iterable
 Numeric = TypeVar("Numeric", int, float, numbers.Number)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 EPSILON: float = 10**-6
 """A reasonably small constant to use for error tolerance."""
 
+_validate: bool = True
+
+def set_validation(enabled):
+    """Turn argument validation on or off for the whole module.
+
+    While validation is on, `Vector` and `Circle` check that their arguments
+    are numeric collections of the right dimension and raise TypeError or
+    ValueError if they aren't. Turning validation off skips those checks for
+    callers that already trust their data, in which case invalid arguments
+    give undefined results. Returns whether validation was previously on.
+    """
+    global _validate
+    previous = _validate
+    _validate = bool(enabled)
+    return previous
+
+_storage: str = 'list'
+_STORAGES = ('list', 'array')
+
+def set_storage(storage):
+    """Choose how new `Vector` objects store their components by default.
+
+    With ``'list'``, the default, components are kept as they're given in a
+    Python list. With ``'array'``, they're converted to floats and packed
+    into an ``array.array('d')``, which saves the boxed float for every
+    component. Either can still be chosen per vector with the `storage`
+    argument of `Vector`. Returns the previous default. ValueError is raised
+    if `storage` isn't ``'list'`` or ``'array'``.
+    """
+    global _storage
+    if storage not in _STORAGES:
+        raise ValueError("storage must be 'list' or 'array'")
+    previous = _storage
+    _storage = storage
+    return previous
+
+@contextlib.contextmanager
+def unchecked():
+    """Return a context manager that turns validation off while it's active.
+
+    Equivalent to calling `set_validation(False)` on entry and restoring the
+    previous setting on exit.
+    """
+    previous = set_validation(False)
+    try:
+        yield
+    finally:
+        set_validation(previous)
+
 def is_numeric(N):
     """Determine if `N` is numeric.
 
@@ -18,75 +84,105 @@ def is_numeric(N):
     """
     def is_num(n):
         return isinstance(n, numbers.Number) and (not isinstance(n, bool))
-    if '__iter__' in dir(N):
-        return False not in [is_num(n) for n in N]
+    if hasattr(N, '__iter__'):
+        return all(is_num(n) for n in N)
     else:
         return is_num(N)
 
-class Vector:
-    """A Vector represents a mathematical vector for any dimension.
-
-    **Overloaded Operations**
-
-    | `len(v)` gives the dimension of the vector `v`
-    | `abs(v)` gives the magnitude of the vector `v`
-    | `~v` gives the normalized version of the vector `v`
-    | `-v` gives the a vector in the opposite direction but same magnitude as `v`
-    | `v[i]` gives the vector component in the ith dimension.
-    | `a == b` compare two vectors for equality
-    | `a + b` adds two vectors together
-    | `a - b` subtracts the vector `b` from the vector `a`
-    | `a * m` multiplies all components of the vector `a` by a scalar `m`
-    | `a / m` divides all components of the vector `a` by a non-zero scalar `m`
-    | `a * b` computes the cross product of the `a` with `b`, where `a` and `b`
-    |           are numeric collections in R3.
-    | `a @ b` computes the dot product of the the vector `a` and the vector `b`
+class _BaseVector:
+    """The operations shared by `Vector` and the fixed size vectors.
 
-    For binary operations, as long as one of the arguments is a `geom.Vector`,
-    the other argument may be any form of numeric collection of the same
-    dimension.
+    This class has no slots of its own, so `Vector2` and `Vector3` only
+    carry their coordinates. Subclasses provide the `_components` of the
+    vector and the way it's created. A `Vector` lets a fixed size operand
+    handle the binary operators, as it would if they were subclasses, so
+    that the result keeps the fixed size type.
     """
-    _components: list[Numeric]
+    __slots__ = ()
 
-    def __init__(self, components: Iterable[Numeric]):
-        """Create a vector from `components`
+    @staticmethod
+    def view(buffer):
+        """Create a vector that shares its components with `buffer`.
 
-        `components` should be a collection of numeric values. Initializing
-        a `Vector` with a collection of non-numeric values will raise a
-        `TypeError.` ValueError is raised if Vector is initialized with no
-        components.
+        `buffer` may be any contiguous one-dimensional buffer of C doubles,
+        such as an ``array.array('d')``, a row of a float64 numpy array, or a
+        `memoryview` of either. Raw bytes, such as a slice of a
+        `multiprocessing.shared_memory` block, are read as doubles in native
+        byte order. Nothing is copied: changing the vector
+        changes `buffer` and vice versa, and a read-only buffer gives a
+        read-only vector. The result is always a plain `Vector`. TypeError is
+        raised if `buffer` doesn't support the buffer protocol or doesn't
+        hold doubles, and ValueError is raised if it's empty or isn't
+        contiguous and one-dimensional.
         """
-        if not hasattr(components, '__iter__'):
-            raise TypeError("components must be a collection")
-        if not is_numeric(components):
-            raise TypeError("components must be numeric values")
-        if len(components) == 0:
+        try:
+            view = memoryview(buffer)
+        except TypeError:
+            raise TypeError("buffer must support the buffer protocol") \
+                from None
+        native = '<d' if sys.byteorder == 'little' else '>d'
+        raw = view.format in ('B', 'b', 'c')
+        if not raw and view.format not in ('d', '@d', '=d', native):
+            raise TypeError("buffer must hold native C doubles")
+        if view.ndim != 1 or not view.c_contiguous:
+            raise ValueError("buffer must be contiguous and one-dimensional")
+        if raw and view.nbytes % 8:
+            raise ValueError("buffer must hold a whole number of doubles")
+        if len(view) == 0:
             raise ValueError("vectors cannot be empty")
-        self._components = list(components)
+        if view.format != 'd':
+            view = view.cast('B').cast('d')
+        return Vector._from_trusted(view)
+
+    def __buffer__(self, flags):
+        # views expose the buffer they share; other vectors can only offer a
+        # read-only copy, so writes through it can't be silently lost
+        c = self._components
+        if isinstance(c, memoryview):
+            return c
+        return memoryview(array.array('d', c)).toreadonly()
+
+    def __array__(self, dtype=None, copy=None):
+        c = self._components
+        if isinstance(c, memoryview) and not copy:
+            a = np.frombuffer(c, dtype=float)
+        elif copy is False:
+            raise ValueError("only vector views can be converted to an "
+                             "array without copying")
+        else:
+            a = np.array(list(c))
+        return a if dtype is None else a.astype(dtype, copy=False)
+
+    def __reduce_ex__(self, protocol):
+        c = self._components
+        if type(c) is memoryview:
+            c = c.tolist()
+        return _unpickle_vector, (type(self), c)
 
     def __str__(self):
         return "<" + ", ".join([str(i) for i in self._components]) + ">"
 
     def __repr__(self):
-        return "geom.Vector("+str(self._components)+")"
+        return "geom.Vector("+str(list(self._components))+")"
 
     def __len__(self):
         return len(self._components)
 
     def __getitem__(self, i):
-        if i >= len(self):
+        if i >= len(self._components):
             raise IndexError("Vector has less than %d dimensions" % (i+1))
         return self._components[i]
 
     def __iter__(self):
-        yield from self._components
+        return iter(self._components)
 
     def __setitem__(self, i, value):
-        if not isinstance(value, numbers.Number):
+        if _validate and not isinstance(value, numbers.Number):
             raise TypeError("Vector components must be numeric")
-        if i > len(self):
+        if i > len(self._components):
             raise IndexError("Vector has less than %d dimensions" % (i+1))
         self._components[i] = value
+        self._magsq = self._mag = None
 
     def __eq__(self, other):
 
@@ -94,6 +190,10 @@ class Vector:
         if other is None:
             return False
 
+        # let vector arrays compare themselves against this vector
+        if isinstance(other, VectorArray):
+            return NotImplemented
+
         # error if components have different dimensions
         if len(self) != len(other):
             message = f"Can't compare a vector of dimension {len(self)} " \
@@ -101,79 +201,133 @@ class Vector:
             raise ValueError(message)
 
         # false if any components aren't equal
-        return all(a == b for a, b in zip(self, other))
+        return all(a == b for a, b in zip(self._components, other))
 
     def __add__(self, other):
-        if not is_numeric(other):
-            raise TypeError("Added vector must have numeric components")
-        if len(other) != len(self):
-            raise ValueError("Cannot add vectors of two different dimensions")
-        return Vector([a + b for a, b in zip(self, other)])
+        if isinstance(other, VectorArray) or (type(other) in _FIXED_VECTORS
+                                              and type(self) is Vector):
+            return NotImplemented
+        if _validate:
+            if not is_numeric(other):
+                raise TypeError("Added vector must have numeric components")
+            if len(other) != len(self._components):
+                raise ValueError("Cannot add vectors of two different "
+                                 "dimensions")
+        return Vector._from_trusted([a + b for a, b in zip(self._components,
+                                                           other)])
 
     def __radd__(self, other):
         return self + other
 
     def __sub__(self, other):
-        if not is_numeric(other):
-            raise TypeError("Subtracted vector must have numeric components")
-        if len(other) != len(self):
-            raise ValueError("Cannot subtract vectors of two different " +
-                             "dimensions")
-        return Vector([a - b for a, b in zip(self, other)])
+        if isinstance(other, VectorArray) or (type(other) in _FIXED_VECTORS
+                                              and type(self) is Vector):
+            return NotImplemented
+        if _validate:
+            if not is_numeric(other):
+                raise TypeError("Subtracted vector must have numeric "
+                                "components")
+            if len(other) != len(self._components):
+                raise ValueError("Cannot subtract vectors of two different " +
+                                 "dimensions")
+        return Vector._from_trusted([a - b for a, b in zip(self._components,
+                                                           other)])
 
     def __rsub__(self, other):
         return -self + other
 
     def __mul__(self, other):
-        if not is_numeric(other):
+        if isinstance(other, VectorArray) or (type(other) in _FIXED_VECTORS
+                                              and type(self) is Vector):
+            return NotImplemented
+        if _validate and not is_numeric(other):
             raise TypeError("Second argument must be numeric")
         if isinstance(other, numbers.Number):
-            return Vector([other*c for c in self])
-        if len(self) != 3 or len(other) != 3:
+            return Vector._from_trusted([other*c for c in self._components])
+        if _validate and (len(self._components) != 3 or len(other) != 3):
             raise ValueError("Can only perform cross products in R3")
-        cross = Vector([self[1]*other[2] - self[2]*other[1],
-                        self[2]*other[0] - self[0]*other[2],
-                        self[0]*other[1] - self[1]*other[0]])
-        return cross
+        a0, a1, a2 = self._components
+        b0, b1, b2 = other
+        return Vector._from_trusted([a1*b2 - a2*b1,
+                                     a2*b0 - a0*b2,
+                                     a0*b1 - a1*b0])
 
     def __rmul__(self, other):
-        if not is_numeric(other):
+        if _validate and not is_numeric(other):
             raise TypeError("Second argument must be numeric")
         if isinstance(other, numbers.Number):
             return self * other
-        if len(self) != 3 or len(other) != 3:
+        if _validate and (len(self._components) != 3 or len(other) != 3):
             raise ValueError("Can only perform cross products in R3")
-        cross = Vector([other[1]*self[2] - other[2]*self[1],
-                        other[2]*self[0] - other[0]*self[2],
-                        other[0]*self[1] - other[1]*self[0]])
-        return cross
+        a0, a1, a2 = other
+        b0, b1, b2 = self._components
+        return Vector._from_trusted([a1*b2 - a2*b1,
+                                     a2*b0 - a0*b2,
+                                     a0*b1 - a1*b0])
 
     def __truediv__(self, m):
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+        if _validate and (not isinstance(m, numbers.Number) or
+                          isinstance(m, bool)):
             raise TypeError("Vectors can only be divided by a scalar")
-        return Vector([i/m for i in self])
+        return Vector._from_trusted([i/m for i in self._components])
 
     def __matmul__(self, other):
-        if not is_numeric(other):
-            raise TypeError("Can only perform dot produt on numeric vectors")
-        if len(self) != len(other):
-            raise ValueError("Cannot perform dot product on vectors of two " +
-                             "different dimensions")
-        return sum([a*b for a, b in zip(self, other)])
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            if not is_numeric(other):
+                raise TypeError("Can only perform dot produt on numeric "
+                                "vectors")
+            if len(self._components) != len(other):
+                raise ValueError("Cannot perform dot product on vectors of "
+                                 "two different dimensions")
+        return sum([a*b for a, b in zip(self._components, other)])
 
     def __rmatmul__(self, other):
         return self @ other
 
+    def __iadd__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        self.addOn(other)
+        return self
+
+    def __isub__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        self.takeAway(other)
+        return self
+
+    def __imul__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            self.mulBy(other)
+        else:
+            self._assign(list(self * other))
+        return self
+
+    def __itruediv__(self, m):
+        self.divBy(m)
+        return self
+
     def __neg__(self):
-        return Vector([-a for a in self])
+        return Vector._from_trusted([-a for a in self._components])
 
     def __abs__(self):
-        return math.sqrt(sum([a*a for a in self]))
+        mag = self._mag
+        if mag is None:
+            mag = math.sqrt(self.magSq())
+            # views can be written through their buffer, so never cache them
+            if not isinstance(self._components, memoryview):
+                self._mag = mag
+        return mag
 
     def __invert__(self):
-        if abs(self) == 0:
+        mag = abs(self)
+        if mag == 0:
             raise ValueError("Cannot normalize the zero vector")
-        return self*(1/abs(self))
+        return self*(1/mag)
 
     @property
     def x(self):
@@ -200,20 +354,43 @@ class Vector:
         self[2] = value
 
     def mag(self):
-        """Compute the magnitude of this vector. Equivalent to `abs(v)`."""
+        """Compute the magnitude of this vector. Equivalent to `abs(v)`.
+
+        The result is cached like the result of `magSq`.
+        """
         return abs(self)
 
     def magSq(self):
-        """Compute the square of the magnitude of this vector."""
-        return sum([a*a for a in self])
+        """Compute the square of the magnitude of this vector.
 
-    def add(self, other):
+        The result is cached until the vector is next modified, except for
+        vectors created with `view`, whose buffer may change at any time.
+        """
+        magsq = self._magsq
+        if magsq is None:
+            components = self._components
+            magsq = sum([a*a for a in components])
+            if not isinstance(components, memoryview):
+                self._magsq = magsq
+        return magsq
+
+    def add(self, other, out=None):
         """Return the sum of this vector and the vector `other`.
         
-        Equivalent to `v + other`. TypeError is raised if `other` is not a
-        numeric collection the same length as this vector.
+        Equivalent to `v + other`. If the vector `out` is given, the sum is
+        written into it and `out` is returned instead of a new vector.
+        TypeError is raised if `other` is not a numeric collection the same
+        length as this vector.
         """
-        return self + other
+        if out is None:
+            return self + other
+        if _validate:
+            _check_operand(other, len(self), "Added vector must have numeric "
+                           "components", "Cannot add vectors of two "
+                           "different dimensions")
+            _check_out(out, len(self))
+        out._assign([a + b for a, b in zip(self, other)])
+        return out
 
     def addOn(self, other):
         """Add `other` to this vector.
@@ -222,20 +399,33 @@ class Vector:
         this `v`. TypeError is raised if `other` is not a numeric collection.
         ValueError is raised if the vectors are not the same length.
         """
-        if not is_numeric(other):
-            raise TypeError("Added vector must be numeric")
-        if len(other) != len(self):
-            raise ValueError("Added vector must have same dimensions")
-        for i in range(len(self)):
-            self[i] += other[i]
+        if _validate:
+            if not is_numeric(other):
+                raise TypeError("Added vector must be numeric")
+            if len(other) != len(self):
+                raise ValueError("Added vector must have same dimensions")
+        c = self._components
+        for i, b in enumerate(other):
+            c[i] += b
+        self._magsq = self._mag = None
 
-    def sub(self, other):
+    def sub(self, other, out=None):
         """Return the difference of this vector and the vector `other`.
 
-        Equivalent to `v - other`. TypeError is raised if `other` is not a
-        numeric collection the same length as this vector.
+        Equivalent to `v - other`. If the vector `out` is given, the
+        difference is written into it and `out` is returned instead of a new
+        vector. TypeError is raised if `other` is not a numeric collection the
+        same length as this vector.
         """
-        return self - other
+        if out is None:
+            return self - other
+        if _validate:
+            _check_operand(other, len(self), "Subtracted vector must have "
+                           "numeric components", "Cannot subtract vectors of "
+                           "two different dimensions")
+            _check_out(out, len(self))
+        out._assign([a - b for a, b in zip(self, other)])
+        return out
 
     def takeAway(self, other):
         """Subtract the vector `other` from this vector.
@@ -244,21 +434,31 @@ class Vector:
         mutates this vector. TypeError is raised if `other` is not a numeric
         collection the same length as this vector.
         """
-        if not is_numeric(other):
-            raise TypeError("Added vector must be numeric")
-        if len(other) != len(self):
-            raise ValueError("Added vector must have same dimensions")
-        for i in range(len(self)):
-            self[i] -= other[i]
+        if _validate:
+            if not is_numeric(other):
+                raise TypeError("Added vector must be numeric")
+            if len(other) != len(self):
+                raise ValueError("Added vector must have same dimensions")
+        c = self._components
+        for i, b in enumerate(other):
+            c[i] -= b
+        self._magsq = self._mag = None
 
-    def mul(self, m):
+    def mul(self, m, out=None):
         """Return the product of this vector and the scalar `m`.
 
-        Equivalent to `v * m`. TypeError is raised if m is not a number.
+        Equivalent to `v * m`. If the vector `out` is given, the product is
+        written into it and `out` is returned instead of a new vector.
+        TypeError is raised if m is not a number.
         """
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
-            raise TypeError("Vectors can only be multiplied by scalars")
-        return Vector([i*m for i in self])
+        if _validate:
+            _check_scalar(m, "Vectors can only be multiplied by scalars")
+            if out is not None:
+                _check_out(out, len(self))
+        if out is None:
+            return Vector._from_trusted([i*m for i in self._components])
+        out._assign([i*m for i in self])
+        return out
 
     def mulBy(self, m):
         """Multiply this vector by the scalar `m`.
@@ -266,17 +466,28 @@ class Vector:
         Similar to `v * m` or `v.mul(m)`, but `v.mulBy(m)` mutates the vector
         `v`. TypeError is raised if m isn't a number.
         """
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+        if _validate and (not isinstance(m, numbers.Number) or
+                          isinstance(m, bool)):
             raise TypeError("Vectors can only be multiplied by scalars")
-        for i in range(len(self)):
-            self[i] *= m
+        c = self._components
+        for i in range(len(c)):
+            c[i] *= m
+        self._magsq = self._mag = None
 
-    def div(self, m):
+    def div(self, m, out=None):
         """Return the quotient of this vector the scalar `m`.
         
-        Equivalent to `v / m`. TypeError is raised if m isn't a number.
+        Equivalent to `v / m`. If the vector `out` is given, the quotient is
+        written into it and `out` is returned instead of a new vector.
+        TypeError is raised if m isn't a number.
         """
-        return self/m
+        if out is None:
+            return self/m
+        if _validate:
+            _check_scalar(m, "Vectors can only be divided by a scalar")
+            _check_out(out, len(self))
+        out._assign([i/m for i in self])
+        return out
 
     def divBy(self, m):
         """Divide this vector by the scalar `m`.
@@ -284,10 +495,13 @@ class Vector:
         Similar to `v / m` or `v.div(m)`, but `v.divBy(m)` mutates this the
         vector `v`. TypeError is raised if m isn't a number.
         """
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+        if _validate and (not isinstance(m, numbers.Number) or
+                          isinstance(m, bool)):
             raise TypeError("Vectors can only be divided by scalars")
-        for i in range(len(self)):
-            self[i] /= m
+        c = self._components
+        for i in range(len(c)):
+            c[i] /= m
+        self._magsq = self._mag = None
 
     def normalize(self):
         """Normalize this vector.
@@ -296,9 +510,10 @@ class Vector:
         of returning a new vector. ValueError is raised if this vector is
         the zero vector.
         """
-        if abs(self) == 0:
+        mag = abs(self)
+        if mag == 0:
             raise ValueError("Cannot normalize the zero vector")
-        self.divBy(abs(self))
+        self.divBy(mag)
 
     def dot(self, other):
         """Return the dot product of this vector and `other`.
@@ -309,204 +524,4765 @@ class Vector:
         """
         return self @ other
 
-    def cross(self, other):
-        """Return the cross product of this vector and `other`.
+    def lazy(self):
+        """Return a `LazyVector` with the same value as this vector.
 
-        Equivalent to `v * other`. TypeError is raised if `other` is not a
-        numeric collection. ValueError is raised if this vector and `other` are
-        not in R3.
+        Arithmetic on the lazy vector builds an expression that's evaluated
+        in one pass when its value is used, instead of creating a vector for
+        every intermediate result. For example, ``a.lazy() + b.lazy()*s - c``
+        computes each component as ``a[i] + s*b[i] - c[i]`` at once. The lazy
+        vector reads this vector's components when it's evaluated.
         """
-        return self * other
+        return LazyVector._make(('v', self._components), len(self), 1)
 
-    def norm(self):
-        """Return a normalized version of this vector. Equivalent to `~v.`"""
-        return ~self
-
-class Circle(object):
-    """A Circle stores basic circle info and provides relevant useful methods.
-    """
-    __slots__ = ['_center', '_radius']
-    def __init__(self, center, radius):
-        """Create a circle with a given ``center`` and ``radius``.
+    def isclose(self, other, tol=EPSILON):
+        """Determine if this vector is within `tol` of `other`.
 
-        TypeError is raised if center is not a numeric collection or if radius
-        is not a number. ValueError is raised if center is not in R2 or if
-        radius is not a real non-negative number.
+        Unlike `v == other`, which compares components exactly, each
+        component may differ from the component of `other` by up to `tol`.
+        TypeError is raised if `other` is not a numeric collection or `tol`
+        isn't a number, and ValueError is raised if `other` isn't the same
+        length as this vector or `tol` is negative.
         """
-        self.center = center
-        self.radius = radius
+        _check_tolerance(tol)
+        if _validate:
+            _check_operand(other, len(self), "Compared vector must be "
+                           "numeric", "Compared vector must have the same "
+                           "dimension")
+        return all([abs(a - b) <= tol for a, b in zip(self, other)])
 
-    def __str__(self):
-        s = 'Circle(<{}, {}>, {})'.format(self.center.x, self.center.y,
-                                          self.radius)
-        return s
+    def cross(self, other, out=None):
+        """Return the cross product of this vector and `other`.
 
-    def __repr__(self):
-        s = 'geom.Circle(<{}, {}>, {})'.format(self.center.x, self.center.y,
-                                               self.radius)
-        return s
+        Equivalent to `v * other`. If the vector `out` is given, the cross
+        product is written into it and `out` is returned instead of a new
+        vector. TypeError is raised if `other` is not a numeric collection.
+        ValueError is raised if this vector and `other` are not in R3.
+        """
+        if out is None:
+            return self * other
+        if _validate:
+            _check_operand(other, 3, "Second argument must be numeric",
+                           "Can only perform cross products in R3")
+            if len(self) != 3:
+                raise ValueError("Can only perform cross products in R3")
+            _check_out(out, 3)
+        a0, a1, a2 = self
+        b0, b1, b2 = other
+        out._assign([a1*b2 - a2*b1, a2*b0 - a0*b2, a0*b1 - a1*b0])
+        return out
 
-    @property
-    def center(self):
-        """The center of the circle.
+    def norm(self, out=None):
+        """Return a normalized version of this vector. Equivalent to `~v.`
 
-        center is stored as a Vector. Setting center will raise TypeError if
-        it's not numeric, AttributeError if has no length, and ValueError
-        if it's not in R2.
+        If the vector `out` is given, the normalized vector is written into it
+        and `out` is returned instead of a new vector.
         """
-        return self._center
-    @center.setter
-    def center(self, center):
-        if not is_numeric(center):
-            raise TypeError("center must be numeric")
-        if not hasattr(center, '__len__'):
-            raise AttributeError("center must have a length attribute")
-        if len(center) != 2:
-            raise ValueError("center must be in R2")
-        self._center = Vector(center)
+        if out is None:
+            return ~self
+        if _validate:
+            _check_out(out, len(self))
+        mag = abs(self)
+        if mag == 0:
+            raise ValueError("Cannot normalize the zero vector")
+        m = 1/mag
+        out._assign([m*a for a in self])
+        return out
 
-    @property
-    def radius(self):
-        """The radius of the circle.
+    def axpy(self, a, other):
+        """Add `other` scaled by the scalar `a` to this vector.
 
-        Setting radius will raise TypeError if it's not numeric and ValueError
-        if it's negative.
+        Equivalent to `v += a*other`, but no intermediate vector is created.
+        TypeError is raised if `a` is not a number or `other` is not a
+        numeric collection, and ValueError is raised if `other` isn't the same
+        length as this vector.
         """
-        return self._radius
-    @radius.setter
-    def radius(self, r):
-        if not is_numeric(r):
-            raise TypeError("radius must be numeric")
-        if r < 0:
-            raise ValueError("radius must be non-negative")
-        self._radius = r
+        if _validate:
+            _check_scalar(a, "Vectors can only be multiplied by scalars")
+            _check_operand(other, len(self), "Added vector must be numeric",
+                           "Added vector must have same dimensions")
+        c = self._components
+        for i, b in enumerate(other):
+            c[i] += a*b
+        self._magsq = self._mag = None
 
-    @property
-    def area(self):
-        """The area of the circle.
+    def _assign(self, components):
+        """Overwrite the components of this vector with `components`."""
+        c = self._components
+        if type(c) is list:
+            c[:] = components
+        else:
+            for i, a in enumerate(components):
+                c[i] = a
+        self._magsq = self._mag = None
 
-        Defined as pi*r*r. Setting the area will change the radius of the
-        circle. Setting the area will raise TypeError if it's not numeric and
-        ValueError if it's less than zero.
-        """
-        return math.pi*self._radius*self._radius
-    @area.setter
-    def area(self, a):
-        if not isinstance(a, numbers.Number) or isinstance(a, bool):
-            raise TypeError("area must be a number")
-        if a < 0:
-            raise ValueError("area must be non-negative")
-        self._radius = math.sqrt(a/math.pi)
+class _VectorType(type):
+    """The type of `Vector`, under which every vector class is a `Vector`.
 
-    @property
-    def circumference(self):
-        """The circumference of the circle.
+    `Vector2` and `Vector3` derive from `_BaseVector` rather than `Vector` so
+    that they don't carry its slots, but they're still vectors.
+    """
+    def __instancecheck__(cls, instance):
+        if cls is Vector:
+            return isinstance(instance, _BaseVector)
+        return type.__instancecheck__(cls, instance)
 
-        Defined as 2*pi*r. Setting the circumference will change the radius of
-        the circle; raises TypeError if it's not numeric and ValueError if it's
-        less than zero.
-        """
-        return 2*math.pi*self._radius
-    @circumference.setter
-    def circumference(self, c):
-        if not isinstance(c, numbers.Number) or isinstance(c, bool):
-            raise TypeError("circumference must be a number")
-        if c < 0:
-            raise ValueError("circumference must be non-negative")
-        self._radius = c/(2*math.pi)
+    def __subclasscheck__(cls, subclass):
+        if cls is Vector:
+            return issubclass(subclass, _BaseVector)
+        return type.__subclasscheck__(cls, subclass)
 
-    def scaled_to(self, m, attr="radius"):
-        """Return a new circle scaled to m.
+class Vector(_BaseVector, metaclass=_VectorType):
+    """A Vector represents a mathematical vector for any dimension.
 
-        By default, `m` is used to scale the radius. Calling ``scaled_to`` with
-        ``attr="area"`` cause `m` to scale the area instead of the radius, and
-        calling it with ``attr="circumference"`` will cauese `m` to scale the
-        circumference. ``scaled_to`` will raise TypeError if `m` isn't numeric
-        or if `attr` isn't a string, and ValueError if `m` is less than zero or
-        if `attr` isn't ``'radius'``, ``'circumference'``, or ``'area'``.
-        """
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
-            raise TypeError("m must be a number")
-        if m < 0:
-            raise ValueError("m must be non-negative")
-        if not isinstance(attr, str):
-            raise TypeError("attr must be a string")
-        if attr.lower() not in ("radius", "area", "circumference"):
-            raise ValueError("attr must be 'radius', 'area', "
-                             "or 'circumference'")
-        if attr.lower() == 'radius':
-            return Circle(self.center, m)
-        elif attr.lower() == 'circumference':
-            return Circle(self.center, m/(2*math.pi))
-        return Circle(self.center, math.sqrt(m/math.pi))
+    **Overloaded Operations**
 
-    def scaled_by(self, m, attr="radius"):
-        """Return a copy of this circle scaled by a factor of m.
+    | `len(v)` gives the dimension of the vector `v`
+    | `abs(v)` gives the magnitude of the vector `v`
+    | `~v` gives the normalized version of the vector `v`
+    | `-v` gives the a vector in the opposite direction but same magnitude as `v`
+    | `v[i]` gives the vector component in the ith dimension.
+    | `a == b` compare two vectors for equality
+    | `a + b` adds two vectors together
+    | `a - b` subtracts the vector `b` from the vector `a`
+    | `a * m` multiplies all components of the vector `a` by a scalar `m`
+    | `a / m` divides all components of the vector `a` by a non-zero scalar `m`
+    | `a * b` computes the cross product of the `a` with `b`, where `a` and `b`
+    |           are numeric collections in R3.
+    | `a @ b` computes the dot product of the the vector `a` and the vector `b`
 
-        By default, `m` is used to scale the radius. Calling ``scaled_by`` with
-        ``attr="area"`` cause `m` to scale the area instead of the radius.
-        ``scaled_by`` will raise TypeError if `m` isn't numeric or if `attr`
-        isn't a string, and ValueError if `m` is less than zero or if `attr` is
-        neither ``'radius'`` nor ``'area'``.
-        """
-        if not isinstance(m, numbers.Number) or isinstance(m, bool):
-            raise TypeError("m must be a number")
-        if m < 0:
-            raise ValueError("m must be non-negative")
-        if not isinstance(attr, str):
-            raise TypeError("attr must be a string")
-        if attr.lower() not in ("radius", "area"):
-            raise ValueError("attr must be either 'radius' or 'area'")
+    The operators `+=`, `-=`, `*=` and `/=` modify the left vector in place.
+    For binary operations, as long as one of the arguments is a `geom.Vector`,
+    the other argument may be any form of numeric collection of the same
+    dimension.
+    """
+    __slots__ = ['_components', '_magsq', '_mag']
+    _components: list[Numeric]
 
-        r = self.radius
-        if attr.lower() == 'radius':
-            r *= m
-        elif attr.lower() == 'area':
-            # pi r2^2 == m pi r1^2
-            # r2^2 = m r1^2
-            # r2 = m^.5 r1
-            r *= math.sqrt(m)
-        return Circle(self.center, r)
+    def __init__(self, components: Iterable[Numeric], storage=None):
+        """Create a vector from `components`
 
-    def moved_to(self, position):
-        """Return a copy of this circle moved to the given position.
+        `components` should be a collection of numeric values. Initializing
+        a `Vector` with a collection of non-numeric values will raise a
+        `TypeError.` ValueError is raised if Vector is initialized with no
+        components.
 
-        TypeError is raised if `position` is not a numeric collection.
-        ValueError is raised if `position` is not in R2.
+        `storage` chooses how the components are stored, and defaults to the
+        module setting of `set_storage`. With ``'array'`` they're packed as
+        floats into an ``array.array('d')``. Vectors made by arithmetic always
+        use lists, whatever their operands use. ValueError is raised if
+        `storage` isn't ``'list'`` or ``'array'``.
         """
-        if not is_numeric(position) or isinstance(position, numbers.Number):
-            raise TypeError("position must be a numeric collection")
-        if len(position) != 2:
-            raise ValueError("position must be in R2")
-        return Circle(position, self.radius)
+        if _validate:
+            if not hasattr(components, '__iter__'):
+                raise TypeError("components must be a collection")
+            if not is_numeric(components):
+                raise TypeError("components must be numeric values")
+            if len(components) == 0:
+                raise ValueError("vectors cannot be empty")
+        if storage is None:
+            storage = _storage
+        if storage == 'list':
+            self._components = list(components)
+        elif storage == 'array':
+            self._components = array.array('d', components)
+        else:
+            raise ValueError("storage must be 'list' or 'array'")
+        self._magsq = self._mag = None
 
-    def moved_by(self, vector):
-        """Return a copy of this circle moved by the given vector.
+    @classmethod
+    def _from_trusted(cls, components):
+        """Create a vector that uses the list `components` without checks.
 
-        TypeError is raised if `vector` is not a numeric collection.
-        ValueError is raised if `position` is not in R2.
+        `components` is trusted to be a non-empty list of numbers, and is
+        used as is rather than copied.
         """
-        if not is_numeric(vector) or isinstance(vector, numbers.Number):
-            raise TypeError("vector must be a numeric collection")
-        if len(vector) != 2:
-            raise ValueError("vector must be in R2")
-        return Circle(self.center+vector, self.radius)
+        v = object.__new__(cls)
+        v._components = components
+        v._magsq = v._mag = None
+        return v
 
-    def intersects(self, other):
-        """Return true if this circle intersects the geometric object `other`.
+def _unpickle_vector(cls, components):
+    """Rebuild a pickled vector of type `cls` without validating it."""
+    return cls._from_trusted(components)
 
-        `other` may be a numeric collection in R2, or some form of a circle.
-        TypeError is raised if other is neither of these things.
+class FrozenVector(Vector):
+    """A FrozenVector is an immutable, hashable `Vector`.
+
+    A FrozenVector supports every non-mutating operation of a `Vector`, and
+    can be used as a dictionary key or a set member. Its magnitude, squared
+    magnitude and normalized form are computed at most once and then cached.
+    Arithmetic with a FrozenVector gives an ordinary `Vector`, except for its
+    normalized form, which is another FrozenVector. Mutating a FrozenVector
+    raises TypeError. Comparing a FrozenVector with a vector of another
+    dimension gives False instead of raising ValueError.
+    """
+    __slots__ = ['_norm', '_hash']
+
+    def __init__(self, components):
+        """Create a frozen vector from `components`. See `Vector.__init__`."""
+        super().__init__(components, 'list')
+        self._components = tuple(self._components)
+        self._norm = self._hash = None
+
+    @classmethod
+    def _from_trusted(cls, components):
+        v = super()._from_trusted(tuple(components))
+        v._norm = v._hash = None
+        return v
+
+    def __repr__(self):
+        return "geom.FrozenVector(" + str(list(self._components)) + ")"
+
+    def __eq__(self, other):
+        # as a key or set member a frozen vector meets all kinds of values,
+        # so those of another dimension are unequal rather than an error
+        if isinstance(other, VectorArray) or not (
+                hasattr(other, '__len__') and is_numeric(other)):
+            return NotImplemented
+        if len(other) != len(self._components):
+            return False
+        return all(a == b for a, b in zip(self._components, other))
+
+    def __hash__(self):
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self._components)
+        return h
+
+    def __invert__(self):
+        norm = self._norm
+        if norm is None:
+            norm = FrozenVector._from_trusted(super().__invert__()._components)
+            self._norm = norm
+        return norm
+
+    def _immutable(self, *args):
+        raise TypeError("FrozenVector is immutable")
+
+    __setitem__ = _immutable
+    addOn = _immutable
+    takeAway = _immutable
+    mulBy = _immutable
+    divBy = _immutable
+    normalize = _immutable
+    axpy = _immutable
+    _assign = _immutable
+
+    def _not_in_place(self, other):
+        return NotImplemented
+
+    __iadd__ = _not_in_place
+    __isub__ = _not_in_place
+    __imul__ = _not_in_place
+    __itruediv__ = _not_in_place
+
+def _check_operand(other, n, type_message, dim_message):
+    """Raise unless `other` is a numeric collection with `n` components."""
+    if not is_numeric(other):
+        raise TypeError(type_message)
+    if len(other) != n:
+        raise ValueError(dim_message)
+
+def _check_out(out, n):
+    """Raise unless `out` is a vector with `n` components."""
+    if not isinstance(out, _BaseVector):
+        raise TypeError("out must be a Vector")
+    if len(out) != n:
+        raise ValueError("out must have the same dimension as the result")
+
+def _check_tolerance(tol):
+    """Raise unless `tol` is a non-negative number."""
+    _check_scalar(tol, "tol must be a number")
+    if tol < 0:
+        raise ValueError("tol must be non-negative")
+
+def _check_scalar(m, message):
+    """Raise TypeError unless `m` is a number."""
+    if not isinstance(m, numbers.Number) or isinstance(m, bool):
+        raise TypeError(message)
+
+class Vector2(_BaseVector):
+    """A Vector2 is a `Vector` in R2 that stores its components in fields.
+
+    A Vector2 behaves exactly like a `Vector` of dimension 2, but it has no
+    component list: its x and y components are stored directly on the object
+    and every operation is written out for two components, which makes it
+    smaller and faster than a generic vector. Operations between a Vector2 and
+    any numeric collection in R2 give a Vector2.
+    """
+    __slots__ = ['_x', '_y']
+
+    def __init__(self, *components):
+        """Create a vector in R2.
+
+        The components may be given separately, as in ``Vector2(x, y)``, or
+        as a single numeric collection, as in ``Vector2((x, y))``. TypeError is
+        raised if the components aren't numeric, and ValueError is raised if
+        there aren't exactly two of them.
         """
-        if {'center', 'radius'}.issubset(dir(other)):
-            d = other.center-self.center
-            r = other.radius+self.radius
-            return abs(d) <= r
-        try:
-            other = Vector(other)
-            other = other - self.center
-            return abs(other) <= self.radius
-        except (TypeError, ValueError):
-            pass
-        msg = 'Intersection with {} and Circle is undefined'.format(str(other))
-        raise TypeError(msg)
+        if len(components) == 1:
+            components, = components
+        if _validate:
+            if not hasattr(components, '__iter__'):
+                raise TypeError("components must be a collection")
+            _check_operand(components, 2, "components must be numeric values",
+                           "Vector2 must have exactly two components")
+        self._x, self._y = components
+
+    @classmethod
+    def _make(cls, x, y):
+        v = object.__new__(cls)
+        v._x = x
+        v._y = y
+        return v
+
+    @classmethod
+    def _from_trusted(cls, components):
+        v = object.__new__(cls)
+        v._x, v._y = components
+        return v
+
+    @property
+    def _components(self):
+        return [self._x, self._y]
+    @_components.setter
+    def _components(self, components):
+        self._x, self._y = components
+
+    def __repr__(self):
+        return "geom.Vector2({}, {})".format(self._x, self._y)
+
+    def __str__(self):
+        return "<{}, {}>".format(self._x, self._y)
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, i):
+        if i == 0 or i == -2:
+            return self._x
+        if i == 1 or i == -1:
+            return self._y
+        raise IndexError("Vector has less than %d dimensions" % (i+1))
+
+    def __iter__(self):
+        yield self._x
+        yield self._y
+
+    def __setitem__(self, i, value):
+        if _validate and not isinstance(value, numbers.Number):
+            raise TypeError("Vector components must be numeric")
+        if i == 0 or i == -2:
+            self._x = value
+        elif i == 1 or i == -1:
+            self._y = value
+        else:
+            raise IndexError("Vector has less than %d dimensions" % (i+1))
+
+    def __eq__(self, other):
+        if type(other) is Vector2:
+            return self._x == other._x and self._y == other._y
+        if other is None:
+            return False
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if len(other) != 2:
+            message = f"Can't compare a vector of dimension 2 " \
+                      f"with another vector of dimension {len(other)}!"
+            raise ValueError(message)
+        ox, oy = other
+        return self._x == ox and self._y == oy
+
+    def __add__(self, other):
+        if type(other) is Vector2:
+            return Vector2._make(self._x + other._x, self._y + other._y)
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 2, "Added vector must have numeric "
+                           "components", "Cannot add vectors of two "
+                           "different dimensions")
+        ox, oy = other
+        return Vector2._make(self._x + ox, self._y + oy)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        if type(other) is Vector2:
+            return Vector2._make(self._x - other._x, self._y - other._y)
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 2, "Subtracted vector must have numeric "
+                           "components", "Cannot subtract vectors of two "
+                           "different dimensions")
+        ox, oy = other
+        return Vector2._make(self._x - ox, self._y - oy)
+
+    def __rsub__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 2, "Subtracted vector must have numeric "
+                           "components", "Cannot subtract vectors of two "
+                           "different dimensions")
+        ox, oy = other
+        return Vector2._make(ox - self._x, oy - self._y)
+
+    def __mul__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return Vector2._make(other*self._x, other*self._y)
+        if _validate and not is_numeric(other):
+            raise TypeError("Second argument must be numeric")
+        raise ValueError("Can only perform cross products in R3")
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, m):
+        if _validate:
+            _check_scalar(m, "Vectors can only be divided by a scalar")
+        return Vector2._make(self._x/m, self._y/m)
+
+    def __matmul__(self, other):
+        if type(other) is Vector2:
+            return self._x*other._x + self._y*other._y
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 2, "Can only perform dot produt on numeric "
+                           "vectors", "Cannot perform dot product on vectors "
+                           "of two different dimensions")
+        ox, oy = other
+        return self._x*ox + self._y*oy
+
+    def __rmatmul__(self, other):
+        return self @ other
+
+    def __neg__(self):
+        return Vector2._make(-self._x, -self._y)
+
+    def __abs__(self):
+        return math.sqrt(self._x*self._x + self._y*self._y)
+
+    def __invert__(self):
+        mag = math.sqrt(self._x*self._x + self._y*self._y)
+        if mag == 0:
+            raise ValueError("Cannot normalize the zero vector")
+        m = 1/mag
+        return Vector2._make(m*self._x, m*self._y)
+
+    @property
+    def x(self):
+        """The x-component of a vector. Equivalent to `v[0]`"""
+        return self._x
+    @x.setter
+    def x(self, value):
+        self[0] = value
+
+    @property
+    def y(self):
+        """The y-component of a vector. Equivalent to `v[1]`"""
+        return self._y
+    @y.setter
+    def y(self, value):
+        self[1] = value
+
+    def magSq(self):
+        """Compute the square of the magnitude of this vector."""
+        return self._x*self._x + self._y*self._y
+
+    def addOn(self, other):
+        """Add `other` to this vector. See `Vector.addOn`."""
+        if type(other) is Vector2:
+            self._x += other._x
+            self._y += other._y
+            return
+        if _validate:
+            _check_operand(other, 2, "Added vector must be numeric",
+                           "Added vector must have same dimensions")
+        ox, oy = other
+        self._x += ox
+        self._y += oy
+
+    def takeAway(self, other):
+        """Subtract the vector `other` from this vector. See
+        `Vector.takeAway`."""
+        if type(other) is Vector2:
+            self._x -= other._x
+            self._y -= other._y
+            return
+        if _validate:
+            _check_operand(other, 2, "Added vector must be numeric",
+                           "Added vector must have same dimensions")
+        ox, oy = other
+        self._x -= ox
+        self._y -= oy
+
+    def mul(self, m, out=None):
+        """Return the product of this vector and the scalar `m`. See
+        `Vector.mul`."""
+        if out is not None:
+            return super().mul(m, out)
+        if _validate:
+            _check_scalar(m, "Vectors can only be multiplied by scalars")
+        return Vector2._make(self._x*m, self._y*m)
+
+    def mulBy(self, m):
+        """Multiply this vector by the scalar `m`. See `Vector.mulBy`."""
+        if _validate:
+            _check_scalar(m, "Vectors can only be multiplied by scalars")
+        self._x *= m
+        self._y *= m
+
+    def divBy(self, m):
+        """Divide this vector by the scalar `m`. See `Vector.divBy`."""
+        if _validate:
+            _check_scalar(m, "Vectors can only be divided by scalars")
+        self._x /= m
+        self._y /= m
+
+    def normalize(self):
+        """Normalize this vector. See `Vector.normalize`."""
+        mag = math.sqrt(self._x*self._x + self._y*self._y)
+        if mag == 0:
+            raise ValueError("Cannot normalize the zero vector")
+        self._x /= mag
+        self._y /= mag
+
+    def axpy(self, a, other):
+        """Add `other` scaled by the scalar `a` to this vector. See
+        `Vector.axpy`."""
+        if _validate:
+            _check_scalar(a, "Vectors can only be multiplied by scalars")
+        if type(other) is Vector2:
+            ox, oy = other._x, other._y
+        else:
+            if _validate:
+                _check_operand(other, 2, "Added vector must be numeric",
+                               "Added vector must have same dimensions")
+            ox, oy = other
+        self._x += a*ox
+        self._y += a*oy
+
+    def _assign(self, components):
+        self._x, self._y = components
+
+class Vector3(_BaseVector):
+    """A Vector3 is a `Vector` in R3 that stores its components in fields.
+
+    A Vector3 behaves exactly like a `Vector` of dimension 3, but it has no
+    component list: its x, y and z components are stored directly on the
+    object and every operation is written out for three components, which
+    makes it smaller and faster than a generic vector. Operations between a
+    Vector3 and any numeric collection in R3 give a Vector3.
+    """
+    __slots__ = ['_x', '_y', '_z']
+
+    def __init__(self, *components):
+        """Create a vector in R3.
+
+        The components may be given separately, as in ``Vector3(x, y, z)``, or
+        as a single numeric collection, as in ``Vector3((x, y, z))``.
+        TypeError is raised if the components aren't numeric, and ValueError
+        is raised if there aren't exactly three of them.
+        """
+        if len(components) == 1:
+            components, = components
+        if _validate:
+            if not hasattr(components, '__iter__'):
+                raise TypeError("components must be a collection")
+            _check_operand(components, 3, "components must be numeric values",
+                           "Vector3 must have exactly three components")
+        self._x, self._y, self._z = components
+
+    @classmethod
+    def _make(cls, x, y, z):
+        v = object.__new__(cls)
+        v._x = x
+        v._y = y
+        v._z = z
+        return v
+
+    @classmethod
+    def _from_trusted(cls, components):
+        v = object.__new__(cls)
+        v._x, v._y, v._z = components
+        return v
+
+    @property
+    def _components(self):
+        return [self._x, self._y, self._z]
+    @_components.setter
+    def _components(self, components):
+        self._x, self._y, self._z = components
+
+    def __repr__(self):
+        return "geom.Vector3({}, {}, {})".format(self._x, self._y, self._z)
+
+    def __str__(self):
+        return "<{}, {}, {}>".format(self._x, self._y, self._z)
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, i):
+        if i == 0 or i == -3:
+            return self._x
+        if i == 1 or i == -2:
+            return self._y
+        if i == 2 or i == -1:
+            return self._z
+        raise IndexError("Vector has less than %d dimensions" % (i+1))
+
+    def __iter__(self):
+        yield self._x
+        yield self._y
+        yield self._z
+
+    def __setitem__(self, i, value):
+        if _validate and not isinstance(value, numbers.Number):
+            raise TypeError("Vector components must be numeric")
+        if i == 0 or i == -3:
+            self._x = value
+        elif i == 1 or i == -2:
+            self._y = value
+        elif i == 2 or i == -1:
+            self._z = value
+        else:
+            raise IndexError("Vector has less than %d dimensions" % (i+1))
+
+    def __eq__(self, other):
+        if type(other) is Vector3:
+            return (self._x == other._x and self._y == other._y and
+                    self._z == other._z)
+        if other is None:
+            return False
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if len(other) != 3:
+            message = f"Can't compare a vector of dimension 3 " \
+                      f"with another vector of dimension {len(other)}!"
+            raise ValueError(message)
+        ox, oy, oz = other
+        return self._x == ox and self._y == oy and self._z == oz
+
+    def __add__(self, other):
+        if type(other) is Vector3:
+            return Vector3._make(self._x + other._x, self._y + other._y,
+                                 self._z + other._z)
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 3, "Added vector must have numeric "
+                           "components", "Cannot add vectors of two "
+                           "different dimensions")
+        ox, oy, oz = other
+        return Vector3._make(self._x + ox, self._y + oy, self._z + oz)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        if type(other) is Vector3:
+            return Vector3._make(self._x - other._x, self._y - other._y,
+                                 self._z - other._z)
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 3, "Subtracted vector must have numeric "
+                           "components", "Cannot subtract vectors of two "
+                           "different dimensions")
+        ox, oy, oz = other
+        return Vector3._make(self._x - ox, self._y - oy, self._z - oz)
+
+    def __rsub__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 3, "Subtracted vector must have numeric "
+                           "components", "Cannot subtract vectors of two "
+                           "different dimensions")
+        ox, oy, oz = other
+        return Vector3._make(ox - self._x, oy - self._y, oz - self._z)
+
+    def __mul__(self, other):
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return Vector3._make(other*self._x, other*self._y, other*self._z)
+        if type(other) is Vector3:
+            ox, oy, oz = other._x, other._y, other._z
+        else:
+            if _validate:
+                _check_operand(other, 3, "Second argument must be numeric",
+                               "Can only perform cross products in R3")
+            ox, oy, oz = other
+        x, y, z = self._x, self._y, self._z
+        return Vector3._make(y*oz - z*oy, z*ox - x*oz, x*oy - y*ox)
+
+    def __rmul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return self * other
+        if _validate:
+            _check_operand(other, 3, "Second argument must be numeric",
+                           "Can only perform cross products in R3")
+        x, y, z = other
+        ox, oy, oz = self._x, self._y, self._z
+        return Vector3._make(y*oz - z*oy, z*ox - x*oz, x*oy - y*ox)
+
+    def __truediv__(self, m):
+        if _validate:
+            _check_scalar(m, "Vectors can only be divided by a scalar")
+        return Vector3._make(self._x/m, self._y/m, self._z/m)
+
+    def __matmul__(self, other):
+        if type(other) is Vector3:
+            return self._x*other._x + self._y*other._y + self._z*other._z
+        if isinstance(other, VectorArray):
+            return NotImplemented
+        if _validate:
+            _check_operand(other, 3, "Can only perform dot produt on numeric "
+                           "vectors", "Cannot perform dot product on vectors "
+                           "of two different dimensions")
+        ox, oy, oz = other
+        return self._x*ox + self._y*oy + self._z*oz
+
+    def __rmatmul__(self, other):
+        return self @ other
+
+    def __neg__(self):
+        return Vector3._make(-self._x, -self._y, -self._z)
+
+    def __abs__(self):
+        return math.sqrt(self._x*self._x + self._y*self._y + self._z*self._z)
+
+    def __invert__(self):
+        mag = math.sqrt(self._x*self._x + self._y*self._y + self._z*self._z)
+        if mag == 0:
+            raise ValueError("Cannot normalize the zero vector")
+        m = 1/mag
+        return Vector3._make(m*self._x, m*self._y, m*self._z)
+
+    @property
+    def x(self):
+        """The x-component of a vector. Equivalent to `v[0]`"""
+        return self._x
+    @x.setter
+    def x(self, value):
+        self[0] = value
+
+    @property
+    def y(self):
+        """The y-component of a vector. Equivalent to `v[1]`"""
+        return self._y
+    @y.setter
+    def y(self, value):
+        self[1] = value
+
+    @property
+    def z(self):
+        """The z-component of a vector. Equivalent to `v[2]`"""
+        return self._z
+    @z.setter
+    def z(self, value):
+        self[2] = value
+
+    def magSq(self):
+        """Compute the square of the magnitude of this vector."""
+        return self._x*self._x + self._y*self._y + self._z*self._z
+
+    def addOn(self, other):
+        """Add `other` to this vector. See `Vector.addOn`."""
+        if type(other) is Vector3:
+            self._x += other._x
+            self._y += other._y
+            self._z += other._z
+            return
+        if _validate:
+            _check_operand(other, 3, "Added vector must be numeric",
+                           "Added vector must have same dimensions")
+        ox, oy, oz = other
+        self._x += ox
+        self._y += oy
+        self._z += oz
+
+    def takeAway(self, other):
+        """Subtract the vector `other` from this vector. See
+        `Vector.takeAway`."""
+        if type(other) is Vector3:
+            self._x -= other._x
+            self._y -= other._y
+            self._z -= other._z
+            return
+        if _validate:
+            _check_operand(other, 3, "Added vector must be numeric",
+                           "Added vector must have same dimensions")
+        ox, oy, oz = other
+        self._x -= ox
+        self._y -= oy
+        self._z -= oz
+
+    def mul(self, m, out=None):
+        """Return the product of this vector and the scalar `m`. See
+        `Vector.mul`."""
+        if out is not None:
+            return super().mul(m, out)
+        if _validate:
+            _check_scalar(m, "Vectors can only be multiplied by scalars")
+        return Vector3._make(self._x*m, self._y*m, self._z*m)
+
+    def mulBy(self, m):
+        """Multiply this vector by the scalar `m`. See `Vector.mulBy`."""
+        if _validate:
+            _check_scalar(m, "Vectors can only be multiplied by scalars")
+        self._x *= m
+        self._y *= m
+        self._z *= m
+
+    def divBy(self, m):
+        """Divide this vector by the scalar `m`. See `Vector.divBy`."""
+        if _validate:
+            _check_scalar(m, "Vectors can only be divided by scalars")
+        self._x /= m
+        self._y /= m
+        self._z /= m
+
+    def normalize(self):
+        """Normalize this vector. See `Vector.normalize`."""
+        mag = math.sqrt(self._x*self._x + self._y*self._y + self._z*self._z)
+        if mag == 0:
+            raise ValueError("Cannot normalize the zero vector")
+        self._x /= mag
+        self._y /= mag
+        self._z /= mag
+
+    def axpy(self, a, other):
+        """Add `other` scaled by the scalar `a` to this vector. See
+        `Vector.axpy`."""
+        if _validate:
+            _check_scalar(a, "Vectors can only be multiplied by scalars")
+        if type(other) is Vector3:
+            ox, oy, oz = other._x, other._y, other._z
+        else:
+            if _validate:
+                _check_operand(other, 3, "Added vector must be numeric",
+                               "Added vector must have same dimensions")
+            ox, oy, oz = other
+        self._x += a*ox
+        self._y += a*oy
+        self._z += a*oz
+
+    def _assign(self, components):
+        self._x, self._y, self._z = components
+
+_FIXED_VECTORS = (Vector2, Vector3)
+
+# lazy expressions with more leaves than this are evaluated in parts, which
+# bounds the size of the generated kernels and of their cache
+_LAZY_MAX_LEAVES = 16
+_LAZY_MAX_KERNELS = 256
+
+def _lazy_source(node, names):
+    """Return the expression computing one component of the lazy `node`.
+
+    Each leaf of `node` is appended to `names` as a ``(name, value)`` pair,
+    where vector leaves are named ``v0, v1, ...`` and their components in
+    the expression ``x0, x1, ...``, and scalars are named ``s0, s1, ...``.
+    """
+    op = node[0]
+    if op == 'v':
+        i = sum(1 for n, _ in names if n[0] == 'v')
+        names.append(('v%d' % i, node[1]))
+        return 'x%d' % i
+    if op == 's':
+        i = sum(1 for n, _ in names if n[0] == 's')
+        names.append(('s%d' % i, node[1]))
+        return 's%d' % i
+    if op == 'neg':
+        return '(-' + _lazy_source(node[1], names) + ')'
+    left = _lazy_source(node[1], names)
+    return '(' + left + ' ' + op + ' ' + _lazy_source(node[2], names) + ')'
+
+@functools.lru_cache(maxsize=_LAZY_MAX_KERNELS)
+def _lazy_kernel(expr, params):
+    """Compile the list comprehension computing `expr` over its leaves.
+
+    `expr` and `params` only ever hold the operators and generated names of
+    `_lazy_source`, never user data, and the most recently used kernels are
+    kept for reuse.
+    """
+    vectors = ['x' + n[1:] for n in params if n[0] == 'v']
+    if len(vectors) == 1:
+        loop = 'for {} in v0'.format(vectors[0])
+    else:
+        loop = 'for {} in zip({})'.format(
+            ', '.join(vectors), ', '.join(n for n in params if n[0] == 'v'))
+    source = 'lambda {}: [{} {}]'.format(', '.join(params), expr, loop)
+    return eval(compile(source, '<lazy kernel>', 'eval'), {})
+
+def _evaluate_lazy(node):
+    """Compute the components of the lazy `node` in one fused pass.
+
+    The expression is compiled into a single list comprehension over the
+    components of every leaf, and the compiled kernel is cached by the shape
+    of the expression.
+    """
+    names = []
+    expr = _lazy_source(node, names)
+    kernel = _lazy_kernel(expr, tuple(n for n, _ in names))
+    return kernel(*[value for _, value in names])
+
+class LazyVector(Vector):
+    """A LazyVector is a `Vector` whose value is computed when it's used.
+
+    Adding, subtracting and negating lazy vectors, and multiplying or
+    dividing them by scalars, gives another LazyVector that only records the
+    expression. Its components are computed the first time they're read,
+    indexed or otherwise used, in one pass that evaluates the whole
+    expression for each component, so no intermediate vectors are created.
+    The results are the same as evaluating the expression eagerly, errors
+    such as dividing by zero are raised when the expression is built, and
+    combining a lazy vector with a `Vector2` or `Vector3` gives a `Vector2`
+    or `Vector3` just like a `Vector` does. Every other operation first
+    computes the value and then behaves exactly like a `Vector`. Pickled
+    lazy vectors are unpickled as evaluated lazy vectors.
+
+    Create a LazyVector with `Vector.lazy`, or from components like a
+    `Vector`. Operands are read when the value is computed, not when the
+    expression is built, so they shouldn't be modified in between. Building
+    the expression has a fixed cost per operator, so lazy evaluation pays
+    off for vectors with many components; for vectors in R2 or R3 prefer
+    `Vector2` and `Vector3`.
+    """
+    __slots__ = ['_node', '_value', '_dim', '_leaves']
+
+    def __init__(self, components, storage=None):
+        """Create a lazy vector whose value is `components`.
+
+        The arguments and errors are the same as for `Vector`.
+        """
+        super().__init__(components, storage)
+        self._dim = len(self._value)
+        self._leaves = 1
+
+    @classmethod
+    def _make(cls, node, dim, leaves):
+        v = object.__new__(cls)
+        v._node = node
+        v._value = None
+        v._dim = dim
+        v._leaves = leaves
+        v._magsq = v._mag = None
+        return v
+
+    @classmethod
+    def _from_trusted(cls, components):
+        v = cls._make(None, len(components), 1)
+        v._value = components
+        return v
+
+    @property
+    def _components(self):
+        value = self._value
+        if value is None:
+            value = self._value = _evaluate_lazy(self._node)
+            self._node = None
+        return value
+    @_components.setter
+    def _components(self, components):
+        self._value = components
+        self._node = None
+
+    def __len__(self):
+        return self._dim
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle_vector, (LazyVector, list(self._components))
+
+    def _lazy_node(self, room):
+        """Return this vector as a lazy node with at most `room` leaves."""
+        if self._value is None and self._leaves <= room:
+            return self._node, self._leaves
+        return ('v', self._components), 1
+
+    def _combine(self, op, other, name, reflected=False):
+        """Return the lazy vector of `self op other`, or of `other op self`.
+
+        `name` prefixes the errors raised when `other` isn't a numeric
+        collection of the same dimension.
+        """
+        if isinstance(other, VectorArray) or type(other) in _FIXED_VECTORS:
+            return NotImplemented
+        if isinstance(other, LazyVector):
+            if other._dim != self._dim:
+                raise ValueError("Cannot {} vectors of two different "
+                                 "dimensions".format(name))
+            onode, oleaves = other._lazy_node(_LAZY_MAX_LEAVES - 1)
+        else:
+            if _validate:
+                if not is_numeric(other):
+                    raise TypeError("{}ed vector must have numeric "
+                                    "components".format(name.capitalize()))
+                if len(other) != self._dim:
+                    raise ValueError("Cannot {} vectors of two different "
+                                     "dimensions".format(name))
+            if isinstance(other, _BaseVector):
+                other = other._components
+            onode, oleaves = ('v', other), 1
+        node, leaves = self._lazy_node(_LAZY_MAX_LEAVES - oleaves)
+        if reflected:
+            node = (op, onode, node)
+        else:
+            node = (op, node, onode)
+        return LazyVector._make(node, self._dim, leaves + oleaves)
+
+    def _scale(self, op, m):
+        """Return the lazy vector of `m * self` or `self / m`."""
+        node, leaves = self._lazy_node(_LAZY_MAX_LEAVES - 1)
+        if op == '*':
+            node = ('*', ('s', m), node)
+        else:
+            node = ('/', node, ('s', m))
+        return LazyVector._make(node, self._dim, leaves + 1)
+
+    def __add__(self, other):
+        return self._combine('+', other, "add")
+
+    def __radd__(self, other):
+        return self._combine('+', other, "add")
+
+    def __sub__(self, other):
+        return self._combine('-', other, "subtract")
+
+    def __rsub__(self, other):
+        # mirrors Vector.__rsub__, which computes -self + other
+        return (-self)._combine('+', other, "subtract")
+
+    def __neg__(self):
+        node, leaves = self._lazy_node(_LAZY_MAX_LEAVES)
+        return LazyVector._make(('neg', node), self._dim, leaves)
+
+    def __mul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return self._scale('*', other)
+        if type(other) in _FIXED_VECTORS:
+            return NotImplemented
+        return super().__mul__(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return self._scale('*', other)
+        return super().__rmul__(other)
+
+    def __truediv__(self, m):
+        if _validate and (not isinstance(m, numbers.Number) or
+                          isinstance(m, bool)):
+            raise TypeError("Vectors can only be divided by a scalar")
+        # numpy scalars divide by zero to infinities, and eagerly do the same
+        if m == 0 and not (np is not None and isinstance(m, np.generic)):
+            raise ZeroDivisionError("division by zero")
+        return self._scale('/', m)
+
+    def lazy(self):
+        return self
+
+    def vector(self):
+        """Return the value of this lazy vector as a new `Vector`."""
+        if self._value is None:
+            return Vector._from_trusted(_evaluate_lazy(self._node))
+        return Vector._from_trusted(list(self._value))
+
+def _require_numpy(name):
+    """Raise ImportError if numpy isn't available for the feature `name`."""
+    if np is None:
+        raise ImportError("{} requires numpy; install it with "
+                          "`python3 -m pip install geom[numpy]`".format(name))
+
+def _pickled_array(array, protocol):
+    """Return `array` in the form it should be pickled with `protocol`.
+
+    From protocol 5 the array is exposed as a `pickle.PickleBuffer`, so
+    pickle can pass it out-of-band instead of copying it into the stream.
+    """
+    if protocol < 5:
+        return array
+    array = np.ascontiguousarray(array)
+    return pickle.PickleBuffer(array), array.dtype.str, array.shape
+
+def _unpickled_array(pickled):
+    """Return the array pickled by `_pickled_array`."""
+    if isinstance(pickled, np.ndarray):
+        return pickled
+    buffer, dtype, shape = pickled
+    return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+def _unpickle_arrays(cls, *pickled):
+    """Rebuild a pickled `VectorArray` or `CircleArray` of type `cls`."""
+    return cls._wrap(*[_unpickled_array(p) for p in pickled])
+
+# the most vectors VectorArray.axpy scales at a time
+_AXPY_BLOCK = 16384
+
+class VectorArray:
+    """A VectorArray stores many vectors of one dimension in a single array.
+
+    The vectors are kept in one contiguous two-dimensional numpy buffer, so
+    every operation is evaluated over the whole array at once instead of one
+    `Vector` at a time. numpy must be installed to use a VectorArray.
+
+    Pickling a VectorArray with protocol 5 passes its buffer as a
+    `pickle.PickleBuffer`, so it can be sent out-of-band without copying,
+    which makes it the cheap way to move many vectors between processes.
+
+    **Overloaded Operations**
+
+    | `len(a)` gives the number of vectors in the array `a`
+    | `abs(a)` gives an array of the magnitudes of each vector in `a`
+    | `~a` gives a vector array of the normalized vectors in `a`
+    | `-a` gives a vector array of the vectors in `a` in the opposite direction
+    | `a[i]` gives the ith vector of `a` as a `geom.Vector`
+    | `a == b` compare the vectors of `a` and `b` for equality, one by one
+    | `a + b` adds the vectors of `a` and `b` together
+    | `a - b` subtracts the vectors of `b` from the vectors of `a`
+    | `a * m` multiplies all vectors of `a` by a scalar `m`
+    | `a / m` divides all vectors of `a` by a non-zero scalar `m`
+    | `a * b` computes the cross products of the vectors of `a` with `b`, where
+    |           `a` and `b` are in R3.
+    | `a @ b` computes an array of the dot products of `a` and `b`
+
+    For binary operations, the other argument may be another vector array with
+    the same length and dimension, in which case the operation is evaluated
+    vector by vector, or a single numeric collection of the same dimension,
+    in which case it is broadcast against every vector in the array.
+    """
+    __slots__ = ['_array', '_scratch']
+    __array_ufunc__ = None
+    __hash__ = None
+
+    def __init__(self, vectors):
+        """Create a vector array from `vectors`.
+
+        `vectors` should be a collection of numeric collections that all have
+        the same dimension, or a two-dimensional numpy array. The components
+        are copied into a new array of floats. ImportError is raised if numpy
+        isn't installed. TypeError is raised if the components aren't real
+        numbers, and ValueError is raised if the vectors are empty or don't
+        all have the same dimension.
+        """
+        _require_numpy("VectorArray")
+        if not hasattr(vectors, '__iter__'):
+            raise TypeError("vectors must be a collection")
+        if not isinstance(vectors, np.ndarray):
+            vectors = [list(v) if hasattr(v, '__iter__') else v
+                       for v in vectors]
+            if len(vectors) == 0:
+                raise ValueError("cannot determine the dimension of no "
+                                 "vectors")
+        try:
+            array = np.array(vectors)
+        except ValueError:
+            raise ValueError("vectors must all be collections of the same "
+                             "dimension") from None
+        if array.dtype.kind not in 'iuf':
+            raise TypeError("vector components must be real numbers")
+        if array.ndim != 2:
+            raise ValueError("vectors must all be collections of the same "
+                             "dimension")
+        if array.shape[1] == 0:
+            raise ValueError("vectors cannot be empty")
+        if array.dtype.kind != 'f':
+            array = array.astype(float)
+        self._array = array
+        self._scratch = None
+
+    @classmethod
+    def _wrap(cls, array):
+        """Create a vector array that uses `array` without copying it.
+
+        `array` is trusted to be a two-dimensional float array.
+        """
+        varr = object.__new__(cls)
+        varr._array = array
+        varr._scratch = None
+        return varr
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Create a vector array from a collection of vectors.
+
+        Equivalent to `VectorArray(vectors)`.
+        """
+        return cls(vectors)
+
+    def to_vectors(self):
+        """Return the vectors of this array as a list of `geom.Vector`."""
+        return [Vector._from_trusted(row) for row in self._array.tolist()]
+
+    @property
+    def array(self):
+        """The numpy array backing this vector array.
+
+        The array has shape ``(len(a), a.dim)`` and is not a copy, so
+        modifying it modifies the vector array.
+        """
+        return self._array
+
+    @property
+    def dim(self):
+        """The dimension of the vectors in this array."""
+        return self._array.shape[1]
+
+    def __str__(self):
+        return "[" + ", ".join(str(v) for v in self) + "]"
+
+    def __repr__(self):
+        return "geom.VectorArray(" + str(self._array.tolist()) + ")"
+
+    def __len__(self):
+        return self._array.shape[0]
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle_arrays, (type(self),
+                                  _pickled_array(self._array, protocol))
+
+    def __getitem__(self, i):
+        if isinstance(i, numbers.Integral):
+            if not -len(self) <= i < len(self):
+                raise IndexError("VectorArray has less than %d vectors"
+                                 % (i+1))
+            return Vector._from_trusted(self._array[i].tolist())
+        return VectorArray._wrap(self._array[i].reshape(-1, self.dim))
+
+    def __setitem__(self, i, vector):
+        self._array[i] = self._operand(vector, "Assigned vector")
+
+    def __iter__(self):
+        for row in self._array.tolist():
+            yield Vector._from_trusted(row)
+
+    def _operand(self, other, name):
+        """Return `other` as an array that broadcasts against this array.
+
+        TypeError is raised if `other` isn't numeric, and ValueError is raised
+        if it has a different length or dimension than this array.
+        """
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(name + " array must have the same length")
+            other = other._array
+        elif isinstance(other, np.ndarray):
+            if other.dtype.kind not in 'iuf':
+                raise TypeError(name + " must have numeric components")
+        elif not is_numeric(other) or isinstance(other, numbers.Number):
+            raise TypeError(name + " must have numeric components")
+        else:
+            other = np.array(list(other), dtype=float)
+        if other.ndim == 0 or other.shape[-1] != self.dim:
+            raise ValueError(name + " must have the same dimension")
+        return other
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        try:
+            other = self._operand(other, "Compared vector")
+        except TypeError:
+            return NotImplemented
+        return np.all(self._array == other, axis=-1)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        if eq is NotImplemented:
+            return eq
+        return np.logical_not(eq)
+
+    def __add__(self, other):
+        return VectorArray._wrap(self._array + self._operand(other,
+                                                             "Added vector"))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        other = self._operand(other, "Subtracted vector")
+        return VectorArray._wrap(self._array - other)
+
+    def __rsub__(self, other):
+        other = self._operand(other, "Subtracted vector")
+        return VectorArray._wrap(other - self._array)
+
+    def __mul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return VectorArray._wrap(self._array * other)
+        other = self._operand(other, "Second argument")
+        if self.dim != 3:
+            raise ValueError("Can only perform cross products in R3")
+        return VectorArray._wrap(np.cross(self._array, other))
+
+    def __rmul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            return self * other
+        other = self._operand(other, "Second argument")
+        if self.dim != 3:
+            raise ValueError("Can only perform cross products in R3")
+        return VectorArray._wrap(np.cross(other, self._array))
+
+    def __truediv__(self, m):
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("Vectors can only be divided by a scalar")
+        if m == 0:
+            raise ZeroDivisionError("division by zero")
+        return VectorArray._wrap(self._array / m)
+
+    def __matmul__(self, other):
+        other = self._operand(other, "Dotted vector")
+        return np.einsum('...i,...i->...', self._array, other)
+
+    def __rmatmul__(self, other):
+        return self @ other
+
+    def __iadd__(self, other):
+        self._array += self._operand(other, "Added vector")
+        return self
+
+    def __isub__(self, other):
+        self._array -= self._operand(other, "Subtracted vector")
+        return self
+
+    def __imul__(self, other):
+        if isinstance(other, numbers.Number) and not isinstance(other, bool):
+            self._array *= other
+        else:
+            self._array[...] = (self * other)._array
+        return self
+
+    def __itruediv__(self, m):
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("Vectors can only be divided by a scalar")
+        if m == 0:
+            raise ZeroDivisionError("division by zero")
+        self._array /= m
+        return self
+
+    def __neg__(self):
+        return VectorArray._wrap(-self._array)
+
+    def __abs__(self):
+        return np.sqrt(self.magSq())
+
+    def __invert__(self):
+        mag = abs(self)
+        if np.any(mag == 0):
+            raise ValueError("Cannot normalize the zero vector")
+        return VectorArray._wrap(self._array / mag[:, np.newaxis])
+
+    @property
+    def x(self):
+        """The x-components of the vectors. Equivalent to `a.array[:, 0]`"""
+        return self._array[:, 0]
+
+    @property
+    def y(self):
+        """The y-components of the vectors. Equivalent to `a.array[:, 1]`"""
+        if self.dim < 2:
+            raise IndexError("VectorArray has less than 2 dimensions")
+        return self._array[:, 1]
+
+    @property
+    def z(self):
+        """The z-components of the vectors. Equivalent to `a.array[:, 2]`"""
+        if self.dim < 3:
+            raise IndexError("VectorArray has less than 3 dimensions")
+        return self._array[:, 2]
+
+    def mag(self):
+        """Compute the magnitudes of the vectors. Equivalent to `abs(a)`."""
+        return abs(self)
+
+    def magSq(self):
+        """Compute the squares of the magnitudes of the vectors."""
+        return np.einsum('ij,ij->i', self._array, self._array)
+
+    def _out(self, out):
+        """Return the array of the vector array `out`, or None."""
+        if out is None:
+            return None
+        if not isinstance(out, VectorArray):
+            raise TypeError("out must be a VectorArray")
+        if out._array.shape != self._array.shape:
+            raise ValueError("out must have the same length and dimension")
+        return out._array
+
+    def add(self, other, out=None):
+        """Return the sum of this vector array and `other`.
+
+        Equivalent to `a + other`. If the vector array `out` is given, the sum
+        is written into it and `out` is returned instead of a new array.
+        """
+        if out is None:
+            return self + other
+        np.add(self._array, self._operand(other, "Added vector"),
+               out=self._out(out))
+        return out
+
+    def sub(self, other, out=None):
+        """Return the difference of this vector array and `other`.
+
+        Equivalent to `a - other`. If the vector array `out` is given, the
+        difference is written into it and `out` is returned instead of a new
+        array.
+        """
+        if out is None:
+            return self - other
+        np.subtract(self._array, self._operand(other, "Subtracted vector"),
+                    out=self._out(out))
+        return out
+
+    def mul(self, m, out=None):
+        """Return the product of this vector array and the scalar `m`.
+
+        Equivalent to `a * m`. If the vector array `out` is given, the product
+        is written into it and `out` is returned instead of a new array.
+        TypeError is raised if m is not a number.
+        """
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("Vectors can only be multiplied by scalars")
+        if out is None:
+            return self * m
+        np.multiply(self._array, m, out=self._out(out))
+        return out
+
+    def div(self, m, out=None):
+        """Return the quotient of this vector array and the scalar `m`.
+
+        Equivalent to `a / m`. If the vector array `out` is given, the
+        quotient is written into it and `out` is returned instead of a new
+        array.
+        """
+        if out is None:
+            return self / m
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("Vectors can only be divided by a scalar")
+        if m == 0:
+            raise ZeroDivisionError("division by zero")
+        np.divide(self._array, m, out=self._out(out))
+        return out
+
+    def axpy(self, a, other):
+        """Add `other` scaled by the scalar `a` to every vector of this array.
+
+        Equivalent to `arr += a*other`, where `other` is a vector array of the
+        same length or a single vector. The scaled vectors are computed a block
+        at a time into a buffer the array keeps, so no temporary array is
+        allocated.
+        """
+        if not isinstance(a, numbers.Number) or isinstance(a, bool):
+            raise TypeError("Vectors can only be multiplied by scalars")
+        other = self._operand(other, "Added vector")
+        array = self._array
+        if other.ndim == 1 or len(array) == 0:
+            array += a*other
+            return
+        size = min(len(array), _AXPY_BLOCK)
+        scratch = self._scratch
+        if scratch is None or scratch.shape != (size, array.shape[1]):
+            scratch = self._scratch = np.empty((size, array.shape[1]))
+        for start in range(0, len(array), size):
+            block = array[start:start + size]
+            buffer = scratch[:len(block)]
+            np.multiply(other[start:start + size], a, out=buffer)
+            np.add(block, buffer, out=block)
+
+    def dot(self, other):
+        """Return the dot products of this vector array and `other`.
+
+        Equivalent to `a @ other`.
+        """
+        return self @ other
+
+    def isclose(self, other, tol=EPSILON):
+        """Return a boolean array of which vectors are within `tol` of `other`.
+
+        Like `Vector.isclose`, each component may differ from the component of
+        `other` by up to `tol`. `other` may be a vector array of the same
+        length or a single vector, as for the arithmetic operators.
+        """
+        _check_tolerance(tol)
+        other = self._operand(other, "Compared vector")
+        return np.all(np.abs(self._array - other) <= tol, axis=-1)
+
+    def allclose(self, other, tol=EPSILON):
+        """Determine if every vector is within `tol` of `other`.
+
+        Equivalent to ``a.isclose(other, tol).all()``.
+        """
+        return bool(self.isclose(other, tol).all())
+
+    def cross(self, other, out=None):
+        """Return the cross products of this vector array and `other`.
+
+        Equivalent to `a * other`. If the vector array `out` is given, the
+        cross products are written into it and `out` is returned instead of a
+        new array. ValueError is raised if the vectors are not in R3.
+        """
+        if isinstance(other, numbers.Number):
+            raise TypeError("Can only perform cross products with vectors")
+        if out is None:
+            return self * other
+        self._out(out)[...] = (self * other)._array
+        return out
+
+    def norm(self, out=None):
+        """Return the normalized vectors of this array. Equivalent to `~a`.
+
+        If the vector array `out` is given, the normalized vectors are written
+        into it and `out` is returned instead of a new array.
+        """
+        if out is None:
+            return ~self
+        target = self._out(out)
+        mag = abs(self)
+        if np.any(mag == 0):
+            raise ValueError("Cannot normalize the zero vector")
+        np.divide(self._array, mag[:, np.newaxis], out=target)
+        return out
+
+class Circle(object):
+    """A Circle stores basic circle info and provides relevant useful methods.
+    """
+    __slots__ = ['_center', '_radius']
+    def __init__(self, center, radius):
+        """Create a circle with a given ``center`` and ``radius``.
+
+        TypeError is raised if center is not a numeric collection or if radius
+        is not a number. ValueError is raised if center is not in R2 or if
+        radius is not a real non-negative number.
+        """
+        self.center = center
+        self.radius = radius
+
+    @classmethod
+    def _from_trusted(cls, center, radius):
+        """Create a circle that uses the vector `center` without checks.
+
+        `center` is trusted to be a `Vector` in R2 that no other object holds,
+        and `radius` a non-negative number.
+        """
+        c = object.__new__(cls)
+        c._center = center
+        c._radius = radius
+        return c
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle_circle, (type(self), list(self._center),
+                                  self._radius)
+
+    @classmethod
+    def enclosing(cls, points):
+        """Create the smallest circle that contains every point of `points`.
+
+        `points` may be a `VectorArray`, a two-dimensional numpy array, or a
+        collection of numeric collections in R2. Welzl's randomized algorithm
+        is used, written as loops rather than recursion, so it takes expected
+        linear time and any number of points. For points that arrive in
+        chunks, use an `EnclosingCircle`. TypeError is raised if the points
+        aren't numeric, and ValueError is raised if there are none or they're
+        not in R2.
+        """
+        X, Y = _enclosing_columns(points)
+        if len(X) == 0:
+            raise ValueError("cannot enclose no points")
+        x, y, r = _enclosing_circle(X, Y)
+        return cls._from_trusted(Vector._from_trusted([x, y]), r)
+
+    def __str__(self):
+        s = 'Circle(<{}, {}>, {})'.format(self.center.x, self.center.y,
+                                          self.radius)
+        return s
+
+    def __repr__(self):
+        s = 'geom.Circle(<{}, {}>, {})'.format(self.center.x, self.center.y,
+                                               self.radius)
+        return s
+
+    @property
+    def center(self):
+        """The center of the circle.
+
+        center is stored as a Vector. Setting center will raise TypeError if
+        it's not numeric, AttributeError if has no length, and ValueError
+        if it's not in R2.
+        """
+        return self._center
+    @center.setter
+    def center(self, center):
+        if _validate:
+            if not is_numeric(center):
+                raise TypeError("center must be numeric")
+            if not hasattr(center, '__len__'):
+                raise AttributeError("center must have a length attribute")
+            if len(center) != 2:
+                raise ValueError("center must be in R2")
+        self._center = Vector._from_trusted(list(center))
+
+    @property
+    def radius(self):
+        """The radius of the circle.
+
+        Setting radius will raise TypeError if it's not numeric and ValueError
+        if it's negative.
+        """
+        return self._radius
+    @radius.setter
+    def radius(self, r):
+        if _validate:
+            if not is_numeric(r):
+                raise TypeError("radius must be numeric")
+            if r < 0:
+                raise ValueError("radius must be non-negative")
+        self._radius = r
+
+    @property
+    def area(self):
+        """The area of the circle.
+
+        Defined as pi*r*r. Setting the area will change the radius of the
+        circle. Setting the area will raise TypeError if it's not numeric and
+        ValueError if it's less than zero.
+        """
+        return math.pi*self._radius*self._radius
+    @area.setter
+    def area(self, a):
+        if not isinstance(a, numbers.Number) or isinstance(a, bool):
+            raise TypeError("area must be a number")
+        if a < 0:
+            raise ValueError("area must be non-negative")
+        self._radius = math.sqrt(a/math.pi)
+
+    @property
+    def circumference(self):
+        """The circumference of the circle.
+
+        Defined as 2*pi*r. Setting the circumference will change the radius of
+        the circle; raises TypeError if it's not numeric and ValueError if it's
+        less than zero.
+        """
+        return 2*math.pi*self._radius
+    @circumference.setter
+    def circumference(self, c):
+        if not isinstance(c, numbers.Number) or isinstance(c, bool):
+            raise TypeError("circumference must be a number")
+        if c < 0:
+            raise ValueError("circumference must be non-negative")
+        self._radius = c/(2*math.pi)
+
+    def scaled_to(self, m, attr="radius"):
+        """Return a new circle scaled to m.
+
+        By default, `m` is used to scale the radius. Calling ``scaled_to`` with
+        ``attr="area"`` cause `m` to scale the area instead of the radius, and
+        calling it with ``attr="circumference"`` will cauese `m` to scale the
+        circumference. ``scaled_to`` will raise TypeError if `m` isn't numeric
+        or if `attr` isn't a string, and ValueError if `m` is less than zero or
+        if `attr` isn't ``'radius'``, ``'circumference'``, or ``'area'``.
+        """
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("m must be a number")
+        if m < 0:
+            raise ValueError("m must be non-negative")
+        if not isinstance(attr, str):
+            raise TypeError("attr must be a string")
+        if attr.lower() not in ("radius", "area", "circumference"):
+            raise ValueError("attr must be 'radius', 'area', "
+                             "or 'circumference'")
+        center = Vector._from_trusted(list(self._center))
+        if attr.lower() == 'radius':
+            return Circle._from_trusted(center, m)
+        elif attr.lower() == 'circumference':
+            return Circle._from_trusted(center, m/(2*math.pi))
+        return Circle._from_trusted(center, math.sqrt(m/math.pi))
+
+    def scaled_by(self, m, attr="radius"):
+        """Return a copy of this circle scaled by a factor of m.
+
+        By default, `m` is used to scale the radius. Calling ``scaled_by`` with
+        ``attr="area"`` cause `m` to scale the area instead of the radius.
+        ``scaled_by`` will raise TypeError if `m` isn't numeric or if `attr`
+        isn't a string, and ValueError if `m` is less than zero or if `attr` is
+        neither ``'radius'`` nor ``'area'``.
+        """
+        if not isinstance(m, numbers.Number) or isinstance(m, bool):
+            raise TypeError("m must be a number")
+        if m < 0:
+            raise ValueError("m must be non-negative")
+        if not isinstance(attr, str):
+            raise TypeError("attr must be a string")
+        if attr.lower() not in ("radius", "area"):
+            raise ValueError("attr must be either 'radius' or 'area'")
+
+        r = self.radius
+        if attr.lower() == 'radius':
+            r *= m
+        elif attr.lower() == 'area':
+            # pi r2^2 == m pi r1^2
+            # r2^2 = m r1^2
+            # r2 = m^.5 r1
+            r *= math.sqrt(m)
+        return Circle._from_trusted(Vector._from_trusted(list(self._center)),
+                                    r)
+
+    def moved_to(self, position):
+        """Return a copy of this circle moved to the given position.
+
+        TypeError is raised if `position` is not a numeric collection.
+        ValueError is raised if `position` is not in R2.
+        """
+        if _validate:
+            if not is_numeric(position) or \
+                    isinstance(position, numbers.Number):
+                raise TypeError("position must be a numeric collection")
+            if len(position) != 2:
+                raise ValueError("position must be in R2")
+        return Circle._from_trusted(Vector._from_trusted(list(position)),
+                                    self._radius)
+
+    def moved_by(self, vector):
+        """Return a copy of this circle moved by the given vector.
+
+        TypeError is raised if `vector` is not a numeric collection.
+        ValueError is raised if `position` is not in R2.
+        """
+        if _validate:
+            if not is_numeric(vector) or isinstance(vector, numbers.Number):
+                raise TypeError("vector must be a numeric collection")
+            if len(vector) != 2:
+                raise ValueError("vector must be in R2")
+        return Circle._from_trusted(self._center + vector, self._radius)
+
+    def intersects(self, other):
+        """Return true if this circle intersects the geometric object `other`.
+
+        `other` may be a numeric collection in R2, or some form of a circle.
+        TypeError is raised if other is neither of these things.
+        """
+        if hasattr(other, 'center') and hasattr(other, 'radius'):
+            d = other.center-self.center
+            r = other.radius+self.radius
+            return abs(d) <= r
+        try:
+            other = Vector(other)
+            other = other - self.center
+            return abs(other) <= self.radius
+        except (TypeError, ValueError):
+            pass
+        msg = 'Intersection with {} and Circle is undefined'.format(str(other))
+        raise TypeError(msg)
+
+def _unpickle_circle(cls, center, radius):
+    """Rebuild a pickled circle of type `cls` without validating it."""
+    return cls._from_trusted(Vector._from_trusted(center), radius)
+
+def _enclosing_columns(points):
+    """Return the x and y columns of `points` for `_enclosing_circle`.
+
+    They're float arrays if numpy is installed, and lists otherwise.
+    """
+    if isinstance(points, VectorArray):
+        array = points.array
+    elif np is not None and isinstance(points, np.ndarray):
+        if points.dtype.kind not in 'iuf':
+            raise TypeError("points must be numeric")
+        array = points.reshape(-1, points.shape[-1]) if points.size else \
+            points.reshape(0, 2)
+    else:
+        rows = _point_rows(points)
+        if rows and len(rows[0]) != 2:
+            raise ValueError("points must be in R2")
+        if np is None:
+            return [p[0] for p in rows], [p[1] for p in rows]
+        array = np.array(rows, dtype=float).reshape(-1, 2)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError("points must be in R2")
+    return array[:, 0].astype(float), array[:, 1].astype(float)
+
+def _circumcircle(ax, ay, bx, by, cx, cy):
+    """Return the circle through three points as ``(x, y, r)``.
+
+    Nearly collinear points give the circle on their farthest pair instead.
+    """
+    bx -= ax
+    by -= ay
+    cx -= ax
+    cy -= ay
+    d = 2*(bx*cy - by*cx)
+    b2 = bx*bx + by*by
+    c2 = cx*cx + cy*cy
+    if abs(d) <= EPSILON * max(b2, c2):
+        pairs = ((0, 0, bx, by), (0, 0, cx, cy), (bx, by, cx, cy))
+        x1, y1, x2, y2 = max(pairs, key=lambda p: (p[2]-p[0])**2 +
+                             (p[3]-p[1])**2)
+        return (ax + (x1 + x2)/2, ay + (y1 + y2)/2,
+                math.hypot(x2 - x1, y2 - y1)/2)
+    ux = (cy*b2 - by*c2)/d
+    uy = (bx*c2 - cx*b2)/d
+    return ax + ux, ay + uy, math.hypot(ux, uy)
+
+def _enclosing_circle(X, Y):
+    """Return the smallest circle containing the points `X`, `Y`.
+
+    This is Welzl's algorithm unrolled into three nested loops over the
+    points in random order: each loop looks for the next point outside the
+    current circle, and rebuilds the circle with that point on its boundary.
+    With numpy arrays the search is vectorized in growing blocks.
+    """
+    n = len(X)
+    if np is not None and isinstance(X, np.ndarray):
+        order = np.random.default_rng(0).permutation(n)
+        X, Y = X[order], Y[order]
+        find = _outside_array
+    else:
+        order = list(range(n))
+        random.Random(0).shuffle(order)
+        X, Y = [X[i] for i in order], [Y[i] for i in order]
+        find = _outside_list
+
+    x, y, r = float(X[0]), float(Y[0]), 0.0
+    i = find(X, Y, 1, n, x, y, r)
+    while i < n:
+        xi, yi = float(X[i]), float(Y[i])
+        x, y, r = xi, yi, 0.0
+        j = find(X, Y, 0, i, x, y, r)
+        while j < i:
+            xj, yj = float(X[j]), float(Y[j])
+            x, y = (xi + xj)/2, (yi + yj)/2
+            r = math.hypot(xi - xj, yi - yj)/2
+            k = find(X, Y, 0, j, x, y, r)
+            while k < j:
+                x, y, r = _circumcircle(xi, yi, xj, yj,
+                                        float(X[k]), float(Y[k]))
+                k = find(X, Y, k + 1, j, x, y, r)
+            j = find(X, Y, j + 1, i, x, y, r)
+        i = find(X, Y, i + 1, n, x, y, r)
+
+    # the tolerance can leave points a hair outside, so widen the circle
+    # until every point passes the exact test of Circle.intersects
+    if find is _outside_array:
+        far = float(np.sqrt((X - x)**2 + (Y - y)**2).max())
+    else:
+        far = max(math.sqrt((px - x)**2 + (py - y)**2)
+                  for px, py in zip(X, Y))
+    return x, y, max(r, far)
+
+def _outside_list(X, Y, start, stop, x, y, r):
+    """Return the first index in ``start:stop`` outside of a circle.
+
+    Points within `EPSILON` of the circle, relative to its size, count as
+    inside. Returns `stop` if every point is inside.
+    """
+    bound = r + EPSILON * max(r, 1)
+    bound *= bound
+    for i in range(start, stop):
+        dx = X[i] - x
+        dy = Y[i] - y
+        if dx*dx + dy*dy > bound:
+            return i
+    return stop
+
+def _outside_array(X, Y, start, stop, x, y, r):
+    """Like `_outside_list` for numpy arrays, searching in growing blocks."""
+    bound = r + EPSILON * max(r, 1)
+    bound *= bound
+    size = 64
+    while start < stop:
+        end = min(start + size, stop)
+        dx = X[start:end] - x
+        dy = Y[start:end] - y
+        hits = np.flatnonzero(dx*dx + dy*dy > bound)
+        if len(hits):
+            return start + int(hits[0])
+        start = end
+        size = min(size * 4, 1 << 16)
+    return stop
+
+def _convex_hull(points):
+    """Return the vertices of the convex hull of a list of ``(x, y)`` tuples.
+
+    Uses Andrew's monotone chain, so it takes O(n log n) time.
+    """
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def chain(points):
+        hull = []
+        for p in points:
+            while len(hull) >= 2:
+                (ox, oy), (ax, ay) = hull[-2], hull[-1]
+                if (ax - ox)*(p[1] - oy) - (ay - oy)*(p[0] - ox) > 0:
+                    break
+                hull.pop()
+            hull.append(p)
+        return hull[:-1]
+    return chain(points) + chain(reversed(points))
+
+def _hull_candidates(points):
+    """Drop the points of an (N, 2) array that can't be on its convex hull.
+
+    Points strictly inside the quadrilateral of the leftmost, lowest,
+    rightmost and highest points are dropped, which is most of them for
+    typical point clouds.
+    """
+    corners = points[[points[:, 0].argmin(), points[:, 1].argmin(),
+                      points[:, 0].argmax(), points[:, 1].argmax()]]
+    inside = np.ones(len(points), dtype=bool)
+    for (ax, ay), (bx, by) in zip(corners, np.roll(corners, -1, axis=0)):
+        inside &= ((bx - ax)*(points[:, 1] - ay) -
+                   (by - ay)*(points[:, 0] - ax)) > 0
+    return points[~inside]
+
+# the most points an EnclosingCircle keeps off the hull before rebuilding it,
+# beyond the number on the hull
+_ENCLOSING_BATCH = 256
+
+class EnclosingCircle:
+    """An EnclosingCircle keeps the smallest circle containing a point stream.
+
+    Points are added one at a time or in chunks, and `circle` is always the
+    smallest circle containing every point added so far. No point inside
+    the convex hull of the points can touch the smallest enclosing circle,
+    so only the hull vertices are kept, along with a batch of the newest
+    points that the hull is rebuilt from once the batch is as large as the
+    hull. The memory used is O(h) for h hull vertices, which is all of the
+    points in the worst case, such as points on a circle. The circle is only
+    recomputed, with `Circle.enclosing`, when a chunk has a point outside of
+    it.
+    """
+    __slots__ = ['_hull', '_pending', '_circle']
+
+    def __init__(self, points=()):
+        """Create an enclosing circle for `points`.
+
+        `points` may be anything accepted by `Circle.enclosing`, and may be
+        empty, in which case there's no circle until points are added.
+        """
+        self._hull = []
+        self._pending = []
+        self._circle = None
+        self.extend(points)
+
+    @property
+    def circle(self):
+        """The smallest circle containing every point added, or None.
+
+        None is given until a point is added. A new `Circle` is returned each
+        time, so it may be changed freely.
+        """
+        c = self._circle
+        if c is None:
+            return None
+        return Circle._from_trusted(Vector._from_trusted(list(c.center)),
+                                    c.radius)
+
+    def __len__(self):
+        """The number of points kept: the hull and the pending batch."""
+        return len(self._hull) + len(self._pending)
+
+    def add(self, point):
+        """Add `point` to the enclosed points.
+
+        TypeError is raised if `point` is not a numeric collection, and
+        ValueError is raised if it's not in R2.
+        """
+        self.extend([_point2(point, "point")])
+
+    def extend(self, points):
+        """Add every point of `points` to the enclosed points.
+
+        `points` may be anything accepted by `Circle.enclosing`.
+        """
+        X, Y = _enclosing_columns(points)
+        if len(X) == 0:
+            return
+        c = self._circle
+        if np is not None and isinstance(X, np.ndarray):
+            if c is not None:
+                cx, cy = c.center
+                if (np.sqrt((X - cx)**2 + (Y - cy)**2) > c.radius).any():
+                    c = None
+            points = np.column_stack((X, Y))
+            if len(points) > _ENCLOSING_BATCH:
+                points = _hull_candidates(points)
+            self._pending.extend(map(tuple, points.tolist()))
+        else:
+            if c is not None:
+                cx, cy = c.center
+                sqrt = math.sqrt
+                if any([sqrt((x - cx)**2 + (y - cy)**2) > c.radius
+                        for x, y in zip(X, Y)]):
+                    c = None
+            self._pending.extend(zip(X, Y))
+        if len(self._pending) > max(_ENCLOSING_BATCH, len(self._hull)):
+            self._hull = _convex_hull(self._hull + self._pending)
+            self._pending = []
+        if c is None:
+            self._circle = Circle.enclosing(self._hull + self._pending)
+
+class CircleArray:
+    """A CircleArray stores many circles as parallel arrays of centers/radii.
+
+    The centers are kept in one two-dimensional numpy array and the radii in
+    another, so intersection tests and transformations are evaluated over
+    every circle at once. Intersections compare squared distances, so no
+    square roots are taken. numpy must be installed to use a CircleArray.
+    Like a `VectorArray`, a CircleArray pickles its buffers out-of-band with
+    protocol 5.
+
+    | `len(a)` gives the number of circles in the array `a`
+    | `a[i]` gives the ith circle of `a` as a `geom.Circle`
+    """
+    __slots__ = ['_centers', '_radii']
+
+    def __init__(self, circles):
+        """Create a circle array from a collection of circles.
+
+        Each element of `circles` must have a ``center`` and a ``radius``,
+        like a `geom.Circle`. ImportError is raised if numpy isn't installed.
+        TypeError is raised if `circles` isn't a collection of circles.
+        """
+        _require_numpy("CircleArray")
+        if not hasattr(circles, '__iter__'):
+            raise TypeError("circles must be a collection")
+        circles = list(circles)
+        for c in circles:
+            if not (hasattr(c, 'center') and hasattr(c, 'radius')):
+                raise TypeError("circles must have a center and a radius")
+        centers = np.array([list(c.center) for c in circles],
+                           dtype=float).reshape(-1, 2)
+        radii = np.array([c.radius for c in circles], dtype=float)
+        self._centers = centers
+        self._radii = radii
+
+    @classmethod
+    def from_arrays(cls, centers, radii):
+        """Create a circle array from a collection of centers and radii.
+
+        `centers` may be a `VectorArray`, a numpy array, or a collection of
+        numeric collections in R2. `radii` may be a collection of numbers with
+        the same length as `centers`, or a single number shared by every
+        circle. TypeError is raised if the arguments aren't numeric, and
+        ValueError is raised if the centers aren't in R2, if the lengths
+        differ, or if any radius is negative.
+        """
+        _require_numpy("CircleArray")
+        if not isinstance(centers, VectorArray):
+            if hasattr(centers, '__len__') and len(centers) == 0:
+                centers = VectorArray._wrap(np.empty((0, 2)))
+            else:
+                centers = VectorArray(centers)
+        if centers.dim != 2:
+            raise ValueError("centers must be in R2")
+        radii = _radii_array(radii, len(centers))
+        return cls._wrap(np.array(centers.array, dtype=float), radii)
+
+    @classmethod
+    def _wrap(cls, centers, radii):
+        """Create a circle array that uses `centers` and `radii` as is.
+
+        `centers` is trusted to be an (N, 2) float array and `radii` an (N,)
+        float array of non-negative values.
+        """
+        carr = object.__new__(cls)
+        carr._centers = centers
+        carr._radii = radii
+        return carr
+
+    def to_circles(self):
+        """Return the circles of this array as a list of `geom.Circle`."""
+        return [Circle._from_trusted(Vector._from_trusted(c), r)
+                for c, r in zip(self._centers.tolist(), self._radii.tolist())]
+
+    @property
+    def centers(self):
+        """The centers of the circles as a `VectorArray`.
+
+        The vector array shares memory with this circle array.
+        """
+        return VectorArray._wrap(self._centers)
+
+    @property
+    def radii(self):
+        """The radii of the circles as a numpy array.
+
+        The array shares memory with this circle array.
+        """
+        return self._radii
+
+    @property
+    def area(self):
+        """An array of the areas of the circles."""
+        return math.pi*self._radii*self._radii
+
+    @property
+    def circumference(self):
+        """An array of the circumferences of the circles."""
+        return 2*math.pi*self._radii
+
+    def __str__(self):
+        return "[" + ", ".join(str(c) for c in self) + "]"
+
+    def __repr__(self):
+        return "geom.CircleArray(" + repr(self.to_circles()) + ")"
+
+    def __len__(self):
+        return self._radii.shape[0]
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle_arrays, (type(self),
+                                  _pickled_array(self._centers, protocol),
+                                  _pickled_array(self._radii, protocol))
+
+    def __getitem__(self, i):
+        if isinstance(i, numbers.Integral):
+            if not -len(self) <= i < len(self):
+                raise IndexError("CircleArray has less than %d circles"
+                                 % (i+1))
+            return Circle._from_trusted(
+                Vector._from_trusted(self._centers[i].tolist()),
+                float(self._radii[i]))
+        return CircleArray._wrap(self._centers[i].reshape(-1, 2),
+                                 self._radii[i].reshape(-1))
+
+    def __iter__(self):
+        yield from self.to_circles()
+
+    def intersects(self, other):
+        """Return which circles of this array intersect `other`.
+
+        `other` may be a numeric collection in R2 or some form of a circle, in
+        which case a boolean array with one entry per circle is returned. It
+        may also be a `VectorArray` of points in R2 or another `CircleArray`,
+        in which case a boolean array of shape ``(len(a), len(other))`` is
+        returned, where entry ``[i, j]`` tells if circle ``i`` intersects
+        point or circle ``j``. TypeError is raised if `other` is none of these
+        things.
+        """
+        if isinstance(other, CircleArray):
+            d = other._centers[np.newaxis] - self._centers[:, np.newaxis]
+            r = other._radii[np.newaxis, :] + self._radii[:, np.newaxis]
+        elif isinstance(other, VectorArray):
+            if other.dim != 2:
+                raise ValueError("points must be in R2")
+            d = other.array[np.newaxis] - self._centers[:, np.newaxis]
+            r = self._radii[:, np.newaxis]
+        elif hasattr(other, 'center') and hasattr(other, 'radius'):
+            d = np.array(list(other.center), dtype=float) - self._centers
+            r = self._radii + other.radius
+        elif is_numeric(other) and not isinstance(other, numbers.Number) \
+                and len(other) == 2:
+            d = np.array(list(other), dtype=float) - self._centers
+            r = self._radii
+        else:
+            msg = 'Intersection with {} and CircleArray is undefined'
+            raise TypeError(msg.format(str(other)))
+        return np.einsum('...i,...i->...', d, d) <= r*r
+
+    def intersection_points(self, other=None, pairs=None):
+        """Return the points where pairs of circles cross each other.
+
+        The pairs are chosen as described in `penetration_depth`. Returns a
+        pair ``(points, counts)``, where ``points[k]`` is a ``(2, 2)`` array
+        holding the ``counts[k]`` intersection points of pair ``k`` in its
+        first rows, padded with NaN. Circles that are tangent within
+        `EPSILON` have one intersection point, and circles that are apart,
+        nested or coincident have none.
+        """
+        c1, r1, c2, r2 = self._pair_columns(other, pairs)
+        delta = c2 - c1
+        d = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        cases = _circle_pair_cases(d, r1, r2)
+        crossing = cases['crossing']
+        outer = cases['outer_tangent']
+        inner = cases['inner_tangent']
+
+        points = np.full((len(d), 2, 2), np.nan)
+        counts = np.zeros(len(d), dtype=np.intp)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = delta / d[:, np.newaxis]
+        u[d == 0] = 0
+
+        # tangent circles touch on the line through their centers, on the
+        # far side of the larger circle's center for nested circles
+        touching = outer | inner
+        larger = r1 >= r2
+        direction = np.where((outer | larger)[:, np.newaxis], u, -u)
+        origin = np.where((outer | larger)[:, np.newaxis], c1, c2)
+        radius = np.where(outer | larger, r1, r2)
+        points[touching, 0] = (origin + radius[:, np.newaxis]*direction
+                               )[touching]
+        counts[touching] = 1
+
+        # crossing circles meet on the chord perpendicular to the centers
+        a = (r1*r1 - r2*r2 + d*d) / np.where(crossing, 2*d, 1)
+        h = np.sqrt(np.maximum(r1*r1 - a*a, 0))
+        mid = c1 + a[:, np.newaxis]*u
+        normal = np.column_stack((-u[:, 1], u[:, 0]))*h[:, np.newaxis]
+        points[crossing, 0] = (mid + normal)[crossing]
+        points[crossing, 1] = (mid - normal)[crossing]
+        counts[crossing] = 2
+        return points, counts
+
+    def overlap_area(self, other=None, pairs=None):
+        """Return the area of the overlap of pairs of circles.
+
+        The pairs are chosen as described in `penetration_depth`. The overlap
+        of crossing circles is the lens between them, and the overlap of
+        nested or coincident circles is the area of the smaller one. Circles
+        that are apart or tangent within `EPSILON` don't overlap.
+        """
+        c1, r1, c2, r2 = self._pair_columns(other, pairs)
+        delta = c2 - c1
+        d = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        cases = _circle_pair_cases(d, r1, r2)
+        area = np.zeros(len(d))
+        nested = cases['nested']
+        area[nested] = math.pi * np.minimum(r1, r2)[nested]**2
+
+        crossing = cases['crossing']
+        d, r1, r2 = d[crossing], r1[crossing], r2[crossing]
+        alpha = np.arccos(np.clip((d*d + r1*r1 - r2*r2) / (2*d*r1), -1, 1))
+        beta = np.arccos(np.clip((d*d + r2*r2 - r1*r1) / (2*d*r2), -1, 1))
+        kite = (-d + r1 + r2) * (d + r1 - r2) * (d - r1 + r2) * (d + r1 + r2)
+        area[crossing] = (r1*r1*alpha + r2*r2*beta -
+                          0.5*np.sqrt(np.maximum(kite, 0)))
+        return area
+
+    def penetration_depth(self, other=None, pairs=None):
+        """Return how deep pairs of circles overlap each other.
+
+        If `pairs` is given, it's a collection of index pairs ``(i, j)``,
+        such as from `SpatialHash.intersecting_pairs` or `BVH.pairs`, and
+        pair ``k`` is circle ``i`` of this array and circle ``j`` of `other`,
+        or of this array if `other` isn't given. Otherwise pair ``k`` is
+        circle ``k`` of this array and circle ``k`` of `other`, which may be
+        a `CircleArray` of the same length, or a single circle.
+
+        The depth is how far the circles must move apart to stop overlapping,
+        ``r1 + r2 - d`` for centers ``d`` apart, and zero for circles that
+        are apart or tangent within `EPSILON`. TypeError is raised if `other`
+        isn't a circle array or a circle, ValueError is raised if the arrays
+        have different lengths or neither `other` nor `pairs` is given, and
+        IndexError is raised if a pair is out of range.
+        """
+        c1, r1, c2, r2 = self._pair_columns(other, pairs)
+        delta = c2 - c1
+        d = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        cases = _circle_pair_cases(d, r1, r2)
+        depth = r1 + r2 - d
+        depth[cases['apart'] | cases['outer_tangent']] = 0
+        return depth
+
+    def _pair_columns(self, other, pairs):
+        """Return the centers and radii of both circles of each pair."""
+        c1, r1 = self._centers, self._radii
+        if other is None:
+            if pairs is None:
+                raise ValueError("pairs must be given without other")
+            c2, r2 = c1, r1
+        elif isinstance(other, CircleArray):
+            c2, r2 = other._centers, other._radii
+            if pairs is None and len(other) != len(self):
+                raise ValueError("other array must have the same length")
+        elif hasattr(other, 'center') and hasattr(other, 'radius'):
+            c2 = np.array(list(other.center), dtype=float).reshape(1, 2)
+            r2 = np.array([other.radius], dtype=float)
+            if pairs is None:
+                c2 = np.broadcast_to(c2, c1.shape)
+                r2 = np.broadcast_to(r2, r1.shape)
+        else:
+            raise TypeError("other must be a CircleArray or a circle")
+        if pairs is not None:
+            pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+            i, j = pairs[:, 0], pairs[:, 1]
+            c1, r1, c2, r2 = c1[i], r1[i], c2[j], r2[j]
+        return c1, r1, c2, r2
+
+    def scaled_to(self, m, attr="radius"):
+        """Return a copy of this circle array with every circle scaled to m.
+
+        `m` may be a number or a collection of numbers, one per circle.
+        Otherwise ``scaled_to`` behaves like `Circle.scaled_to`.
+        """
+        m = _scale_array(m, len(self))
+        attr = _scale_attr(attr, ("radius", "area", "circumference"))
+        if attr == 'radius':
+            radii = m
+        elif attr == 'circumference':
+            radii = m/(2*math.pi)
+        else:
+            radii = np.sqrt(m/math.pi)
+        return CircleArray._wrap(self._centers.copy(), radii)
+
+    def scaled_by(self, m, attr="radius"):
+        """Return a copy of this circle array with every circle scaled by m.
+
+        `m` may be a number or a collection of numbers, one per circle.
+        Otherwise ``scaled_by`` behaves like `Circle.scaled_by`.
+        """
+        m = _scale_array(m, len(self))
+        attr = _scale_attr(attr, ("radius", "area"))
+        if attr == 'area':
+            m = np.sqrt(m)
+        return CircleArray._wrap(self._centers.copy(), self._radii*m)
+
+    def moved_to(self, position):
+        """Return a copy of this circle array moved to the given position.
+
+        `position` may be a numeric collection in R2 shared by every circle,
+        or a `VectorArray` with one position per circle. TypeError is raised
+        if `position` is not numeric, and ValueError is raised if it's not in
+        R2 or has the wrong length.
+        """
+        position = self._points(position, "position")
+        centers = np.empty_like(self._centers)
+        centers[...] = position
+        return CircleArray._wrap(centers, self._radii.copy())
+
+    def moved_by(self, vector):
+        """Return a copy of this circle array moved by the given vector.
+
+        `vector` may be a numeric collection in R2 shared by every circle, or
+        a `VectorArray` with one vector per circle. TypeError is raised if
+        `vector` is not numeric, and ValueError is raised if it's not in R2 or
+        has the wrong length.
+        """
+        vector = self._points(vector, "vector")
+        return CircleArray._wrap(self._centers + vector, self._radii.copy())
+
+    def _points(self, points, name):
+        """Return `points` as an array that broadcasts against the centers."""
+        if isinstance(points, VectorArray):
+            if len(points) != len(self):
+                raise ValueError(name + " array must have the same length")
+            points = points.array
+        elif not is_numeric(points) or isinstance(points, numbers.Number):
+            raise TypeError(name + " must be a numeric collection")
+        else:
+            points = np.array(list(points), dtype=float)
+        if points.shape[-1] != 2:
+            raise ValueError(name + " must be in R2")
+        return points
+
+def _circle_pair_cases(d, r1, r2):
+    """Classify pairs of circles with radii `r1`, `r2` and centers `d` apart.
+
+    Returns a dict of boolean arrays: ``apart``, ``outer_tangent``,
+    ``crossing``, ``inner_tangent`` and ``nested``, where nested includes
+    inner tangency and coincident circles. Distances are compared within
+    `EPSILON`, scaled by the radii when they're larger than one.
+    """
+    tol = EPSILON * np.maximum(r1 + r2, 1)
+    total = r1 + r2
+    gap = np.abs(r1 - r2)
+    apart = d > total + tol
+    outer = ~apart & (d >= total - tol)
+    nested = ~apart & ~outer & (d <= gap + tol)
+    inner = nested & (d >= gap - tol) & (d > tol)
+    return {'apart': apart, 'outer_tangent': outer,
+            'crossing': ~(apart | outer | nested),
+            'inner_tangent': inner, 'nested': nested}
+
+def _radii_array(radii, n):
+    """Return `radii` as an array of `n` non-negative floats.
+
+    `radii` may be a single number or a collection of `n` numbers.
+    """
+    if isinstance(radii, np.ndarray):
+        if radii.dtype.kind not in 'iuf':
+            raise TypeError("radii must be numeric")
+    elif not is_numeric(radii):
+        raise TypeError("radii must be numeric")
+    elif not isinstance(radii, numbers.Number):
+        radii = list(radii)
+    radii = np.array(radii, dtype=float)
+    if radii.ndim == 0:
+        radii = np.full(n, radii)
+    elif radii.shape != (n,):
+        raise ValueError("there must be one radius for each center")
+    if np.any(radii < 0):
+        raise ValueError("radius must be non-negative")
+    return radii
+
+def _r2_array(vectors, name):
+    """Return `vectors` as a new (N, 2) float array."""
+    if isinstance(vectors, VectorArray):
+        array = vectors.array
+    elif hasattr(vectors, '__len__') and len(vectors) == 0:
+        array = np.empty((0, 2))
+    else:
+        array = VectorArray(vectors).array
+    if array.shape[1] != 2:
+        raise ValueError(name + " must be in R2")
+    return np.array(array, dtype=float)
+
+def _scale_array(m, n):
+    """Validate the scale `m` for `n` circles and return it as an array."""
+    if isinstance(m, numbers.Number):
+        if isinstance(m, bool):
+            raise TypeError("m must be a number")
+    elif isinstance(m, np.ndarray):
+        if m.dtype.kind not in 'iuf':
+            raise TypeError("m must be a number")
+    elif not is_numeric(m):
+        raise TypeError("m must be a number")
+    else:
+        m = list(m)
+    m = np.array(m, dtype=float)
+    if m.ndim == 0:
+        m = np.full(n, m)
+    elif m.shape != (n,):
+        raise ValueError("there must be one scale for each circle")
+    if np.any(m < 0):
+        raise ValueError("m must be non-negative")
+    return m
+
+def _scale_attr(attr, allowed):
+    """Validate the attribute `attr` a circle may be scaled by."""
+    if not isinstance(attr, str):
+        raise TypeError("attr must be a string")
+    if attr.lower() not in allowed:
+        raise ValueError("attr must be " + ", ".join(
+            repr(a) for a in allowed[:-1]) + " or " + repr(allowed[-1]))
+    return attr.lower()
+
+def _circle_columns(circles, name="circles"):
+    """Return the x, y and radius lists of a collection of circles.
+
+    `circles` may be a `CircleArray` or a collection of objects with a
+    ``center`` in R2 and a ``radius``. TypeError is raised otherwise.
+    """
+    if isinstance(circles, CircleArray):
+        x, y = circles._centers.T.tolist()
+        return x, y, circles._radii.tolist()
+    if not hasattr(circles, '__iter__'):
+        raise TypeError(name + " must be a collection of circles")
+    X, Y, R = [], [], []
+    for c in circles:
+        if not (hasattr(c, 'center') and hasattr(c, 'radius')):
+            raise TypeError(name + " must have a center and a radius")
+        x, y = c.center
+        X.append(x)
+        Y.append(y)
+        R.append(c.radius)
+    return X, Y, R
+
+_HASH_MAX_SPAN = 8
+
+class SpatialHash:
+    """A SpatialHash indexes circles in a uniform grid of square cells.
+
+    Each circle is stored in every cell its bounding box overlaps, so circles
+    can only intersect each other, or contain a point, if they share a cell.
+    This makes finding every intersecting pair of circles roughly linear in
+    the number of circles when their sizes are similar. Circles whose
+    bounding box is more than eight cells wide are kept in a separate list
+    instead, and checked by every query, so a few huge circles don't fill
+    the grid; each of them costs a pass over every circle when finding
+    pairs. For scenes where the radii span several orders of magnitude,
+    prefer a `BVH`.
+
+    Circles are identified by their index in the collection the spatial hash
+    was built from.
+    """
+    __slots__ = ['_cell_size', '_cells', '_large', '_x', '_y', '_r']
+
+    def __init__(self, circles, cell_size=None):
+        """Create a spatial hash over `circles`.
+
+        `circles` may be a `CircleArray` or a collection of circles. If
+        `cell_size` isn't given, it's picked from the radius distribution so
+        that a typical circle covers only a few cells. TypeError is raised if
+        `circles` isn't a collection of circles or if `cell_size` isn't a
+        number, and ValueError is raised if `cell_size` isn't positive.
+        """
+        self._x, self._y, self._r = _circle_columns(circles)
+        if cell_size is None:
+            cell_size = _auto_cell_size(self._r)
+        if not isinstance(cell_size, numbers.Real) or \
+                isinstance(cell_size, bool):
+            raise TypeError("cell_size must be a number")
+        if not cell_size > 0:
+            raise ValueError("cell_size must be positive")
+        self._cell_size = cell_size
+
+        cells = {}
+        large = []
+        floor = math.floor
+        s = cell_size
+        span = _HASH_MAX_SPAN*s
+        for i, (x, y, r) in enumerate(zip(self._x, self._y, self._r)):
+            if 2*r > span:
+                large.append(i)
+                continue
+            for cx in range(floor((x-r)/s), floor((x+r)/s)+1):
+                for cy in range(floor((y-r)/s), floor((y+r)/s)+1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cells[(cx, cy)] = [i]
+                    else:
+                        cell.append(i)
+        self._cells = cells
+        self._large = large
+
+    def __len__(self):
+        return len(self._r)
+
+    @property
+    def cell_size(self):
+        """The width and height of each cell of the grid."""
+        return self._cell_size
+
+    def candidate_pairs(self):
+        """Return the set of pairs of circles that could intersect.
+
+        Each pair is a tuple ``(i, j)`` of circle indices with ``i < j``.
+        Circles in the grid are candidates if they share a cell, and circles
+        too large for the grid are candidates with every circle whose
+        bounding box overlaps theirs. Every intersecting pair is a
+        candidate, but not every candidate intersects.
+        """
+        pairs = set()
+        for cell in self._cells.values():
+            n = len(cell)
+            for a in range(n):
+                i = cell[a]
+                for b in range(a+1, n):
+                    pairs.add((i, cell[b]))
+
+        X, Y, R = self._x, self._y, self._r
+        for i in self._large:
+            x, y, r = X[i], Y[i], R[i]
+            for j, (xj, yj, rj) in enumerate(zip(X, Y, R)):
+                if j != i and abs(xj - x) <= r + rj and \
+                        abs(yj - y) <= r + rj:
+                    pairs.add((i, j) if i < j else (j, i))
+        return pairs
+
+    def intersecting_pairs(self):
+        """Return the sorted list of pairs of circles that intersect.
+
+        Each pair is a tuple ``(i, j)`` of circle indices with ``i < j``.
+        Pairs are confirmed with the same rule as `Circle.intersects`.
+        """
+        X, Y, R = self._x, self._y, self._r
+        sqrt = math.sqrt
+        pairs = []
+        for i, j in self.candidate_pairs():
+            dx = X[j] - X[i]
+            dy = Y[j] - Y[i]
+            if sqrt(dx*dx + dy*dy) <= R[j] + R[i]:
+                pairs.append((i, j))
+        pairs.sort()
+        return pairs
+
+    def query_point(self, point):
+        """Return the sorted list of indices of the circles containing `point`.
+
+        A circle contains `point` under the same rule as `Circle.intersects`,
+        so points on the boundary are contained. TypeError is raised if
+        `point` is not a numeric collection, and ValueError is raised if it's
+        not in R2.
+        """
+        px, py = _point2(point, "point")
+        s = self._cell_size
+        cell = self._cells.get((math.floor(px/s), math.floor(py/s)), [])
+        X, Y, R = self._x, self._y, self._r
+        sqrt = math.sqrt
+        found = []
+        for i in cell + self._large:
+            dx = px - X[i]
+            dy = py - Y[i]
+            if sqrt(dx*dx + dy*dy) <= R[i]:
+                found.append(i)
+        found.sort()
+        return found
+
+def _auto_cell_size(radii):
+    """Pick a cell size for a spatial hash over circles with the given radii.
+
+    The median diameter keeps the typical circle in at most four cells
+    without letting a few huge circles make every cell crowded.
+    """
+    diameters = sorted(2*r for r in radii if r > 0)
+    if not diameters:
+        return 1.0
+    return diameters[len(diameters)//2]
+
+class _BVHNode:
+    """A node of a `BVH`: a bounding box with either children or circles."""
+    __slots__ = ['xmin', 'ymin', 'xmax', 'ymax', 'children', 'items']
+
+    def __init__(self, xmin, ymin, xmax, ymax, children=None, items=None):
+        self.xmin = xmin
+        self.ymin = ymin
+        self.xmax = xmax
+        self.ymax = ymax
+        self.children = children
+        self.items = items
+
+    def overlaps(self, other):
+        return (self.xmin <= other.xmax and other.xmin <= self.xmax and
+                self.ymin <= other.ymax and other.ymin <= self.ymax)
+
+RayHit = collections.namedtuple('RayHit', ['distance', 'index', 'normal'])
+RayHit.__doc__ = """The first circle hit by a ray.
+
+`distance` is the ray parameter of the hit, `index` is the index of the
+circle that was hit, and `normal` is the unit normal of the circle at the
+hit point.
+"""
+
+def _ray_box(ox, oy, dx, dy, limit, xmin, ymin, xmax, ymax):
+    """Return where a ray enters a box, or None if it misses before `limit`.
+    """
+    tmin, tmax = 0.0, limit
+    for o, d, lo, hi in ((ox, dx, xmin, xmax), (oy, dy, ymin, ymax)):
+        if d == 0:
+            if o < lo or o > hi:
+                return None
+            continue
+        t1 = (lo - o) / d
+        t2 = (hi - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return None
+    return tmin
+
+def _ray_circle(ox, oy, dx, dy, cx, cy, r):
+    """Return where a ray first touches a circle, or None if it misses.
+
+    Rays starting inside the circle touch it at 0.
+    """
+    fx = ox - cx
+    fy = oy - cy
+    c = fx*fx + fy*fy - r*r
+    if c <= 0:
+        return 0.0
+    b = fx*dx + fy*dy
+    if b >= 0:
+        return None
+    a = dx*dx + dy*dy
+    disc = b*b - a*c
+    if disc < 0:
+        return None
+    # the stable form of the smaller root
+    return c / (-b + math.sqrt(disc))
+
+def _ray_normal(px, py, cx, cy, dx, dy):
+    """Return the unit normal at `p` of a circle centered at `c`.
+
+    Points at the center get the normal facing back along the ray.
+    """
+    nx = px - cx
+    ny = py - cy
+    norm = math.hypot(nx, ny)
+    if norm == 0:
+        nx, ny, norm = -dx, -dy, math.hypot(dx, dy)
+    return nx/norm, ny/norm
+
+def _check_ray(origin, direction, max_distance):
+    """Validate a ray and return its origin and direction components."""
+    ox, oy = _point2(origin, "origin")
+    dx, dy = _point2(direction, "direction")
+    if dx == 0 and dy == 0:
+        raise ValueError("direction must not be zero")
+    if not isinstance(max_distance, numbers.Real) or \
+            isinstance(max_distance, bool):
+        raise TypeError("max_distance must be a number")
+    if not max_distance >= 0:
+        raise ValueError("max_distance must be non-negative")
+    return ox, oy, dx, dy
+
+def _str_pack(entries, capacity, key):
+    """Group `entries` into runs of at most `capacity` with STR packing.
+
+    `key(e)` gives the ``(x, y)`` position of an entry. Entries are sorted by
+    x into vertical slices, and each slice is sorted by y before being cut
+    into groups, so each group covers a compact region.
+    """
+    n = len(entries)
+    groups = -(-n // capacity)
+    slices = math.ceil(math.sqrt(groups))
+    per_slice = slices*capacity
+    entries = sorted(entries, key=lambda e: key(e)[0])
+    packed = []
+    for s in range(0, n, per_slice):
+        column = sorted(entries[s:s+per_slice], key=lambda e: key(e)[1])
+        for g in range(0, len(column), capacity):
+            packed.append(column[g:g+capacity])
+    return packed
+
+class BVH:
+    """A BVH is a bounding volume hierarchy over circles.
+
+    The hierarchy is a tree of axis-aligned bounding boxes that is bulk loaded
+    with Sort-Tile-Recursive packing, so queries visit a logarithmic number of
+    nodes on average no matter how much the circle radii vary. Results match
+    testing every circle with `Circle.intersects`.
+
+    Circles are identified by their index in the collection the hierarchy was
+    built from.
+    """
+    __slots__ = ['_root', '_x', '_y', '_r', '_leaf_size', '_levels']
+
+    def __init__(self, circles, leaf_size=8):
+        """Create a bounding volume hierarchy over `circles`.
+
+        `circles` may be a `CircleArray` or a collection of circles, and
+        `leaf_size` is the most circles stored in each leaf of the tree.
+        TypeError is raised if `circles` isn't a collection of circles or
+        `leaf_size` isn't an integer, and ValueError is raised if `leaf_size`
+        is less than 2.
+        """
+        if not isinstance(leaf_size, numbers.Integral) or \
+                isinstance(leaf_size, bool):
+            raise TypeError("leaf_size must be an integer")
+        if leaf_size < 2:
+            raise ValueError("leaf_size must be at least 2")
+        self._x, self._y, self._r = _circle_columns(circles)
+        self._leaf_size = leaf_size
+        self._root = self._build()
+        self._levels = None
+
+    def _build(self):
+        X, Y, R = self._x, self._y, self._r
+        if not R:
+            return None
+        capacity = self._leaf_size
+        nodes = []
+        for items in _str_pack(range(len(R)), capacity,
+                               lambda i: (X[i], Y[i])):
+            nodes.append(_BVHNode(min(X[i]-R[i] for i in items),
+                                  min(Y[i]-R[i] for i in items),
+                                  max(X[i]+R[i] for i in items),
+                                  max(Y[i]+R[i] for i in items),
+                                  items=items))
+        def center(node):
+            return node.xmin + node.xmax, node.ymin + node.ymax
+        while len(nodes) > 1:
+            nodes = [_BVHNode(min(c.xmin for c in children),
+                              min(c.ymin for c in children),
+                              max(c.xmax for c in children),
+                              max(c.ymax for c in children),
+                              children=children)
+                     for children in _str_pack(nodes, capacity, center)]
+        return nodes[0]
+
+    def __len__(self):
+        return len(self._r)
+
+    def _search(self, xmin, ymin, xmax, ymax, test):
+        """Return the sorted indices of circles passing `test`.
+
+        Only circles in leaves whose boxes overlap the given box are tested.
+        """
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if (node.xmin > xmax or xmin > node.xmax or
+                    node.ymin > ymax or ymin > node.ymax):
+                continue
+            if node.items is None:
+                stack.extend(node.children)
+            else:
+                found.extend(i for i in node.items if test(i))
+        found.sort()
+        return found
+
+    def query_point(self, point):
+        """Return the sorted list of indices of the circles containing `point`.
+
+        TypeError is raised if `point` is not a numeric collection, and
+        ValueError is raised if it's not in R2.
+        """
+        px, py = _point2(point, "point")
+        X, Y, R = self._x, self._y, self._r
+        sqrt = math.sqrt
+
+        def contains(i):
+            dx = px - X[i]
+            dy = py - Y[i]
+            return sqrt(dx*dx + dy*dy) <= R[i]
+        return self._search(px, py, px, py, contains)
+
+    def query_circle(self, circle):
+        """Return the sorted list of indices of the circles intersecting
+        `circle`.
+
+        TypeError is raised if `circle` isn't some form of a circle.
+        """
+        if not (hasattr(circle, 'center') and hasattr(circle, 'radius')):
+            raise TypeError("circle must have a center and a radius")
+        cx, cy = circle.center
+        cr = circle.radius
+        X, Y, R = self._x, self._y, self._r
+        sqrt = math.sqrt
+
+        def intersects(i):
+            dx = cx - X[i]
+            dy = cy - Y[i]
+            return sqrt(dx*dx + dy*dy) <= cr + R[i]
+        return self._search(cx-cr, cy-cr, cx+cr, cy+cr, intersects)
+
+    def query_rect(self, lower, upper):
+        """Return the sorted list of indices of the circles intersecting the
+        axis-aligned rectangle with corners `lower` and `upper`.
+
+        TypeError is raised if the corners are not numeric collections, and
+        ValueError is raised if they're not in R2 or if `lower` is greater
+        than `upper` in either dimension.
+        """
+        xmin, ymin = _point2(lower, "lower")
+        xmax, ymax = _point2(upper, "upper")
+        if xmin > xmax or ymin > ymax:
+            raise ValueError("lower must not be greater than upper")
+        X, Y, R = self._x, self._y, self._r
+
+        def intersects(i):
+            dx = X[i] - min(max(X[i], xmin), xmax)
+            dy = Y[i] - min(max(Y[i], ymin), ymax)
+            return dx*dx + dy*dy <= R[i]*R[i]
+        return self._search(xmin, ymin, xmax, ymax, intersects)
+
+    def pairs(self, other=None):
+        """Return the sorted list of pairs of intersecting circles.
+
+        If `other` is a `BVH`, each pair is a tuple ``(i, j)`` where circle
+        ``i`` of this tree intersects circle ``j`` of `other`. Otherwise the
+        pairs are the intersecting circles within this tree, with ``i < j``.
+        Both trees are traversed together, so only pairs of nodes whose boxes
+        overlap are visited. TypeError is raised if `other` isn't a `BVH`.
+        """
+        if other is None:
+            other = self
+        elif not isinstance(other, BVH):
+            raise TypeError("other must be a BVH")
+        same = other is self
+        X1, Y1, R1 = self._x, self._y, self._r
+        X2, Y2, R2 = other._x, other._y, other._r
+        sqrt = math.sqrt
+
+        found = []
+        if self._root is None or other._root is None:
+            return found
+        stack = [(self._root, other._root)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                if a.items is None:
+                    children = a.children
+                    for k, c in enumerate(children):
+                        for d in children[k:]:
+                            stack.append((c, d))
+                    continue
+                items = a.items
+                for k, i in enumerate(items):
+                    for j in items[k+1:]:
+                        dx = X2[j] - X1[i]
+                        dy = Y2[j] - Y1[i]
+                        if sqrt(dx*dx + dy*dy) <= R2[j] + R1[i]:
+                            found.append((i, j) if i < j else (j, i))
+                continue
+            if not a.overlaps(b):
+                continue
+            if a.items is None and (b.items is not None or
+                                    (a.xmax - a.xmin + a.ymax - a.ymin >=
+                                     b.xmax - b.xmin + b.ymax - b.ymin)):
+                stack.extend((c, b) for c in a.children)
+            elif b.items is None:
+                stack.extend((a, c) for c in b.children)
+            else:
+                for i in a.items:
+                    for j in b.items:
+                        dx = X2[j] - X1[i]
+                        dy = Y2[j] - Y1[i]
+                        if sqrt(dx*dx + dy*dy) <= R2[j] + R1[i]:
+                            if same and j < i:
+                                found.append((j, i))
+                            else:
+                                found.append((i, j))
+        found.sort()
+        return found
+
+    def raycast(self, origin, direction, max_distance=math.inf,
+                any_hit=False):
+        """Return the first circle hit by a ray, or None if none are hit.
+
+        The ray covers the points ``origin + t*direction`` for ``0 <= t <=
+        max_distance``, so with a unit `direction` the distance of the hit is
+        its Euclidean distance, and a segment from ``a`` to ``b`` is cast
+        with the direction ``b - a`` and a `max_distance` of 1. A ray that
+        starts inside a circle hits it at 0. Nodes are visited nearest
+        first and skipped once they're further than the best hit. If
+        `any_hit` is true, the first hit found is returned even if it isn't
+        the nearest, which is enough for visibility tests.
+
+        Returns a `RayHit` whose normal is a `Vector`. TypeError is raised if
+        the origin or direction isn't a numeric collection or `max_distance`
+        isn't a number, and ValueError is raised if they're not in R2, the
+        direction is zero or `max_distance` is negative.
+        """
+        ox, oy, dx, dy = _check_ray(origin, direction, max_distance)
+        if self._root is None:
+            return None
+        X, Y, R = self._x, self._y, self._r
+        best, index = max_distance, -1
+        root = self._root
+        entry = _ray_box(ox, oy, dx, dy, best,
+                         root.xmin, root.ymin, root.xmax, root.ymax)
+        heap = [] if entry is None else [(entry, 0, root)]
+        counter = 1
+        while heap:
+            entry, _, node = heapq.heappop(heap)
+            if entry > best:
+                break
+            if node.items is not None:
+                for i in node.items:
+                    t = _ray_circle(ox, oy, dx, dy, X[i], Y[i], R[i])
+                    if t is None or t > best or (t == best and 0 <= index < i):
+                        continue
+                    best, index = t, i
+                    if any_hit:
+                        heap = []
+                        break
+                continue
+            for c in node.children:
+                t = _ray_box(ox, oy, dx, dy, best,
+                             c.xmin, c.ymin, c.xmax, c.ymax)
+                if t is not None:
+                    heapq.heappush(heap, (t, counter, c))
+                    counter += 1
+        if index < 0:
+            return None
+        normal = _ray_normal(ox + best*dx, oy + best*dy,
+                             X[index], Y[index], dx, dy)
+        return RayHit(best, index, Vector2._make(*normal))
+
+    def _flatten(self):
+        """Return the levels of the tree as numpy arrays.
+
+        Each level is a tuple of the node boxes, the start and count of each
+        node's children in the next level, and the start and count of each
+        node's circles in the flattened item array.
+        """
+        if self._levels is not None:
+            return self._levels
+        levels = []
+        nodes = [self._root] if self._root is not None else []
+        items = []
+        while nodes:
+            boxes = np.array([(n.xmin, n.ymin, n.xmax, n.ymax)
+                              for n in nodes], dtype=float)
+            children = np.zeros((2, len(nodes)), dtype=np.intp)
+            leaves = np.zeros((2, len(nodes)), dtype=np.intp)
+            below = []
+            for k, node in enumerate(nodes):
+                if node.items is None:
+                    children[:, k] = len(below), len(node.children)
+                    below.extend(node.children)
+                else:
+                    leaves[:, k] = len(items), len(node.items)
+                    items.extend(node.items)
+            levels.append((boxes.T.copy(), children, leaves))
+            nodes = below
+        self._levels = levels, np.array(items, dtype=np.intp)
+        return self._levels
+
+def _expand(owners, starts, counts):
+    """Repeat each owner once per entry of its range of an array.
+
+    Returns the repeated owners and the positions of the entries.
+    """
+    total = int(counts.sum())
+    owners = np.repeat(owners, counts)
+    ends = np.cumsum(counts)
+    positions = (np.arange(total) - np.repeat(ends - counts, counts) +
+                 np.repeat(starts, counts))
+    return owners, positions
+
+def _rays_boxes(O, D, limit, boxes):
+    """Return a mask of the rays in `O` and `D` that enter `boxes`."""
+    tmin = np.zeros(len(O))
+    tmax = limit.copy()
+    for axis in range(2):
+        o = O[:, axis]
+        d = D[:, axis]
+        lo = boxes[axis]
+        hi = boxes[axis + 2]
+        flat = d == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1 = (lo - o) / d
+            t2 = (hi - o) / d
+        inside = (o >= lo) & (o <= hi)
+        t1 = np.where(flat, np.where(inside, -np.inf, np.inf), t1)
+        t2 = np.where(flat, np.where(inside, np.inf, -np.inf), t2)
+        np.maximum(tmin, np.minimum(t1, t2), out=tmin)
+        np.minimum(tmax, np.maximum(t1, t2), out=tmax)
+    return tmin <= tmax
+
+def _rays_circles(O, D, centers, radii):
+    """Return where rays first touch circles, with inf for misses."""
+    F = O - centers
+    c = np.einsum('ij,ij->i', F, F) - radii*radii
+    b = np.einsum('ij,ij->i', F, D)
+    a = np.einsum('ij,ij->i', D, D)
+    disc = b*b - a*c
+    t = np.full(len(O), np.inf)
+    hit = (b < 0) & (disc >= 0)
+    t[hit] = c[hit] / (np.sqrt(disc[hit]) - b[hit])
+    t[c <= 0] = 0.0
+    return t
+
+def cast_rays(origins, directions, circles, max_distance=math.inf,
+              any_hit=False):
+    """Cast many rays against a set of circles at once.
+
+    Ray ``k`` covers the points ``origins[k] + t*directions[k]`` for ``0 <=
+    t <= max_distance``, as in `BVH.raycast`, so segments are cast with
+    their end minus their start as the direction and a `max_distance` of 1.
+    `origins` and `directions` may be `VectorArray` objects, numpy arrays or
+    collections of numeric collections in R2, and `max_distance` may be a
+    number or one number for each ray. `circles` may be a `BVH`, which is
+    reused, or anything a `BVH` can be built from.
+
+    The tree is traversed by every ray together, one level at a time, so
+    only the circles in leaves a ray passes through are tested. If `any_hit`
+    is true, each ray reports some circle it hits rather than the nearest.
+
+    Returns a `RayHit` of numpy arrays: the distances, with inf for rays
+    that miss, the circle indices, with -1 for misses, and the normals as a
+    `VectorArray`, with nan for misses. ImportError is raised if numpy isn't
+    installed. TypeError is raised if the arguments aren't numeric, and
+    ValueError is raised if the vectors aren't in R2, their lengths differ,
+    a direction is zero or a `max_distance` is negative.
+    """
+    _require_numpy("cast_rays")
+    O = _r2_array(origins, "origins")
+    D = _r2_array(directions, "directions")
+    n = len(O)
+    if len(D) != n:
+        raise ValueError("there must be one direction for each origin")
+    if np.any((D[:, 0] == 0) & (D[:, 1] == 0)):
+        raise ValueError("directions must not be zero")
+    if isinstance(max_distance, bool) or not (
+            is_numeric(max_distance) or isinstance(max_distance, np.ndarray)
+            and max_distance.dtype.kind in 'iuf'):
+        raise TypeError("max_distance must be numeric")
+    limit = np.array(max_distance, dtype=float)
+    if limit.ndim == 0:
+        limit = np.full(n, limit)
+    elif limit.shape != (n,):
+        raise ValueError("there must be one max_distance for each ray")
+    if not np.all(limit >= 0):
+        raise ValueError("max_distance must be non-negative")
+    tree = circles if isinstance(circles, BVH) else BVH(circles)
+
+    distances = np.full(n, np.inf)
+    indices = np.full(n, -1, dtype=np.intp)
+    levels, items = tree._flatten()
+    rays = np.arange(n)
+    nodes = np.zeros(n if levels else 0, dtype=np.intp)
+    empty = np.empty(0, dtype=np.intp)
+    cands = [(empty, empty)]
+    for boxes, children, leaves in levels:
+        enter = _rays_boxes(O[rays], D[rays], limit[rays], boxes[:, nodes])
+        rays, nodes = rays[enter], nodes[enter]
+        cands.append(_expand(rays, leaves[0, nodes], leaves[1, nodes]))
+        rays, nodes = _expand(rays, children[0, nodes], children[1, nodes])
+    rays = np.concatenate([r for r, _ in cands])
+    found = items[np.concatenate([p for _, p in cands])]
+
+    centers = np.column_stack([np.array(tree._x, dtype=float),
+                               np.array(tree._y, dtype=float)])
+    radii = np.array(tree._r, dtype=float)
+    t = _rays_circles(O[rays], D[rays], centers[found], radii[found])
+    hit = (t < np.inf) & (t <= limit[rays])
+    rays, found, t = rays[hit], found[hit], t[hit]
+    if not any_hit:
+        order = np.lexsort((found, t, rays))
+        rays, found, t = rays[order], found[order], t[order]
+    rays, first = np.unique(rays, return_index=True)
+    distances[rays] = t[first]
+    indices[rays] = found[first]
+
+    normals = np.full((n, 2), np.nan)
+    points = O[rays] + distances[rays, None]*D[rays]
+    N = points - centers[indices[rays]]
+    norm = np.hypot(N[:, 0], N[:, 1])
+    flat = norm == 0
+    N[flat] = -D[rays][flat]
+    norm[flat] = np.hypot(N[flat, 0], N[flat, 1])
+    normals[rays] = N / norm[:, None]
+    return RayHit(distances, indices, VectorArray._wrap(normals))
+
+def _point2(point, name):
+    """Return `point` as an ``(x, y)`` tuple of a numeric collection in R2."""
+    if not is_numeric(point) or isinstance(point, numbers.Number):
+        raise TypeError(name + " must be a numeric collection")
+    if len(point) != 2:
+        raise ValueError(name + " must be in R2")
+    x, y = point
+    return x, y
+
+def _point_rows(points, name="points"):
+    """Return `points` as a list of tuples that all have the same dimension.
+
+    `points` may be a `VectorArray`, a two-dimensional numpy array, or a
+    collection of numeric collections. TypeError is raised if the points
+    aren't numeric, and ValueError is raised if their dimensions differ or
+    are zero.
+    """
+    if isinstance(points, VectorArray):
+        return [tuple(row) for row in points.array.tolist()]
+    if np is not None and isinstance(points, np.ndarray):
+        if points.dtype.kind not in 'iuf':
+            raise TypeError(name + " must be numeric")
+        if points.ndim != 2:
+            raise ValueError(name + " must be a two-dimensional array")
+        points = points.tolist()
+    if not hasattr(points, '__iter__'):
+        raise TypeError(name + " must be a collection")
+    rows = []
+    for p in points:
+        if not is_numeric(p) or isinstance(p, numbers.Number):
+            raise TypeError(name + " must be numeric collections")
+        rows.append(tuple(p))
+    if rows:
+        dim = len(rows[0])
+        if dim == 0:
+            raise ValueError("vectors cannot be empty")
+        if any(len(p) != dim for p in rows):
+            raise ValueError(name + " must all have the same dimension")
+    return rows
+
+def unique_vectors(vectors, tol=EPSILON):
+    """Remove the near-duplicates from `vectors`.
+
+    Returns a pair ``(unique, inverse)``: `unique` holds the first vector of
+    each group of vectors within `tol` of each other, as in
+    `Vector.isclose`, in order of first appearance, and ``inverse[i]`` is the
+    index in `unique` of the vector that ``vectors[i]`` was merged into.
+
+    The vectors are snapped to a grid of cells twice `tol` wide and hashed by
+    cell, so each vector is only compared with the unique vectors in the
+    cells it could be close to, which takes near-linear time. Near-duplicates
+    aren't merged transitively: a vector joins the earliest unique vector
+    within `tol`, even if that one joined no group itself.
+
+    If `vectors` is a `VectorArray`, `unique` is a `VectorArray` and
+    `inverse` a numpy array. Otherwise `vectors` must be a collection of
+    numeric collections and `unique` is a list of `Vector` and `inverse` a
+    list. TypeError is raised if the vectors aren't numeric or `tol` isn't a
+    number, and ValueError is raised if their dimensions differ or `tol` is
+    negative.
+    """
+    _check_tolerance(tol)
+    rows = _point_rows(vectors, "vectors")
+    cells = {}
+    unique = []
+    inverse = []
+    if tol == 0:
+        for row in rows:
+            j = cells.setdefault(row, len(unique))
+            if j == len(unique):
+                unique.append(row)
+            inverse.append(j)
+    else:
+        width = 2*tol
+        dim = len(rows[0]) if rows else 0
+        offsets = [()]
+        for _ in range(dim):
+            offsets = [o + (d,) for o in offsets for d in (0, 1)]
+        for row in rows:
+            key = []
+            near = []
+            for c in row:
+                scaled = c / width
+                cell = math.floor(scaled)
+                key.append(cell)
+                near.append(-1 if scaled - cell < 0.5 else 1)
+            match = None
+            for offset in offsets:
+                cell = tuple([k + n*o for k, n, o in zip(key, near, offset)])
+                for j in cells.get(cell, ()):
+                    if (match is None or j < match) and all(
+                            [abs(a - b) <= tol
+                             for a, b in zip(row, unique[j])]):
+                        match = j
+                        break
+            if match is None:
+                match = len(unique)
+                cells.setdefault(tuple(key), []).append(match)
+                unique.append(row)
+            inverse.append(match)
+    if isinstance(vectors, VectorArray):
+        return (VectorArray._wrap(np.array(unique, dtype=float)
+                                  .reshape(-1, vectors.dim)),
+                np.array(inverse, dtype=np.intp))
+    return [Vector._from_trusted(list(row)) for row in unique], inverse
+
+class KDTree:
+    """A KDTree indexes vectors of any dimension for proximity searches.
+
+    The tree recursively splits the points at the median of the dimension
+    they're most spread out in, so nearest neighbour and radius searches only
+    visit the few cells near the query point. Distances are the magnitude of
+    the difference between two vectors, `abs(a - b)`.
+
+    Points are identified by their index in the collection the tree was built
+    from.
+    """
+    __slots__ = ['_points', '_dim', '_axis', '_split', '_children', '_items',
+                 '_lo', '_hi', '_size']
+
+    def __init__(self, points, leaf_size=16):
+        """Create a k-d tree over `points`.
+
+        `points` may be a `VectorArray`, a two-dimensional numpy array or a
+        collection of vectors that all have the same dimension. Construction
+        takes O(n log n) time. TypeError is raised if the points aren't
+        numeric or `leaf_size` isn't an integer, and ValueError is raised if
+        the points have different dimensions or `leaf_size` is less than 1.
+        """
+        if not isinstance(leaf_size, numbers.Integral) or \
+                isinstance(leaf_size, bool):
+            raise TypeError("leaf_size must be an integer")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1")
+        P = self._points = _point_rows(points)
+        dim = self._dim = len(P[0]) if P else 0
+        self._axis, self._split, self._children, self._items = [], [], [], []
+        self._lo, self._hi, self._size = [], [], []
+        if not P:
+            return
+
+        # sort the points along every axis once, then keep each node's points
+        # sorted by partitioning the parent's lists instead of resorting them
+        order = [sorted(range(len(P)), key=lambda i: P[i][a])
+                 for a in range(dim)]
+        left = bytearray(len(P))
+        stack = [(self._new_node(), order)]
+        while stack:
+            node, order = stack.pop()
+            n = len(order[0])
+            lo = tuple(P[order[a][0]][a] for a in range(dim))
+            hi = tuple(P[order[a][-1]][a] for a in range(dim))
+            self._lo[node], self._hi[node], self._size[node] = lo, hi, n
+            if n <= leaf_size:
+                self._items[node] = order[0]
+                continue
+            axis = max(range(dim), key=lambda a: hi[a] - lo[a])
+            m = n//2
+            for i in order[axis][:m]:
+                left[i] = 1
+            self._axis[node] = axis
+            self._split[node] = P[order[axis][m]][axis]
+            lorder = [[i for i in o if left[i]] for o in order]
+            rorder = [[i for i in o if not left[i]] for o in order]
+            for i in order[axis][:m]:
+                left[i] = 0
+            children = (self._new_node(), self._new_node())
+            self._children[node] = children
+            stack.append((children[0], lorder))
+            stack.append((children[1], rorder))
+
+    def _new_node(self):
+        self._axis.append(-1)
+        self._split.append(None)
+        self._children.append(None)
+        self._items.append(None)
+        self._lo.append(None)
+        self._hi.append(None)
+        self._size.append(0)
+        return len(self._axis) - 1
+
+    def __len__(self):
+        return len(self._points)
+
+    @property
+    def dim(self):
+        """The dimension of the indexed points, or 0 if the tree is empty."""
+        return self._dim
+
+    def _query_point(self, point):
+        """Validate `point` and return it as a tuple."""
+        if not is_numeric(point) or isinstance(point, numbers.Number):
+            raise TypeError("point must be a numeric collection")
+        point = tuple(point)
+        if self._points and len(point) != self._dim:
+            raise ValueError("point must have the same dimension as the tree")
+        return point
+
+    def _box_dist_sq(self, node, q):
+        """Return the squared distance from `q` to the box of `node`."""
+        d = 0
+        for c, l, h in zip(q, self._lo[node], self._hi[node]):
+            if c < l:
+                d += (l-c)*(l-c)
+            elif c > h:
+                d += (c-h)*(c-h)
+        return d
+
+    def _far_dist_sq(self, node, q):
+        """Return the squared distance from `q` to the far corner of `node`."""
+        d = 0
+        for c, l, h in zip(q, self._lo[node], self._hi[node]):
+            e = max(c-l, h-c)
+            d += e*e
+        return d
+
+    def _dist(self, i, q):
+        d = 0
+        for a, b in zip(q, self._points[i]):
+            d += (a-b)*(a-b)
+        return math.sqrt(d)
+
+    def nearest(self, point, k=1):
+        """Return the `k` points nearest to `point`.
+
+        The result is a list of ``(distance, index)`` tuples sorted by
+        distance, with ties broken by index. Fewer than `k` tuples are
+        returned if the tree has fewer than `k` points. TypeError is raised
+        if `point` is not a numeric collection or `k` isn't an integer, and
+        ValueError is raised if `point` has the wrong dimension or `k` is
+        less than 1.
+        """
+        if not isinstance(k, numbers.Integral) or isinstance(k, bool):
+            raise TypeError("k must be an integer")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        q = self._query_point(point)
+        if not self._points:
+            return []
+
+        # heap of the best k candidates so far, with the worst on top
+        best = []
+        stack = [(0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == k and bound*(1-EPSILON) > best[0][0]**2:
+                continue
+            items = self._items[node]
+            if items is not None:
+                for i in items:
+                    entry = (-self._dist(i, q), -i)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                continue
+            near, far = self._children[node]
+            if q[self._axis[node]] >= self._split[node]:
+                near, far = far, near
+            stack.append((self._box_dist_sq(far, q), far))
+            stack.append((self._box_dist_sq(near, q), near))
+        return sorted((-d, -i) for d, i in best)
+
+    def _radius_search(self, q, r, collect):
+        """Visit the points within `r` of `q`, collecting or counting them."""
+        if not isinstance(r, numbers.Real) or isinstance(r, bool):
+            raise TypeError("r must be a number")
+        if r < 0:
+            raise ValueError("r must be non-negative")
+        found = [] if collect else 0
+        if not self._points:
+            return found
+        outer = r*r*(1+EPSILON)
+        inner = r*r*(1-EPSILON)
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_dist_sq(node, q) > outer:
+                continue
+            if not collect and self._far_dist_sq(node, q) <= inner:
+                found += self._size[node]
+                continue
+            items = self._items[node]
+            if items is None:
+                stack.extend(self._children[node])
+            elif collect:
+                found.extend(i for i in items if self._dist(i, q) <= r)
+            else:
+                found += sum(1 for i in items if self._dist(i, q) <= r)
+        if collect:
+            found.sort()
+        return found
+
+    def query_radius(self, point, r):
+        """Return the sorted indices of the points within `r` of `point`.
+
+        A point is within `r` if `abs(p - point) <= r`. TypeError is raised if
+        `point` is not a numeric collection or `r` isn't a number, and
+        ValueError is raised if `point` has the wrong dimension or `r` is
+        negative.
+        """
+        return self._radius_search(self._query_point(point), r, True)
+
+    def count_radius(self, point, r):
+        """Return the number of points within `r` of `point`.
+
+        Equivalent to `len(tree.query_radius(point, r))`, but whole cells that
+        lie inside the search radius are counted without visiting their
+        points.
+        """
+        return self._radius_search(self._query_point(point), r, False)
+
+    def nearest_many(self, points, k=1):
+        """Return the `k` nearest points to each of `points`.
+
+        `points` may be a `VectorArray`, a two-dimensional numpy array or a
+        collection of vectors. The result is a list with one `nearest` result
+        for each query point.
+        """
+        return [self.nearest(p, k) for p in _point_rows(points)]
+
+    def query_radius_many(self, points, r):
+        """Return the `query_radius` result for each of `points`."""
+        return [self.query_radius(p, r) for p in _point_rows(points)]
+
+    def count_radius_many(self, points, r):
+        """Return the `count_radius` result for each of `points`."""
+        return [self.count_radius(p, r) for p in _point_rows(points)]
+
+OverlapEvents = collections.namedtuple('OverlapEvents',
+                                       ['entered', 'stayed', 'exited'])
+OverlapEvents.__doc__ = """The changes in overlapping pairs over one update.
+
+Each field is a set of ``(i, j)`` handle pairs with ``i < j``: pairs that
+started overlapping, pairs that still overlap, and pairs that stopped
+overlapping since the previous update.
+"""
+
+class SweepAndPrune:
+    """A SweepAndPrune tracks which moving circles overlap from frame to frame.
+
+    The endpoints of every circle's extent along the x-axis are kept in one
+    sorted list. When circles move only a little between updates, their
+    endpoints only move a few places in the list, so re-sorting with
+    insertion sort is cheap, and every swap of two endpoints tells which pair
+    of extents started or stopped overlapping. Only those pairs and the pairs
+    of moved circles are tested exactly, so each update costs roughly linear
+    time in the number of moved circles.
+
+    Circles are identified by the integer handles `add` returns. Circles
+    passed to the constructor get the handles ``0, 1, 2, ...`` in order.
+    Overlaps follow the same rule as `Circle.intersects`.
+    """
+    __slots__ = ['_circles', '_ends', '_endpoints', '_partners',
+                 '_touching', '_dirty', '_changed', '_next']
+
+    def __init__(self, circles=()):
+        """Create a sweep and prune engine tracking `circles`.
+
+        `circles` may be a `CircleArray` or a collection of circles. The
+        pairs that overlap initially are reported as entered by the first
+        `update`. TypeError is raised if `circles` isn't a collection of
+        circles.
+        """
+        X, Y, R = _circle_columns(circles)
+        self._circles = {h: [x, y, r] for h, (x, y, r)
+                         in enumerate(zip(X, Y, R))}
+        self._next = len(R)
+        self._partners = {h: set() for h in self._circles}
+        self._touching = set()
+        self._changed = set()
+
+        # endpoints are [value, kind, handle, position], where kind is 0 for
+        # the lower end and 1 for the upper end so touching extents overlap
+        self._ends = {h: ([x - r, 0, h, 0], [x + r, 1, h, 0])
+                      for h, (x, y, r) in self._circles.items()}
+        endpoints = [e for ends in self._ends.values() for e in ends]
+        endpoints.sort(key=lambda e: (e[0], e[1]))
+        active = set()
+        for i, e in enumerate(endpoints):
+            e[3] = i
+            h = e[2]
+            if e[1] == 0:
+                for other in active:
+                    self._start_overlap(h, other)
+                active.add(h)
+            else:
+                active.discard(h)
+        self._endpoints = endpoints
+        self._dirty = set(self._circles)
+
+    def __len__(self):
+        return len(self._circles)
+
+    def __contains__(self, handle):
+        return handle in self._circles
+
+    def __getitem__(self, handle):
+        x, y, r = self._circles[handle]
+        return Circle._from_trusted(Vector._from_trusted([x, y]), r)
+
+    @property
+    def pairs(self):
+        """The set of pairs of handles that overlapped at the last update."""
+        return set(self._touching)
+
+    def _start_overlap(self, a, b):
+        self._partners[a].add(b)
+        self._partners[b].add(a)
+        self._changed.add((a, b) if a < b else (b, a))
+
+    def _stop_overlap(self, a, b):
+        self._partners[a].discard(b)
+        self._partners[b].discard(a)
+        self._changed.add((a, b) if a < b else (b, a))
+
+    def add(self, circle):
+        """Start tracking `circle` and return its handle.
+
+        TypeError is raised if `circle` isn't some form of a circle.
+        """
+        (x,), (y,), (r,) = _circle_columns([circle], "circle")
+        h = self._next
+        self._next += 1
+        self._circles[h] = [x, y, r]
+        self._partners[h] = set()
+        n = len(self._endpoints)
+        lower = [x - r, 0, h, n]
+        upper = [x + r, 1, h, n + 1]
+        self._ends[h] = lower, upper
+        self._endpoints.extend((lower, upper))
+        self._dirty.add(h)
+        return h
+
+    def remove(self, handle):
+        """Stop tracking the circle with the given handle.
+
+        Its overlapping pairs are reported as exited by the next `update`.
+        KeyError is raised if there's no circle with that handle.
+        """
+        del self._circles[handle]
+        del self._ends[handle]
+        for other in list(self._partners[handle]):
+            self._stop_overlap(handle, other)
+        del self._partners[handle]
+        self._dirty.discard(handle)
+        endpoints = [e for e in self._endpoints if e[2] != handle]
+        for i, e in enumerate(endpoints):
+            e[3] = i
+        self._endpoints = endpoints
+
+    def move_to(self, handle, position):
+        """Move the circle with the given handle to `position`.
+
+        TypeError is raised if `position` is not a numeric collection, and
+        ValueError is raised if it's not in R2. KeyError is raised if there's
+        no circle with that handle.
+        """
+        circle = self._circles[handle]
+        circle[0], circle[1] = _point2(position, "position")
+        self._dirty.add(handle)
+
+    def move_by(self, handle, vector):
+        """Move the circle with the given handle by `vector`.
+
+        Equivalent to replacing the circle with ``circle.moved_by(vector)``,
+        without creating a new circle. TypeError is raised if `vector` is not
+        a numeric collection, and ValueError is raised if it's not in R2.
+        KeyError is raised if there's no circle with that handle.
+        """
+        circle = self._circles[handle]
+        dx, dy = _point2(vector, "vector")
+        circle[0] += dx
+        circle[1] += dy
+        self._dirty.add(handle)
+
+    def replace(self, handle, circle):
+        """Replace the circle with the given handle by `circle`.
+
+        TypeError is raised if `circle` isn't some form of a circle. KeyError
+        is raised if there's no circle with that handle.
+        """
+        if handle not in self._circles:
+            raise KeyError(handle)
+        (x,), (y,), (r,) = _circle_columns([circle], "circle")
+        self._circles[handle] = [x, y, r]
+        self._dirty.add(handle)
+
+    def _swap(self, i):
+        """Swap the endpoints at positions `i` and ``i+1``."""
+        endpoints = self._endpoints
+        a, b = endpoints[i], endpoints[i+1]
+        endpoints[i], endpoints[i+1] = b, a
+        b[3], a[3] = i, i+1
+        if a[1] != b[1] and a[2] != b[2]:
+            if b[1] == 0:
+                self._start_overlap(a[2], b[2])
+            else:
+                self._stop_overlap(a[2], b[2])
+
+    def _settle(self, e):
+        """Move the endpoint `e` until it's in order with its neighbours.
+
+        Returns whether it moved.
+        """
+        endpoints = self._endpoints
+        value, kind = e[0], e[1]
+        i = start = e[3]
+        while i > 0:
+            prev = endpoints[i-1]
+            if prev[0] < value or (prev[0] == value and prev[1] <= kind):
+                break
+            self._swap(i-1)
+            i -= 1
+        last = len(endpoints) - 1
+        while i < last:
+            following = endpoints[i+1]
+            if following[0] > value or (following[0] == value and
+                                         following[1] >= kind):
+                break
+            self._swap(i)
+            i += 1
+        return i != start
+
+    def update(self):
+        """Re-sort the moved circles and return the changes in overlaps.
+
+        The result is an `OverlapEvents` of the pairs of handles that started
+        overlapping, still overlap, and stopped overlapping since the last
+        update.
+        """
+        dirty = self._dirty
+        moved = []
+        for h in dirty:
+            x, y, r = self._circles[h]
+            lower, upper = self._ends[h]
+            lower[0] = x - r
+            upper[0] = x + r
+            moved.append(lower)
+            moved.append(upper)
+
+        # each pass moves every endpoint next to neighbours in order, and
+        # the clean endpoints never change order, so once a pass moves
+        # nothing the whole list is sorted
+        while moved and any([self._settle(e) for e in moved]):
+            pass
+
+        candidates = self._changed
+        for h in dirty:
+            for other in self._partners[h]:
+                candidates.add((h, other) if h < other else (other, h))
+        circles = self._circles
+        sqrt = math.sqrt
+        entered, exited = set(), set()
+        touching = self._touching
+        for pair in candidates:
+            a, b = pair
+            now = False
+            if a in circles and b in circles and b in self._partners[a]:
+                ax, ay, ar = circles[a]
+                bx, by, br = circles[b]
+                dx = bx - ax
+                dy = by - ay
+                now = sqrt(dx*dx + dy*dy) <= br + ar
+            if now and pair not in touching:
+                entered.add(pair)
+            elif not now and pair in touching:
+                exited.add(pair)
+        touching -= exited
+        touching |= entered
+        self._changed = set()
+        self._dirty = set()
+        return OverlapEvents(entered, touching - entered, exited)
+
+# the half of the neighbouring grid cells that each cell is paired with, so
+# every pair of neighbouring cells is visited exactly once
+_HALF_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+def _cell_pairs(keys, order, width, offset):
+    """Return the index pairs of bodies in cells `offset` apart.
+
+    `keys` are the sorted cell keys of the bodies, `order` maps positions in
+    `keys` back to body indices, and `width` is the key stride of one column
+    of cells. Bodies in the same cell are only paired with later bodies.
+    """
+    n = len(keys)
+    dx, dy = offset
+    target = keys + (dx*width + dy)
+    end = np.searchsorted(keys, target, 'right')
+    if offset == (0, 0):
+        start = np.arange(1, n + 1)
+    else:
+        start = np.searchsorted(keys, target, 'left')
+    counts = np.maximum(end - start, 0)
+    first = np.repeat(np.arange(n), counts)
+    skip = np.repeat(start - (np.cumsum(counts) - counts), counts)
+    second = np.arange(len(first)) + skip
+    return order[first], order[second]
+
+def _relax_pairs(positions, radii, I, J):
+    """Return the half-overlap pushes of the overlapping pairs of `I`, `J`.
+
+    Returns ``(count, i, j, px, py)``, where body ``i[k]`` should move by
+    ``-(px[k], py[k])`` and body ``j[k]`` by ``(px[k], py[k])``.
+    """
+    delta = positions[J] - positions[I]
+    dist2 = np.einsum('ij,ij->i', delta, delta)
+    reach = radii[I] + radii[J]
+    hit = dist2 < reach*reach
+    I, J, delta, dist2, reach = I[hit], J[hit], delta[hit], dist2[hit], \
+        reach[hit]
+    dist = np.sqrt(dist2)
+    apart = dist > 0
+    push = np.where(apart, (reach - dist) / (2*np.where(apart, dist, 1)), 0)
+    px = delta[:, 0]*push
+    py = delta[:, 1]*push
+
+    # bodies at the same position are pushed apart along the x-axis
+    px[~apart] = reach[~apart] / 2
+    return len(I), I, J, px, py
+
+class Simulation:
+    """A Simulation moves circular bodies and pushes overlapping ones apart.
+
+    The positions, velocities and radii of the bodies are kept in arrays and
+    updated in place, so no circles are created while stepping. Each step
+    moves every body by its velocity, finds the pairs of bodies that could
+    overlap with a uniform grid hashed with numpy, and then runs a number
+    of relaxation iterations that push every overlapping pair apart along
+    the line between their centers, each body by half the overlap.
+    Velocities aren't changed by collisions.
+
+    With more than one worker, the broad phase and the relaxation are split
+    over a thread pool; numpy releases the GIL for large array operations,
+    so they run on several cores. numpy must be installed to use a
+    Simulation.
+    """
+    __slots__ = ['_positions', '_velocities', '_radii', '_iterations',
+                 '_workers', '_executor']
+
+    def __init__(self, positions, radii, velocities=None, iterations=4,
+                 workers=1):
+        """Create a simulation of bodies at `positions` with `radii`.
+
+        `positions` and `velocities` may be `VectorArray` objects, numpy
+        arrays or collections of numeric collections in R2, and `velocities`
+        defaults to zero. `radii` may be a collection of numbers or a single
+        number shared by every body. Each `step` runs `iterations` rounds of
+        overlap resolution, over `workers` threads. ImportError is raised if
+        numpy isn't installed. TypeError is raised if the arguments aren't
+        numeric, and ValueError is raised if the vectors aren't in R2, the
+        lengths differ, a radius is negative, or `iterations` or `workers`
+        isn't positive.
+        """
+        _require_numpy("Simulation")
+        self._positions = _r2_array(positions, "positions")
+        n = len(self._positions)
+        if velocities is None:
+            self._velocities = np.zeros((n, 2))
+        else:
+            self._velocities = _r2_array(velocities, "velocities")
+            if len(self._velocities) != n:
+                raise ValueError("there must be one velocity for each body")
+        self._radii = _radii_array(radii, n)
+        for arg, name in ((iterations, "iterations"), (workers, "workers")):
+            if not isinstance(arg, numbers.Integral) or \
+                    isinstance(arg, bool):
+                raise TypeError(name + " must be an integer")
+            if arg < 1:
+                raise ValueError(name + " must be positive")
+        self._iterations = iterations
+        self._workers = workers
+        self._executor = None
+
+    def __len__(self):
+        return len(self._radii)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker threads, if they were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def positions(self):
+        """The positions of the bodies, as a `VectorArray`.
+
+        The vector array shares memory with the simulation, so changing it
+        moves the bodies.
+        """
+        return VectorArray._wrap(self._positions)
+
+    @property
+    def velocities(self):
+        """The velocities of the bodies, as a `VectorArray`.
+
+        The vector array shares memory with the simulation, so changing it
+        changes how the bodies move.
+        """
+        return VectorArray._wrap(self._velocities)
+
+    @property
+    def radii(self):
+        """The radii of the bodies, as a numpy array.
+
+        The array shares memory with the simulation.
+        """
+        return self._radii
+
+    @property
+    def circles(self):
+        """The bodies, as a `CircleArray`.
+
+        The circle array shares memory with the simulation.
+        """
+        return CircleArray._wrap(self._positions, self._radii)
+
+    def _map(self, function, jobs):
+        """Return ``[function(*job) for job in jobs]``, over the workers."""
+        if self._workers == 1 or len(jobs) == 1:
+            return [function(*job) for job in jobs]
+        if self._executor is None:
+            import concurrent.futures
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self._workers)
+        return list(self._executor.map(lambda job: function(*job), jobs))
+
+    def _cell_size(self):
+        """Return the width of the grid cells, twice the median diameter."""
+        radii = self._radii
+        return 4*float(np.median(radii)) or 4*float(radii.mean()) or 1.0
+
+    def candidate_pairs(self):
+        """Return the pairs of bodies that could overlap.
+
+        Returns a pair of index arrays ``(i, j)`` that includes every
+        overlapping pair. The cells of the grid are twice as wide as the
+        median body, so that a few huge bodies don't make every body share
+        a cell. Bodies wider than a cell aren't put in the grid, and are
+        instead paired with the bodies in every cell they could reach, and
+        with each other.
+        """
+        positions, radii = self._positions, self._radii
+        n = len(positions)
+        if n < 2:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        cell = self._cell_size()
+        oversized = 2*radii > cell
+        small = np.flatnonzero(~oversized)
+        cells = np.floor(positions / cell).astype(np.int64)
+        origin = cells.min(axis=0)
+        cells -= origin
+        top = cells.max(axis=0)
+        width = int(top[1]) + 3
+        keys = cells[:, 0]*width + cells[:, 1] + 1
+        order = small[np.argsort(keys[small], kind='stable')]
+        keys = keys[order]
+        pairs = self._map(_cell_pairs, [(keys, order, width, offset)
+                                         for offset in _HALF_NEIGHBOURS])
+
+        large = np.flatnonzero(oversized)
+        for k, b in enumerate(large):
+            # the small bodies that could reach body b are in the cells
+            # within its radius and half a cell of its center
+            span = radii[b] + cell/2
+            low = np.floor((positions[b] - span) / cell).astype(np.int64)
+            high = np.floor((positions[b] + span) / cell).astype(np.int64)
+            low = np.maximum(low - origin, 0)
+            high = np.minimum(high - origin, top)
+            columns = np.arange(low[0], high[0] + 1)*width
+            starts = np.searchsorted(keys, columns + low[1] + 1, 'left')
+            stops = np.searchsorted(keys, columns + high[1] + 1, 'right')
+            near = [order[a:z] for a, z in zip(starts, stops) if z > a]
+
+            # and it's tested against every later oversized body directly
+            others = large[k+1:]
+            delta = positions[others] - positions[b]
+            reach = radii[others] + radii[b]
+            near.append(others[np.einsum('ij,ij->i', delta, delta) <
+                               reach*reach])
+            near = np.concatenate(near)
+            pairs.append((np.full(len(near), b, dtype=np.intp), near))
+        return (np.concatenate([i for i, _ in pairs]),
+                np.concatenate([j for _, j in pairs]))
+
+    def step(self, dt=1.0, iterations=None):
+        """Advance the simulation by the time `dt`.
+
+        Every body is moved by its velocity times `dt`, and then overlaps
+        are resolved as in `resolve`. Returns the number of overlapping
+        pairs found in the last iteration.
+        """
+        if not isinstance(dt, numbers.Real) or isinstance(dt, bool):
+            raise TypeError("dt must be a number")
+        self._positions += self._velocities * dt
+        return self.resolve(iterations)
+
+    def resolve(self, iterations=None):
+        """Push overlapping bodies apart without moving time forward.
+
+        `iterations` defaults to the number the simulation was created with.
+        The candidate pairs are found once, skipping pairs whose gap is wider
+        than the median diameter, and each iteration pushes every pair that
+        still overlaps apart. Returns the number of overlapping pairs found in
+        the last iteration. TypeError is raised if `iterations` isn't an
+        integer, and ValueError is raised if it isn't positive.
+        """
+        if iterations is None:
+            iterations = self._iterations
+        elif not isinstance(iterations, numbers.Integral) or \
+                isinstance(iterations, bool):
+            raise TypeError("iterations must be an integer")
+        elif iterations < 1:
+            raise ValueError("iterations must be positive")
+        I, J = self.candidate_pairs()
+        positions, radii = self._positions, self._radii
+        n = len(positions)
+
+        # pairs with a wide gap between them are unlikely to be pushed
+        # together within one step, so only the rest are relaxed
+        if len(I):
+            delta = positions[J] - positions[I]
+            reach = radii[I] + radii[J] + self._cell_size()/2
+            near = np.einsum('ij,ij->i', delta, delta) < reach*reach
+            I, J = I[near], J[near]
+        chunks = max(1, min(self._workers, len(I) // 50000))
+        bounds = np.linspace(0, len(I), chunks + 1).astype(np.intp)
+        jobs = [(positions, radii, I[a:b], J[a:b])
+                for a, b in zip(bounds[:-1], bounds[1:])]
+        contacts = 0
+        for _ in range(iterations):
+            results = self._map(_relax_pairs, jobs)
+            contacts = sum(k for k, _, _, _, _ in results)
+            if contacts == 0:
+                break
+            dx = np.zeros(n)
+            dy = np.zeros(n)
+            for _, i, j, px, py in results:
+                dx -= np.bincount(i, px, n)
+                dx += np.bincount(j, px, n)
+                dy -= np.bincount(i, py, n)
+                dy += np.bincount(j, py, n)
+            positions[:, 0] += dx
+            positions[:, 1] += dy
+        return contacts
+
+# the most pairs a ParallelEngine worker tests at once, which bounds the size
+# of its temporary arrays
+_PARALLEL_BLOCK = 1 << 18
+
+def _parallel_chunk(name, n, m, cols, start, stop, same):
+    """Return the intersecting index pairs of circles ``start:stop``.
+
+    This runs in a worker process. The circles are the first ``n`` rows of
+    an (n, 3) array in the shared memory block `name`, followed by ``m``
+    rows of ``cols`` columns holding the points or other circles. When the
+    circles are tested against themselves, `same` is true and only the
+    circles are in the block.
+    """
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        size = n * 3 if same else n * 3 + m * cols
+        data = np.ndarray((size,), dtype=float, buffer=block.buf)
+        others = data[:n * 3] if same else data[n * 3:]
+        others = others.reshape(m, cols)
+        circles = data[:n * 3].reshape(n, 3)[start:stop]
+        keys = _chunk_keys(circles, others, start, same)
+        del data, circles, others
+    finally:
+        block.close()
+    return (keys // m).tolist(), (keys % m).tolist()
+
+def _chunk_keys(circles, others, start, same):
+    """Return the sorted keys ``i*m + j`` of the pairs in one chunk.
+
+    The points or other circles are tested a block at a time, so the
+    temporary arrays stay small however many there are.
+    """
+    m = len(others)
+    rows = np.arange(start, start + len(circles))[:, None]
+    width = max(1, _PARALLEL_BLOCK // max(1, len(circles)))
+    keys = [np.empty(0, dtype=np.int64)]
+    for first in range(start + 1 if same else 0, m, width):
+        block = others[first:first + width]
+        dx = block[:, 0] - circles[:, 0, None]
+        dy = block[:, 1] - circles[:, 1, None]
+        reach = circles[:, 2, None]
+        if others.shape[1] == 3:
+            reach = block[:, 2] + reach
+        hits = np.sqrt(dx*dx + dy*dy) <= reach
+        if same:
+            hits &= np.arange(first, first + len(block)) > rows
+        i, j = np.nonzero(hits)
+        keys.append((i + start) * m + (j + first))
+    return np.sort(np.concatenate(keys))
+
+def _circle_rows(circles, name):
+    """Return `circles` as an (N, 3) float array of x, y and radius."""
+    if isinstance(circles, CircleArray):
+        return np.column_stack((circles._centers, circles._radii))
+    X, Y, R = _circle_columns(circles, name)
+    return np.array([X, Y, R], dtype=float).T.reshape(-1, 3)
+
+class ParallelEngine:
+    """A ParallelEngine splits large batches of intersection tests over cores.
+
+    The circles are split into chunks of `chunk_size` rows, and each chunk
+    is tested against every point or circle in a separate worker process of
+    a `concurrent.futures.ProcessPoolExecutor`, a block of points or circles
+    at a time so that the memory a worker uses doesn't grow with the size
+    of the batch. The inputs are copied once
+    into a `multiprocessing.shared_memory` block that every worker reads,
+    so they aren't pickled for each chunk. The results are merged in chunk
+    order, so they're the same however the work is scheduled. Intersections
+    follow the same rule as `Circle.intersects`.
+
+    The worker processes are started on first use and kept until `close` is
+    called, or until the engine is used as a context manager and the block
+    exits. numpy must be installed to use a ParallelEngine.
+    """
+    __slots__ = ['_workers', '_chunk_size', '_executor']
+
+    def __init__(self, workers=None, chunk_size=1024):
+        """Create a parallel engine with `workers` processes.
+
+        `workers` defaults to the number of processors on the machine.
+        Batches with no more circles than `chunk_size` run in the calling
+        process. ImportError is raised if numpy isn't installed. TypeError is
+        raised if either argument isn't an integer, and ValueError is raised
+        if either isn't positive.
+        """
+        _require_numpy("ParallelEngine")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        for arg, name in ((workers, "workers"), (chunk_size, "chunk_size")):
+            if not isinstance(arg, numbers.Integral) or \
+                    isinstance(arg, bool):
+                raise TypeError(name + " must be an integer")
+            if arg < 1:
+                raise ValueError(name + " must be positive")
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._executor = None
+
+    @property
+    def workers(self):
+        """The number of worker processes."""
+        return self._workers
+
+    @property
+    def chunk_size(self):
+        """The number of circles each worker tests at a time."""
+        return self._chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes, if they were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def point_pairs(self, circles, points):
+        """Return the sorted list of pairs of intersecting circles and points.
+
+        Each pair is a tuple ``(i, j)`` where circle ``i`` of `circles`
+        contains point ``j`` of `points`. `circles` may be a `CircleArray` or
+        a collection of circles, and `points` may be a `VectorArray` or a
+        collection of points. TypeError is raised if the arguments aren't
+        circles and numeric collections, and ValueError is raised if the
+        points aren't in R2.
+        """
+        if isinstance(points, VectorArray):
+            points = points._array
+        else:
+            points = np.array(_point_rows(points), dtype=float)
+        if points.size and points.shape[1] != 2:
+            raise ValueError("points must be in R2")
+        points = points.reshape(-1, 2)
+        return self._run(_circle_rows(circles, "circles"), points, False)
+
+    def circle_pairs(self, circles, others=None):
+        """Return the sorted list of pairs of intersecting circles.
+
+        If `others` is given, each pair is a tuple ``(i, j)`` where circle
+        ``i`` of `circles` intersects circle ``j`` of `others`. Otherwise the
+        pairs are the intersecting circles within `circles`, with ``i < j``.
+        Either argument may be a `CircleArray` or a collection of circles.
+        TypeError is raised if they aren't collections of circles.
+        """
+        rows = _circle_rows(circles, "circles")
+        if others is None:
+            return self._run(rows, rows, True)
+        return self._run(rows, _circle_rows(others, "others"), False)
+
+    def _run(self, circles, others, same):
+        """Test `circles` against `others` chunk by chunk and merge pairs."""
+        from multiprocessing import shared_memory
+        n, m, cols = len(circles), len(others), others.shape[1]
+        size = self._chunk_size
+        starts = range(0, n, size)
+        # circles tested against themselves are only copied once
+        total = n * 3 if same else n * 3 + m * cols
+        block = shared_memory.SharedMemory(create=True,
+                                           size=max(1, total * 8))
+        try:
+            data = np.ndarray((total,), dtype=float, buffer=block.buf)
+            data[:n * 3] = circles.ravel()
+            if not same:
+                data[n * 3:] = others.ravel()
+            del data
+            args = [(block.name, n, m, cols, s, min(s + size, n), same)
+                    for s in starts]
+            if len(args) <= 1 or self._workers == 1:
+                chunks = [_parallel_chunk(*a) for a in args]
+            else:
+                if self._executor is None:
+                    import concurrent.futures
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                        self._workers)
+                chunks = list(self._executor.map(_parallel_chunk, *zip(*args)))
+        finally:
+            block.close()
+            block.unlink()
+        return [pair for I, J in chunks for pair in zip(I, J)]
+
+async def _point_batches(points, size, window):
+    """Yield lists of up to `size` items from the async iterable `points`.
+
+    A batch is also cut short once `window` seconds have passed since its
+    first item arrived. The pending ``__anext__`` is waited on rather than
+    cancelled when the window closes, so no item of `points` is ever lost.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    source = points.__aiter__()
+    pending = None
+    try:
+        while True:
+            batch = []
+            deadline = None
+            while len(batch) < size:
+                if pending is None:
+                    pending = asyncio.ensure_future(source.__anext__())
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    break
+                task, pending = pending, None
+                try:
+                    batch.append(task.result())
+                except StopAsyncIteration:
+                    if batch:
+                        yield batch
+                    return
+                if deadline is None:
+                    deadline = loop.time() + window
+            yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+def _classify_batch(index, batch):
+    """Return the indices of the circles in `index` containing each point."""
+    return [index.query_point(point) for point in batch]
+
+async def classify_stream(points, circles, batch_size=256, window=0.01,
+                          max_pending=4, executor=None):
+    """Yield the circles containing each point of an asynchronous stream.
+
+    `points` is an async iterable of points in R2, and for each point, in
+    order, a tuple ``(point, indices)`` is yielded, where `indices` is the
+    sorted list of the circles that contain it, as in `Circle.intersects`.
+    `circles` may be a `CircleArray` or a collection of circles, which are
+    indexed in a `SpatialHash`, or an index with a ``query_point`` method,
+    such as a `SpatialHash` or a `BVH`.
+
+    Points are classified in batches of up to `batch_size`, or of whatever
+    arrived within `window` seconds of a batch's first point, in `executor`
+    or the event loop's default executor, so the event loop is never
+    blocked. At most `max_pending` batches are classified or waiting to be
+    consumed at once: when the consumer falls behind, no more points are
+    read from `points` until it catches up. When the stream is closed early,
+    the batches that haven't been classified yet are cancelled. TypeError is
+    raised if `points` isn't an async iterable, a point isn't a numeric
+    collection or `batch_size` or `max_pending` isn't an integer, and
+    ValueError is raised if a point isn't in R2 or `batch_size` or
+    `max_pending` isn't positive.
+    """
+    if not hasattr(points, '__aiter__'):
+        raise TypeError("points must be an async iterable")
+    for arg, name in ((batch_size, "batch_size"),
+                      (max_pending, "max_pending")):
+        if not isinstance(arg, numbers.Integral) or isinstance(arg, bool):
+            raise TypeError(name + " must be an integer")
+        if arg < 1:
+            raise ValueError(name + " must be positive")
+    import asyncio
+    index = circles
+    if not hasattr(circles, 'query_point'):
+        index = SpatialHash(circles)
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(max_pending)
+
+    async def produce():
+        batches = _point_batches(points, batch_size, window)
+        try:
+            async for batch in batches:
+                job = loop.run_in_executor(executor, _classify_batch,
+                                           index, batch)
+                try:
+                    await queue.put((batch, job))
+                except asyncio.CancelledError:
+                    job.cancel()
+                    raise
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+        finally:
+            await batches.aclose()
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            batch, job = item
+            for point, indices in zip(batch, await job):
+                yield point, indices
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        while not queue.empty():
+            item = queue.get_nowait()
+            if isinstance(item, tuple):
+                item[1].cancel()
+
+# The header of the binary format: magic, version, kind, dtype, dimension
+# and count, little-endian and padded to 64 bytes so the data stays aligned
+_FORMAT_MAGIC = b'GEOM'
+_FORMAT_VERSION = 1
+_FORMAT_HEADER = struct.Struct('<4sHc2sIQ')
+_FORMAT_HEADER_SIZE = 64
+_FORMAT_DTYPES = {b'f8': '<f8', b'f4': '<f4'}
+
+def _write_records(path, kind, dtype, dim, blocks):
+    """Write a header of `kind` followed by each array in `blocks`."""
+    codes = {np.dtype(v): k for k, v in _FORMAT_DTYPES.items()}
+    dtype = np.dtype(dtype).newbyteorder('<')
+    if dtype not in codes:
+        raise ValueError("dtype must be float64 or float32")
+    count = len(blocks[0])
+    header = _FORMAT_HEADER.pack(_FORMAT_MAGIC, _FORMAT_VERSION, kind,
+                                 codes[dtype], dim, count)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(_FORMAT_HEADER_SIZE, b'\0'))
+        for block in blocks:
+            np.ascontiguousarray(block, dtype=dtype).tofile(f)
+
+def _read_records(path, kind, mode):
+    """Read the header of `path` and return its dtype, dimension and count.
+
+    ValueError is raised if `path` isn't a file of `kind` records in a
+    supported version, or if it's shorter than its header says.
+    """
+    if mode not in ('r', 'r+', 'c'):
+        raise ValueError("mode must be 'r', 'r+' or 'c'")
+    with open(path, 'rb') as f:
+        header = f.read(_FORMAT_HEADER_SIZE)
+        size = os.fstat(f.fileno()).st_size
+    if (len(header) < _FORMAT_HEADER_SIZE or
+            header[:4] != _FORMAT_MAGIC):
+        raise ValueError("{} is not a geom binary file".format(path))
+    magic, version, found, code, dim, count = _FORMAT_HEADER.unpack_from(
+        header)
+    if version != _FORMAT_VERSION:
+        raise ValueError("unsupported geom binary version {}".format(version))
+    if found != kind:
+        raise ValueError("{} does not hold {}".format(
+            path, "vectors" if kind == b'V' else "circles"))
+    if code not in _FORMAT_DTYPES:
+        raise ValueError("unsupported geom binary dtype {!r}".format(code))
+    dtype = np.dtype(_FORMAT_DTYPES[code])
+    width = dim if kind == b'V' else dim + 1
+    if size < _FORMAT_HEADER_SIZE + count * width * dtype.itemsize:
+        raise ValueError("{} is truncated".format(path))
+    return dtype, dim, count
+
+def _map_records(path, dtype, mode, count):
+    """Memory-map `count` items of `dtype` that follow the header."""
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=_FORMAT_HEADER_SIZE,
+                     shape=(count,))
+
+def save_vectors(path, vectors, dtype='f8'):
+    """Save `vectors` to `path` in geom's binary format.
+
+    `vectors` may be a `VectorArray`, a two-dimensional numpy array, or a
+    collection of vectors that all have the same dimension. The file holds
+    a 64 byte header followed by the packed components, row by row, as
+    little-endian `dtype`, which must be float64 or float32. Open the file
+    with `load_vectors`. ImportError is raised if numpy isn't installed,
+    TypeError is raised if the vectors aren't numeric, and ValueError is
+    raised if they don't all have the same dimension.
+    """
+    _require_numpy("save_vectors")
+    if not isinstance(vectors, VectorArray):
+        vectors = VectorArray(vectors)
+    array = vectors._array
+    _write_records(path, b'V', dtype, array.shape[1], [array])
+
+def load_vectors(path, mode='r'):
+    """Open a file written by `save_vectors` as a `VectorArray`.
+
+    The file is memory-mapped rather than read, so opening it is instant and
+    only the rows that are used are loaded from disk. With `mode` ``'r'``
+    the array is read-only, with ``'r+'`` changes are written back to the
+    file, and with ``'c'`` changes are kept in memory only. ImportError is
+    raised if numpy isn't installed, and ValueError is raised if the file
+    doesn't hold vectors in a supported version.
+    """
+    _require_numpy("load_vectors")
+    dtype, dim, count = _read_records(path, b'V', mode)
+    data = _map_records(path, dtype, mode, count * dim)
+    return VectorArray._wrap(data.reshape(count, dim))
+
+def save_circles(path, circles, dtype='f8'):
+    """Save `circles` to `path` in geom's binary format.
+
+    `circles` may be a `CircleArray` or a collection of circles. The file
+    holds a 64 byte header followed by the packed centers, then the radii,
+    as little-endian `dtype`, which must be float64 or float32. Open the
+    file with `load_circles`. ImportError is raised if numpy isn't
+    installed, and TypeError is raised if `circles` isn't a collection of
+    circles.
+    """
+    _require_numpy("save_circles")
+    if not isinstance(circles, CircleArray):
+        circles = CircleArray(circles)
+    _write_records(path, b'C', dtype, 2, [circles._centers, circles._radii])
+
+def load_circles(path, mode='r'):
+    """Open a file written by `save_circles` as a `CircleArray`.
+
+    The file is memory-mapped like in `load_vectors`, and `mode` has the same
+    meaning. ImportError is raised if numpy isn't installed, and ValueError
+    is raised if the file doesn't hold circles in a supported version.
+    """
+    _require_numpy("load_circles")
+    dtype, dim, count = _read_records(path, b'C', mode)
+    data = _map_records(path, dtype, mode, count * 3)
+    return CircleArray._wrap(data[:count * 2].reshape(count, 2),
+                             data[count * 2:])
+
+class Affine:
+    """An Affine is an affine transformation of R2.
+
+    The transformation maps ``(x, y)`` to ``(a*x + b*y + c, d*x + e*y +
+    f)``, and is immutable. Transformations compose with `@`, where
+    ``A @ B`` applies ``B`` first, and the product is computed once, so a
+    composed chain is applied with a single multiply. The inverse is
+    computed when it's first needed and then cached.
+
+    | `A @ B` gives the composition of the transformations `A` and `B`
+    | `A @ v` gives the vector `v` transformed by `A`
+    | `A @ varr` gives every vector of the `VectorArray` `varr` transformed
+    | `A @ c` gives the circle `c` transformed by `A`
+    | `~A` gives the inverse of `A`
+    """
+    __slots__ = ['_coefficients', '_inverse']
+
+    def __init__(self, a=1, b=0, c=0, d=0, e=1, f=0):
+        """Create the transformation with the given coefficients.
+
+        The defaults give the identity. TypeError is raised if any
+        coefficient isn't a real number.
+        """
+        coefficients = (a, b, c, d, e, f)
+        if not all(isinstance(m, numbers.Real) and not isinstance(m, bool)
+                   for m in coefficients):
+            raise TypeError("coefficients must be real numbers")
+        self._coefficients = coefficients
+        self._inverse = None
+
+    @classmethod
+    def _from_trusted(cls, coefficients):
+        """Create a transformation from a tuple of six numbers without checks.
+        """
+        A = object.__new__(cls)
+        A._coefficients = coefficients
+        A._inverse = None
+        return A
+
+    @classmethod
+    def identity(cls):
+        """Create the transformation that leaves every point where it is."""
+        return cls._from_trusted((1, 0, 0, 0, 1, 0))
+
+    @classmethod
+    def translation(cls, offset):
+        """Create the transformation that moves every point by `offset`.
+
+        TypeError is raised if `offset` isn't a numeric collection, and
+        ValueError is raised if it isn't in R2.
+        """
+        x, y = _point2(offset, "offset")
+        return cls._from_trusted((1, 0, x, 0, 1, y))
+
+    @classmethod
+    def rotation(cls, angle, center=(0, 0)):
+        """Create the transformation that rotates by `angle` about `center`.
+
+        `angle` is counter-clockwise in radians. TypeError is raised if
+        `angle` isn't a number or `center` isn't a numeric collection, and
+        ValueError is raised if `center` isn't in R2.
+        """
+        _check_scalar(angle, "angle must be a number")
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        return cls._about((cos, -sin, sin, cos), center)
+
+    @classmethod
+    def scaling(cls, sx, sy=None, center=(0, 0)):
+        """Create the transformation that scales by `sx` and `sy` about
+        `center`.
+
+        `sy` defaults to `sx`, giving a uniform scale. TypeError is raised
+        if the factors aren't numbers or `center` isn't a numeric
+        collection, and ValueError is raised if `center` isn't in R2.
+        """
+        if sy is None:
+            sy = sx
+        _check_scalar(sx, "sx must be a number")
+        _check_scalar(sy, "sy must be a number")
+        return cls._about((sx, 0, 0, sy), center)
+
+    @classmethod
+    def _about(cls, linear, center):
+        """Create the transformation applying `linear` about `center`."""
+        a, b, d, e = linear
+        x, y = _point2(center, "center")
+        return cls._from_trusted((a, b, x - a*x - b*y, d, e, y - d*x - e*y))
+
+    @property
+    def coefficients(self):
+        """The coefficients ``(a, b, c, d, e, f)`` of the transformation."""
+        return self._coefficients
+
+    @property
+    def determinant(self):
+        """The determinant of the linear part of the transformation."""
+        a, b, _, d, e, _ = self._coefficients
+        return a*e - b*d
+
+    @property
+    def is_uniform(self):
+        """Whether the transformation scales every direction by the same
+        factor, so that it maps circles to circles.
+        """
+        a, b, _, d, e, _ = self._coefficients
+        scale = max(abs(a), abs(b), abs(d), abs(e), 1)
+        tol = EPSILON * scale
+        return ((abs(a - e) <= tol and abs(b + d) <= tol) or
+                (abs(a + e) <= tol and abs(b - d) <= tol))
+
+    @property
+    def inverse(self):
+        """The inverse of the transformation.
+
+        ValueError is raised if the transformation isn't invertible.
+        """
+        if self._inverse is None:
+            a, b, c, d, e, f = self._coefficients
+            det = a*e - b*d
+            if det == 0:
+                raise ValueError("transformation is not invertible")
+            m11, m12, m21, m22 = e/det, -b/det, -d/det, a/det
+            inverse = Affine._from_trusted((m11, m12, -m11*c - m12*f,
+                                            m21, m22, -m21*c - m22*f))
+            inverse._inverse = self
+            self._inverse = inverse
+        return self._inverse
+
+    def __invert__(self):
+        return self.inverse
+
+    def __repr__(self):
+        return "geom.Affine({}, {}, {}, {}, {}, {})".format(
+            *self._coefficients)
+
+    def __eq__(self, other):
+        if not isinstance(other, Affine):
+            return NotImplemented
+        return self._coefficients == other._coefficients
+
+    def __hash__(self):
+        return hash(self._coefficients)
+
+    def __reduce__(self):
+        return Affine, self._coefficients
+
+    def __matmul__(self, other):
+        a, b, c, d, e, f = self._coefficients
+        if isinstance(other, Affine):
+            oa, ob, oc, od, oe, of = other._coefficients
+            return Affine._from_trusted((a*oa + b*od, a*ob + b*oe,
+                                         a*oc + b*of + c,
+                                         d*oa + e*od, d*ob + e*oe,
+                                         d*oc + e*of + f))
+        if isinstance(other, VectorArray):
+            if other.dim != 2:
+                raise ValueError("vectors must be in R2")
+            return VectorArray._wrap(self._apply_array(other.array))
+        if isinstance(other, CircleArray):
+            scale = self._uniform_scale()
+            return CircleArray._wrap(self._apply_array(other._centers),
+                                     other._radii * scale)
+        if isinstance(other, Circle):
+            scale = self._uniform_scale()
+            x, y = other._center
+            return type(other)._from_trusted(
+                Vector._from_trusted([a*x + b*y + c, d*x + e*y + f]),
+                other._radius * scale)
+        if is_numeric(other) and not isinstance(other, numbers.Number):
+            x, y = _point2(other, "vector")
+            if isinstance(other, Vector2):
+                return Vector2._make(a*x + b*y + c, d*x + e*y + f)
+            return Vector._from_trusted([a*x + b*y + c, d*x + e*y + f])
+        return NotImplemented
+
+    def _apply_array(self, points):
+        """Return the (N, 2) array `points` transformed as a new array."""
+        a, b, c, d, e, f = self._coefficients
+        out = points @ np.array([[a, d], [b, e]], dtype=float)
+        out += (c, f)
+        return out
+
+    def _uniform_scale(self):
+        """Return the factor a uniform transformation scales radii by.
+
+        ValueError is raised if the transformation isn't uniform.
+        """
+        if not self.is_uniform:
+            raise ValueError("only uniform transformations map circles to "
+                             "circles")
+        return math.sqrt(abs(self.determinant))
+
+class _Instruments:
+    """The counters and timing histograms kept while instrumentation is on."""
+    __slots__ = ['counters', 'timings']
+
+    def __init__(self):
+        self.counters = {}
+        self.timings = {}
+
+    def count(self, name):
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def time(self, name, ns):
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = {'count': 0, 'total_ns': 0,
+                                           'min_ns': ns, 'max_ns': ns,
+                                           'histogram': {}}
+        timing['count'] += 1
+        timing['total_ns'] += ns
+        timing['min_ns'] = min(timing['min_ns'], ns)
+        timing['max_ns'] = max(timing['max_ns'], ns)
+
+        # bucket by the next power of two nanoseconds
+        bucket = 1 << max(0, ns - 1).bit_length()
+        histogram = timing['histogram']
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+_instruments = None
+_uninstrumented = {}
+
+_TIMED_METHODS = {
+    'Vector': ('__eq__', '__add__', '__radd__', '__sub__', '__rsub__',
+               '__mul__', '__rmul__', '__truediv__', '__matmul__',
+               '__rmatmul__', '__iadd__', '__isub__', '__imul__',
+               '__itruediv__', '__neg__', '__abs__', '__invert__', 'mag',
+               'magSq', 'add', 'addOn', 'sub', 'takeAway', 'mul', 'mulBy',
+               'div', 'divBy', 'normalize', 'dot', 'cross', 'norm', 'axpy'),
+    'Circle': ('scaled_to', 'scaled_by', 'moved_to', 'moved_by',
+               'intersects'),
+}
+_CREATION_METHODS = ('__init__', '_from_trusted', '_make')
+_CALL_SITE_METHODS = {'Circle.intersects'}
+
+def _timed(name, func):
+    """Wrap `func` to count and time its calls under `name`."""
+    clock = time.perf_counter_ns
+    by_call_site = name in _CALL_SITE_METHODS
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            instruments = _instruments
+            if instruments is not None:
+                instruments.count(name)
+                instruments.time(name, elapsed)
+                if by_call_site:
+                    caller = sys._getframe(1)
+                    instruments.time("{}@{}:{}".format(
+                        name, caller.f_code.co_filename, caller.f_lineno),
+                        elapsed)
+    return timed
+
+def _counted_creation(func, is_classmethod):
+    """Wrap the constructor `func` to count the objects it creates."""
+    @functools.wraps(func)
+    def counted(first, *args, **kwargs):
+        instruments = _instruments
+        if instruments is not None:
+            cls = first if is_classmethod else type(first)
+            instruments.count(cls.__name__ + ".created")
+        return func(first, *args, **kwargs)
+    return counted
+
+def _counted_is_numeric(N):
+    instruments = _instruments
+    if instruments is not None:
+        instruments.count('is_numeric')
+    return _uninstrumented[('module', 'is_numeric')](N)
+
+def enable_instrumentation():
+    """Start counting and timing the hot paths of `Vector` and `Circle`.
+
+    While instrumentation is on, geom counts the vectors and circles it
+    creates and the `is_numeric` validations it runs, and keeps a count and a
+    timing histogram for each operation on `Vector` and `Circle`.
+    `Circle.intersects` is also timed separately for each call site.
+    Instrumentation can also be turned on by setting the ``GEOM_INSTRUMENT``
+    environment variable to ``1`` before importing geom.
+
+    Instrumentation works by wrapping the instrumented methods, which are
+    restored by `disable_instrumentation`, so it costs nothing while off.
+    Enabling it again keeps the statistics gathered so far.
+    """
+    global _instruments
+    if _instruments is None:
+        _instruments = _Instruments()
+    if _uninstrumented:
+        return
+    module = sys.modules[__name__]
+    _uninstrumented[('module', 'is_numeric')] = is_numeric
+    module.is_numeric = functools.wraps(is_numeric)(_counted_is_numeric)
+
+    classes = (_BaseVector, Vector, FrozenVector, Vector2, Vector3,
+               LazyVector, Circle)
+    for cls in classes:
+        family = 'Circle' if cls is Circle else 'Vector'
+        # the shared vector operations are reported as Vector's
+        name = 'Vector' if cls is _BaseVector else cls.__name__
+        for attr in _TIMED_METHODS[family] + _CREATION_METHODS:
+            if attr not in cls.__dict__:
+                continue
+            original = cls.__dict__[attr]
+            is_classmethod = isinstance(original, classmethod)
+            func = original.__func__ if is_classmethod else original
+            if attr in _CREATION_METHODS:
+                # frozen vectors are created by the Vector constructors, and
+                # lazy vectors by Vector.__init__ or LazyVector._make
+                if cls is FrozenVector or (cls is LazyVector and
+                                           attr != '_make'):
+                    continue
+                wrapped = _counted_creation(func, is_classmethod)
+            else:
+                wrapped = _timed(name + "." + attr, func)
+            _uninstrumented[(cls, attr)] = original
+            setattr(cls, attr,
+                    classmethod(wrapped) if is_classmethod else wrapped)
+
+def disable_instrumentation():
+    """Stop instrumenting geom and restore the uninstrumented methods.
+
+    The statistics gathered so far are kept until `reset_instrumentation` is
+    called.
+    """
+    module = sys.modules[__name__]
+    for (owner, attr), original in _uninstrumented.items():
+        if owner == 'module':
+            setattr(module, attr, original)
+        else:
+            setattr(owner, attr, original)
+    _uninstrumented.clear()
+
+def instrumentation_enabled():
+    """Return whether instrumentation is on."""
+    return bool(_uninstrumented)
+
+def reset_instrumentation():
+    """Clear all counters and timings gathered so far."""
+    if _instruments is not None:
+        _instruments.counters.clear()
+        _instruments.timings.clear()
+
+def instrumentation_snapshot():
+    """Return a copy of the counters and timings gathered so far.
+
+    The snapshot is a plain dict with a ``'counters'`` dict from names to
+    counts, and a ``'timings'`` dict from operation names to their
+    ``count``, ``total_ns``, ``min_ns``, ``max_ns`` and ``histogram``. Each
+    histogram maps an upper bound in nanoseconds, as a string, to how many
+    calls took at most that long but longer than the next smaller bound.
+    Call-site timings are named ``'Circle.intersects@<file>:<line>'``.
+    """
+    if _instruments is None:
+        return {'counters': {}, 'timings': {}}
+    timings = {}
+    for name, timing in _instruments.timings.items():
+        timing = dict(timing)
+        timing['histogram'] = {str(k): v for k, v in
+                               sorted(timing['histogram'].items())}
+        timings[name] = timing
+    return {'counters': dict(_instruments.counters), 'timings': timings}
+
+def instrumentation_json(**kwargs):
+    """Return `instrumentation_snapshot` as a JSON string.
+
+    Keyword arguments are passed on to `json.dumps`.
+    """
+    return json.dumps(instrumentation_snapshot(), **kwargs)
+
+if os.environ.get('GEOM_INSTRUMENT', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable_instrumentation()
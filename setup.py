@@ -24,4 +24,5 @@ setuptools.setup(
     long_description_content_type="text/x-rst",
     url='https://github.com/josiest/geom',
     py_modules=['geom'],
+    extras_require={'numpy': ['numpy']},
     classifiers=geom_classifiers)
@@ -0,0 +1,96 @@
+import geom
+import math
+import pickle
+import pytest
+import random
+
+def random_affine(rng):
+    return geom.Affine(*(rng.uniform(-3, 3) for _ in range(6)))
+
+def test_constructors():
+    """Test translation, rotation and scaling of single vectors"""
+    v = geom.Vector([1, 0])
+    assert geom.Affine.identity() @ v == v
+    assert geom.Affine.translation((2, 3)) @ v == [3, 3]
+    assert list(geom.Affine.rotation(math.pi/2) @ v) == pytest.approx([0, 1])
+    assert list(geom.Affine.rotation(math.pi, (2, 0)) @ v) == \
+        pytest.approx([3, 0])
+    assert geom.Affine.scaling(2, 3) @ geom.Vector([1, 1]) == [2, 3]
+    assert geom.Affine.scaling(2, center=(1, 1)) @ v == [1, -1]
+
+def test_composition():
+    """Test that composed transforms match applying each in turn"""
+    rng = random.Random(1)
+    for _ in range(20):
+        A, B, C = (random_affine(rng) for _ in range(3))
+        v = geom.Vector([rng.uniform(-5, 5), rng.uniform(-5, 5)])
+        assert list((A @ B @ C) @ v) == pytest.approx(list(A @ (B @ (C @ v))))
+        composed = (A @ B) @ C
+        assert list(composed.coefficients) == \
+            pytest.approx(list((A @ (B @ C)).coefficients))
+
+def test_inverse():
+    """Test that the inverse undoes a transform and is cached"""
+    rng = random.Random(2)
+    A = random_affine(rng)
+    v = geom.Vector([1.5, -2])
+    assert list(~A @ (A @ v)) == pytest.approx([1.5, -2])
+    assert A.inverse is A.inverse
+    assert A.inverse.inverse is A
+    with pytest.raises(ValueError):
+        geom.Affine.scaling(0, 1).inverse
+
+def test_vector_types():
+    """Test the types of transformed vectors"""
+    A = geom.Affine.translation((1, 1))
+    assert isinstance(A @ geom.Vector2(1, 2), geom.Vector2)
+    assert type(A @ (1, 2)) is geom.Vector
+    with pytest.raises(ValueError):
+        A @ geom.Vector([1, 2, 3])
+    with pytest.raises(TypeError):
+        A @ "ab"
+
+def test_circles():
+    """Test that uniform transforms move and scale circles"""
+    A = geom.Affine.rotation(1, (1, 2)) @ geom.Affine.scaling(-3)
+    c = geom.Circle((2, 1), 1.5)
+    moved = A @ c
+    assert list(moved.center) == pytest.approx(list(A @ c.center))
+    assert moved.radius == pytest.approx(4.5)
+    assert c.center == [2, 1] and c.radius == 1.5
+    assert geom.Affine.scaling(1, -1).is_uniform
+    with pytest.raises(ValueError):
+        geom.Affine.scaling(1, 2) @ c
+
+def test_arrays():
+    """Test that arrays are transformed like their elements"""
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    A = random_affine(rng)
+    vectors = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(50)]
+    out = A @ geom.VectorArray(vectors)
+    assert np.allclose(out.array, [list(A @ v) for v in vectors])
+    circles = geom.CircleArray.from_arrays(vectors, 2)
+    S = geom.Affine.rotation(0.5) @ geom.Affine.scaling(2)
+    moved = S @ circles
+    assert np.allclose(moved.centers.array, (S @ circles.centers).array)
+    assert np.allclose(moved.radii, 4)
+    with pytest.raises(ValueError):
+        A @ circles
+    with pytest.raises(ValueError):
+        A @ geom.VectorArray([[1, 2, 3]])
+
+def test_equality():
+    """Test equality, hashing, pickling and errors"""
+    A = geom.Affine(1, 2, 3, 4, 5, 6)
+    assert A == geom.Affine(1, 2, 3, 4, 5, 6)
+    assert hash(A) == hash(geom.Affine(1, 2, 3, 4, 5, 6))
+    assert A != geom.Affine.identity()
+    assert pickle.loads(pickle.dumps(A)) == A
+    assert A.determinant == -3
+    with pytest.raises(TypeError):
+        geom.Affine(1, "2")
+    with pytest.raises(TypeError):
+        geom.Affine.rotation("1")
+    with pytest.raises(ValueError):
+        geom.Affine.translation((1, 2, 3))
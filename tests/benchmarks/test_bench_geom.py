@@ -0,0 +1,68 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+SCRIPT = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                      'benchmarks', 'bench_geom.py')
+
+def bench(*args):
+    return subprocess.run([sys.executable, SCRIPT, '--quick', *args],
+                          capture_output=True, text=True)
+
+def test_save_and_compare(tmp_path):
+    """Test that saved results can be compared against as a baseline"""
+    path = str(tmp_path / 'baseline.json')
+    result = bench('--filter', 'Circle()', '--save', path)
+    assert result.returncode == 0
+    with open(path) as fp:
+        saved = json.load(fp)['results']
+    assert list(saved) == ['Circle()']
+    assert saved['Circle()']['ops_per_sec'] > 0
+
+    result = bench('--filter', 'Circle()', '--baseline', path,
+                   '--tolerance', '0.9')
+    assert result.returncode == 0
+    assert 'change' in result.stdout
+
+def test_regression_fails(tmp_path):
+    """Test that a regression against the baseline exits with an error"""
+    path = str(tmp_path / 'baseline.json')
+    with open(path, 'w') as fp:
+        json.dump({'results': {'Circle()': {'ops_per_sec': 1e12,
+                                            'alloc_bytes': 0}}}, fp)
+    result = bench('--filter', 'Circle()', '--baseline', path)
+    assert result.returncode == 1
+    assert 'REGRESSIONS' in result.stderr
+
+def load_script():
+    spec = importlib.util.spec_from_file_location('bench_geom', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_noisy_baseline():
+    """Test that noisy measurements widen the allowed slowdown"""
+    module = load_script()
+    baseline = {'a': {'ops_per_sec': 100}, 'b': {'ops_per_sec': 100,
+                                                   'spread': 0.2}}
+    results = {'a': {'ops_per_sec': 60, 'spread': 0.01},
+               'b': {'ops_per_sec': 60, 'spread': 0.01}}
+    assert module.compare(results, baseline, 0.25) == ['a']
+    results['b']['ops_per_sec'] = 40
+    assert module.compare(results, baseline, 0.25) == ['a', 'b']
+
+def test_quick_number(monkeypatch):
+    """Test that quick runs time a fixed number of calls"""
+    module = load_script()
+    calls = 0
+
+    def func():
+        nonlocal calls
+        calls += 1
+    monkeypatch.setattr(timeit.Timer, 'autorange', None)
+    ops_per_sec, spread = module.measure(func, number=module.QUICK_NUMBER)
+    assert calls == 3 * module.QUICK_NUMBER
+    assert ops_per_sec > 0 and spread >= 0
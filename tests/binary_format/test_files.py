@@ -0,0 +1,88 @@
+import geom
+import pytest
+from tests import helpers
+
+np = pytest.importorskip("numpy")
+
+def random_circles(n, seed):
+    return helpers.random_circles(n, seed, -10, 10, max_radius=3)
+
+def test_vectors_round_trip(tmp_path):
+    """Test that saved vectors load back unchanged as a memory map"""
+    path = tmp_path / "vectors.geom"
+    vectors = [geom.Vector([i, i/3, -i]) for i in range(100)]
+    geom.save_vectors(path, vectors)
+    loaded = geom.load_vectors(path)
+    assert isinstance(loaded.array, np.memmap)
+    assert loaded.to_vectors() == vectors
+    assert path.stat().st_size == 64 + 100 * 3 * 8
+
+def test_circles_round_trip(tmp_path):
+    """Test that saved circles load back unchanged as a memory map"""
+    path = tmp_path / "circles.geom"
+    circles = random_circles(50, 1)
+    geom.save_circles(path, geom.CircleArray(circles))
+    loaded = geom.load_circles(path)
+    assert isinstance(loaded.radii, np.memmap)
+    assert [(c.center, c.radius) for c in loaded.to_circles()] == \
+           [(c.center, c.radius) for c in circles]
+
+def test_float32(tmp_path):
+    """Test that vectors can be stored as single precision floats"""
+    path = tmp_path / "vectors.geom"
+    geom.save_vectors(path, [[1, 2], [3.5, 4]], dtype='f4')
+    loaded = geom.load_vectors(path)
+    assert loaded.array.dtype == np.float32
+    assert loaded.array.tolist() == [[1, 2], [3.5, 4]]
+    with pytest.raises(ValueError):
+        geom.save_vectors(path, [[1, 2]], dtype='i4')
+
+def test_byte_order(tmp_path):
+    """Test that floats of any byte order are stored little-endian"""
+    path = tmp_path / "vectors.geom"
+    for dtype in ('>f8', '=f8', '>f4', np.float32):
+        geom.save_vectors(path, [[1, 2], [3.5, 4]], dtype=dtype)
+        loaded = geom.load_vectors(path)
+        assert loaded.array.dtype.itemsize == np.dtype(dtype).itemsize
+        assert loaded.array.tolist() == [[1, 2], [3.5, 4]]
+    with pytest.raises(ValueError):
+        geom.save_vectors(path, [[1, 2]], dtype='>i8')
+
+def test_modes(tmp_path):
+    """Test that read-write maps change the file and read-only maps can't"""
+    path = tmp_path / "vectors.geom"
+    geom.save_vectors(path, [[1, 2], [3, 4]])
+    with pytest.raises(ValueError):
+        geom.load_vectors(path)[0] = [0, 0]
+    copy = geom.load_vectors(path, 'c')
+    copy += [1, 1]
+    assert geom.load_vectors(path).array.tolist() == [[1, 2], [3, 4]]
+    writable = geom.load_vectors(path, 'r+')
+    writable += [1, 1]
+    writable.array.flush()
+    assert geom.load_vectors(path).array.tolist() == [[2, 3], [4, 5]]
+
+def test_empty(tmp_path):
+    """Test that empty collections round trip"""
+    path = tmp_path / "circles.geom"
+    geom.save_circles(path, [])
+    assert len(geom.load_circles(path)) == 0
+
+def test_bad_files(tmp_path):
+    """Test that files of the wrong kind, version or size are rejected"""
+    path = tmp_path / "vectors.geom"
+    geom.save_vectors(path, [[1, 2], [3, 4]])
+    with pytest.raises(ValueError):
+        geom.load_circles(path)
+    with pytest.raises(ValueError):
+        geom.load_vectors(path, 'w')
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])
+    with pytest.raises(ValueError):
+        geom.load_vectors(path)
+    path.write_bytes(data[:4] + b'\x09\x00' + data[6:])
+    with pytest.raises(ValueError):
+        geom.load_vectors(path)
+    path.write_bytes(b'not a geom file' * 10)
+    with pytest.raises(ValueError):
+        geom.load_vectors(path)
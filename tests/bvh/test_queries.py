@@ -0,0 +1,71 @@
+import geom
+import pytest
+import random
+from tests.helpers import brute_force_pairs
+
+def skewed_circles(n, seed):
+    """Circles whose radii span four orders of magnitude"""
+    rng = random.Random(seed)
+    return [geom.Circle((rng.uniform(0, 500), rng.uniform(0, 500)),
+                        10**rng.uniform(-2, 2)) for _ in range(n)]
+
+def test_self_pairs():
+    """Test that self pairs match brute force Circle.intersects"""
+    circles = skewed_circles(200, 1)
+    for leaf_size in (2, 8, 64):
+        tree = geom.BVH(circles, leaf_size=leaf_size)
+        assert tree.pairs() == brute_force_pairs(circles)
+
+def test_tree_pairs():
+    """Test that pairs between two trees match brute force"""
+    A = skewed_circles(120, 2)
+    B = skewed_circles(80, 3)
+    assert geom.BVH(A).pairs(geom.BVH(B)) == brute_force_pairs(A, B)
+
+def test_query_point():
+    """Test that point queries match brute force Circle.intersects"""
+    circles = skewed_circles(200, 4)
+    tree = geom.BVH(circles)
+    rng = random.Random(5)
+    for _ in range(100):
+        p = (rng.uniform(0, 500), rng.uniform(0, 500))
+        expected = [i for i, c in enumerate(circles) if c.intersects(p)]
+        assert tree.query_point(p) == expected
+
+def test_query_circle():
+    """Test that circle queries match brute force Circle.intersects"""
+    circles = skewed_circles(200, 6)
+    tree = geom.BVH(circles)
+    for other in skewed_circles(50, 7):
+        expected = [i for i, c in enumerate(circles) if c.intersects(other)]
+        assert tree.query_circle(other) == expected
+
+def test_query_rect():
+    """Test that rectangle queries find circles overlapping the rectangle"""
+    circles = [geom.Circle((0, 0), 1), geom.Circle((5, 5), 1),
+               geom.Circle((3, 0), 0.5), geom.Circle((10, 10), 20)]
+    tree = geom.BVH(circles, leaf_size=2)
+    assert tree.query_rect((1, -1), (2, 1)) == [0, 3]
+    assert tree.query_rect((1.8, 1.8), (3, 3)) == [3]
+    assert tree.query_rect((-10, -10), (-1, 10)) == [0, 3]
+
+def test_empty():
+    """Test that an empty tree finds nothing"""
+    tree = geom.BVH([])
+    assert len(tree) == 0
+    assert tree.pairs() == []
+    assert tree.query_point((0, 0)) == []
+
+def test_errors():
+    """Test that invalid arguments raise errors"""
+    with pytest.raises(ValueError):
+        geom.BVH([], leaf_size=1)
+    with pytest.raises(TypeError):
+        geom.BVH([(0, 0)])
+    tree = geom.BVH(skewed_circles(10, 8))
+    with pytest.raises(TypeError):
+        tree.pairs([])
+    with pytest.raises(ValueError):
+        tree.query_rect((1, 1), (0, 0))
+    with pytest.raises(TypeError):
+        tree.query_circle((0, 0))
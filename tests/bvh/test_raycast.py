@@ -0,0 +1,114 @@
+import geom
+import math
+import pytest
+import random
+from tests import helpers
+
+def random_circles(n, seed):
+    return helpers.random_circles(n, seed, -50, 50, max_radius=3)
+
+def random_rays(n, seed):
+    rng = random.Random(seed)
+    origins, directions = [], []
+    for _ in range(n):
+        angle = rng.uniform(0, 2*math.pi)
+        origins.append((rng.uniform(-60, 60), rng.uniform(-60, 60)))
+        directions.append((math.cos(angle), math.sin(angle)))
+    return origins, directions
+
+def brute_force_hit(circles, origin, direction, max_distance):
+    best = None
+    for i, c in enumerate(circles):
+        t = geom._ray_circle(*origin, *direction, *c.center, c.radius)
+        if t is not None and t <= max_distance and (best is None or
+                                                    t < best[0]):
+            best = (t, i)
+    return best
+
+def test_raycast():
+    """Test that raycasts hit the same circle as brute force"""
+    circles = random_circles(300, 1)
+    tree = geom.BVH(circles, leaf_size=4)
+    origins, directions = random_rays(300, 2)
+    for origin, direction, max_distance in zip(origins, directions,
+                                               [math.inf, 10, 30]*100):
+        expected = brute_force_hit(circles, origin, direction, max_distance)
+        hit = tree.raycast(origin, direction, max_distance)
+        any_hit = tree.raycast(origin, direction, max_distance, any_hit=True)
+        if expected is None:
+            assert hit is None and any_hit is None
+            continue
+        assert hit.distance == pytest.approx(expected[0])
+        assert hit.index == expected[1]
+        assert any_hit is not None
+
+def test_raycast_normal():
+    """Test the distance and normal of simple hits"""
+    tree = geom.BVH([geom.Circle((5, 0), 1), geom.Circle((0, 5), 2)])
+    hit = tree.raycast((0, 0), (2, 0))
+    assert hit.distance == pytest.approx(2)
+    assert hit.index == 0
+    assert list(hit.normal) == pytest.approx([-1, 0])
+    hit = tree.raycast((0, 5), (1, 0))
+    assert hit.distance == 0 and hit.index == 1
+    assert list(hit.normal) == pytest.approx([-1, 0])
+
+def test_segments():
+    """Test that a max distance of 1 casts a segment"""
+    tree = geom.BVH([geom.Circle((5, 0), 1)])
+    assert tree.raycast((0, 0), (3, 0), 1) is None
+    assert tree.raycast((0, 0), (4, 0), 1).distance == pytest.approx(1)
+    assert tree.raycast((0, 0), (0, 10), 1) is None
+
+def test_raycast_errors():
+    """Test invalid rays"""
+    tree = geom.BVH([geom.Circle((5, 0), 1)])
+    with pytest.raises(ValueError):
+        tree.raycast((0, 0), (0, 0))
+    with pytest.raises(ValueError):
+        tree.raycast((0, 0, 0), (1, 0))
+    with pytest.raises(ValueError):
+        tree.raycast((0, 0), (1, 0), -1)
+    with pytest.raises(TypeError):
+        tree.raycast((0, 0), (1, 0), "far")
+    assert geom.BVH([]).raycast((0, 0), (1, 0)) is None
+
+def test_cast_rays():
+    """Test that batched casts match single raycasts"""
+    np = pytest.importorskip("numpy")
+    circles = random_circles(300, 3)
+    tree = geom.BVH(circles)
+    origins, directions = random_rays(500, 4)
+    limits = np.array([math.inf, 10, 30]*166 + [0, 1])
+    hits = geom.cast_rays(geom.VectorArray(origins), directions, circles,
+                          limits)
+    any_hits = geom.cast_rays(origins, directions, tree, limits,
+                              any_hit=True)
+    for k, (origin, direction) in enumerate(zip(origins, directions)):
+        hit = tree.raycast(origin, direction, limits[k])
+        if hit is None:
+            assert hits.index[k] == -1 and any_hits.index[k] == -1
+            assert hits.distance[k] == math.inf
+            assert np.isnan(hits.normal.array[k]).all()
+            continue
+        assert hits.index[k] == hit.index
+        assert hits.distance[k] == pytest.approx(hit.distance)
+        assert list(hits.normal[k]) == pytest.approx(list(hit.normal))
+        assert any_hits.index[k] >= 0
+
+def test_cast_rays_errors():
+    """Test invalid batched casts"""
+    pytest.importorskip("numpy")
+    circles = [geom.Circle((5, 0), 1)]
+    assert geom.cast_rays([], [], circles).index.shape == (0,)
+    assert list(geom.cast_rays([(0, 0)], [(1, 0)], []).index) == [-1]
+    with pytest.raises(ValueError):
+        geom.cast_rays([(0, 0)], [(1, 0), (0, 1)], circles)
+    with pytest.raises(ValueError):
+        geom.cast_rays([(0, 0)], [(0, 0)], circles)
+    with pytest.raises(ValueError):
+        geom.cast_rays([(0, 0)], [(1, 0)], circles, [1, 2])
+    with pytest.raises(ValueError):
+        geom.cast_rays([(0, 0)], [(1, 0)], circles, -1)
+    with pytest.raises(TypeError):
+        geom.cast_rays([(0, 0)], [(1, 0)], circles, "far")
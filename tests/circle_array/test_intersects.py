@@ -0,0 +1,50 @@
+import geom
+import pytest
+from tests import helpers
+
+np = pytest.importorskip("numpy")
+
+def random_circles(n, seed):
+    return helpers.random_circles(n, seed, -10, 10, max_radius=3)
+
+def test_point():
+    """Test that intersecting a point matches Circle.intersects"""
+    circles = random_circles(50, 1)
+    a = geom.CircleArray(circles)
+    for p in ((0, 0), geom.Vector([3.5, -2]), [9.0, 9.0]):
+        assert a.intersects(p).tolist() == [c.intersects(p) for c in circles]
+
+def test_circle():
+    """Test that intersecting a circle matches Circle.intersects"""
+    circles = random_circles(50, 2)
+    a = geom.CircleArray(circles)
+    for other in random_circles(5, 3):
+        expected = [c.intersects(other) for c in circles]
+        assert a.intersects(other).tolist() == expected
+
+def test_tangent_circles():
+    """Test that touching circles intersect"""
+    a = geom.CircleArray([geom.Circle((0, 0), 1)])
+    assert a.intersects(geom.Circle((3, 0), 2)).tolist() == [True]
+    assert a.intersects((1, 0)).tolist() == [True]
+
+def test_pairwise():
+    """Test that intersecting arrays gives every pair"""
+    circles = random_circles(20, 4)
+    others = random_circles(30, 5)
+    points = [(c.center.x, c.center.y) for c in others]
+    a = geom.CircleArray(circles)
+    result = a.intersects(geom.CircleArray(others))
+    assert result.shape == (20, 30)
+    assert result.tolist() == [[c.intersects(o) for o in others]
+                               for c in circles]
+    result = a.intersects(geom.VectorArray(points))
+    assert result.tolist() == [[c.intersects(p) for p in points]
+                               for c in circles]
+
+def test_undefined():
+    """Test that intersecting a non-geometric object raises TypeError"""
+    a = geom.CircleArray(random_circles(3, 6))
+    for bad in ('ab', 3, None, (1, 2, 3)):
+        with pytest.raises(TypeError):
+            a.intersects(bad)
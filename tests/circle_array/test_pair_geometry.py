@@ -0,0 +1,78 @@
+import geom
+import math
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+
+def random_arrays(n, seed):
+    rng = np.random.default_rng(seed)
+    return [geom.CircleArray.from_arrays(rng.uniform(-3, 3, (n, 2)),
+                                         rng.uniform(0, 3, n))
+            for _ in range(2)]
+
+def test_points_on_both_circles():
+    """Test that intersection points lie on both circles of each pair"""
+    a, b = random_arrays(500, 1)
+    points, counts = a.intersection_points(b)
+    assert points.shape == (500, 2, 2) and set(counts) <= {0, 1, 2}
+    assert 2 in counts and 0 in counts
+    for k, (p, n) in enumerate(zip(points, counts)):
+        assert np.isnan(p[n:]).all()
+        for c in (a[k], b[k]):
+            for q in p[:n]:
+                assert math.dist(q, c.center) == pytest.approx(c.radius)
+        crossing = n == 2
+        assert crossing == (a.penetration_depth(b)[k] > 0 and
+                            a.overlap_area(b)[k] < math.pi *
+                            min(a[k].radius, b[k].radius)**2)
+
+def test_special_cases():
+    """Test tangency, containment and coincidence within EPSILON"""
+    a = geom.CircleArray.from_arrays([[0, 0]] * 5, [1, 1, 2, 1, 1])
+    b = geom.CircleArray.from_arrays(
+        [[2 + geom.EPSILON/2, 0], [0.5, 0], [0, 1], [0, 0], [0, 3]],
+        [1, 0.5, 1, 1, 1])
+    points, counts = a.intersection_points(b)
+    assert counts.tolist() == [1, 1, 1, 0, 0]
+    assert points[:3, 0].tolist() == [[1, 0], [1, 0], [0, 2]]
+    assert a.overlap_area(b).tolist() == [0, math.pi/4, math.pi, math.pi, 0]
+    assert a.penetration_depth(b) == pytest.approx([0, 1, 2, 2, 0])
+
+def test_lens_area():
+    """Test the lens area of two crossing unit circles"""
+    a = geom.CircleArray([geom.Circle((0, 0), 1)])
+    area = a.overlap_area(geom.Circle((1, 0), 1))
+    assert area[0] == pytest.approx(2*math.pi/3 - math.sqrt(3)/2)
+    points, counts = a.intersection_points(geom.Circle((1, 0), 1))
+    assert counts[0] == 2
+    assert points[0].ravel().tolist() == pytest.approx(
+        [0.5, math.sqrt(3)/2, 0.5, -math.sqrt(3)/2])
+
+def test_index_pairs():
+    """Test that index pairs from a broad phase select the circles"""
+    circles = [geom.Circle((random.Random(i).uniform(0, 10), 0), 1)
+               for i in range(30)]
+    a = geom.CircleArray(circles)
+    pairs = geom.SpatialHash(circles).intersecting_pairs()
+    depth = a.penetration_depth(pairs=pairs)
+    assert depth.tolist() == pytest.approx(
+        [2 - abs(circles[i].center.x - circles[j].center.x)
+         for i, j in pairs])
+    left = a[[i for i, _ in pairs]]
+    right = a[[j for _, j in pairs]]
+    assert a.overlap_area(pairs=pairs).tolist() == \
+           left.overlap_area(right).tolist()
+    assert a.intersection_points(pairs=[])[0].shape == (0, 2, 2)
+
+def test_errors():
+    """Test that bad pairs of circles raise errors"""
+    a, b = random_arrays(5, 2)
+    with pytest.raises(ValueError):
+        a.overlap_area()
+    with pytest.raises(ValueError):
+        a.overlap_area(b[:3])
+    with pytest.raises(TypeError):
+        a.penetration_depth((1, 2))
+    with pytest.raises(IndexError):
+        a.intersection_points(pairs=[(0, 5)])
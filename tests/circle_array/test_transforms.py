@@ -0,0 +1,66 @@
+import geom
+import pytest
+import math
+
+np = pytest.importorskip("numpy")
+
+def circles():
+    return [geom.Circle((0, 0), 1), geom.Circle((-2, 5), 0.5),
+            geom.Circle((3.5, 1), 4)]
+
+def assert_same(carr, expected):
+    assert len(carr) == len(expected)
+    for c, e in zip(carr, expected):
+        assert (c.center - e.center).magSq() < geom.EPSILON
+        assert abs(c.radius - e.radius) < geom.EPSILON
+
+def test_from_arrays():
+    """Test that circle arrays can be built from centers and radii"""
+    a = geom.CircleArray.from_arrays([(0, 0), (-2, 5), (3.5, 1)],
+                                     [1, 0.5, 4])
+    assert_same(a, circles())
+    a = geom.CircleArray.from_arrays(geom.VectorArray([(1, 1), (2, 2)]), 3)
+    assert a.radii.tolist() == [3, 3]
+    with pytest.raises(ValueError):
+        geom.CircleArray.from_arrays([(0, 0)], [-1])
+    with pytest.raises(ValueError):
+        geom.CircleArray.from_arrays([(0, 0, 0)], [1])
+    with pytest.raises(ValueError):
+        geom.CircleArray.from_arrays([(0, 0), (1, 1)], [1, 2, 3])
+
+def test_moved():
+    """Test that moving in bulk matches moving each circle"""
+    a = geom.CircleArray(circles())
+    assert_same(a.moved_by((1, -1)), [c.moved_by((1, -1)) for c in circles()])
+    assert_same(a.moved_to((4, 4)), [c.moved_to((4, 4)) for c in circles()])
+    steps = geom.VectorArray([(1, 0), (0, 1), (-1, -1)])
+    assert_same(a.moved_by(steps),
+                [c.moved_by(s) for c, s in zip(circles(), steps)])
+    with pytest.raises(TypeError):
+        a.moved_by(3)
+    with pytest.raises(ValueError):
+        a.moved_to((1, 2, 3))
+
+def test_scaled():
+    """Test that scaling in bulk matches scaling each circle"""
+    a = geom.CircleArray(circles())
+    for attr in ('radius', 'area', 'circumference'):
+        assert_same(a.scaled_to(2, attr),
+                    [c.scaled_to(2, attr) for c in circles()])
+    for attr in ('radius', 'area'):
+        assert_same(a.scaled_by(3, attr),
+                    [c.scaled_by(3, attr) for c in circles()])
+    assert_same(a.scaled_by([1, 2, 3]),
+                [c.scaled_by(m) for c, m in zip(circles(), (1, 2, 3))])
+    with pytest.raises(ValueError):
+        a.scaled_by(-1)
+    with pytest.raises(ValueError):
+        a.scaled_by(2, 'circumference')
+    with pytest.raises(TypeError):
+        a.scaled_to(True)
+
+def test_scaled_leaves_original():
+    """Test that scaling returns a copy"""
+    a = geom.CircleArray(circles())
+    a.scaled_by(2).radii[:] = 0
+    assert a.radii.tolist() == [1, 0.5, 4]
@@ -0,0 +1,89 @@
+import geom
+import itertools
+import math
+import pytest
+import random
+
+def random_points(n, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(-5, 5), rng.uniform(-2, 2)) for _ in range(n)]
+
+def brute_force_radius(points):
+    candidates = [((a[0] + b[0])/2, (a[1] + b[1])/2, math.dist(a, b)/2)
+                  for a, b in itertools.combinations(points, 2)]
+    candidates += [geom._circumcircle(*a, *b, *c)
+                   for a, b, c in itertools.combinations(points, 3)]
+    return min(r for x, y, r in candidates
+               if all(math.dist((x, y), p) <= r + 1e-9 for p in points))
+
+def test_smallest():
+    """Test that the enclosing circle is the smallest containing the points"""
+    for seed in range(30):
+        points = random_points(random.Random(seed).randint(2, 10), seed)
+        circle = geom.Circle.enclosing(points)
+        assert circle.radius == pytest.approx(brute_force_radius(points))
+        assert all(circle.intersects(p) for p in points)
+
+def test_degenerate():
+    """Test single, repeated and collinear points"""
+    assert geom.Circle.enclosing([(1, 2)]).radius == 0
+    assert geom.Circle.enclosing([(1, 2)] * 5).center == [1, 2]
+    circle = geom.Circle.enclosing([(0, 0), (1, 0), (4, 0), (2, 0)])
+    assert circle.center == [2, 0] and circle.radius == 2
+    assert geom.Circle.enclosing([geom.Vector([0, 1]),
+                                  geom.Vector([0, -1])]).radius == 1
+
+def test_many_points():
+    """Test that large inputs don't recurse and every point is contained"""
+    points = random_points(20000, 1)
+    circle = geom.Circle.enclosing(points)
+    assert all(circle.intersects(p) for p in points)
+    hull = geom._convex_hull(points)
+    assert circle.radius == pytest.approx(geom.Circle.enclosing(hull).radius)
+
+def test_arrays():
+    """Test that vector arrays and numpy arrays can be enclosed"""
+    np = pytest.importorskip("numpy")
+    points = random_points(500, 2)
+    expected = geom.Circle.enclosing(points).radius
+    assert geom.Circle.enclosing(np.array(points)).radius == \
+           pytest.approx(expected)
+    assert geom.Circle.enclosing(geom.VectorArray(points)).radius == \
+           pytest.approx(expected)
+
+def test_incremental():
+    """Test that the incremental circle matches enclosing all points"""
+    points = random_points(3000, 3)
+    builder = geom.EnclosingCircle()
+    assert builder.circle is None
+    for start in range(0, 3000, 250):
+        builder.extend(points[start:start+250])
+        expected = geom.Circle.enclosing(points[:start+250])
+        assert builder.circle.radius == pytest.approx(expected.radius)
+    builder.add((100, 0))
+    assert builder.circle.intersects((100, 0))
+    assert all(builder.circle.intersects(p) for p in points)
+    assert len(builder) < 100 + geom._ENCLOSING_BATCH
+
+def test_ring():
+    """Test a stream where every point stays on the hull"""
+    n = 2000
+    points = [(math.cos(2*math.pi*k/n), math.sin(2*math.pi*k/n))
+              for k in range(n)]
+    random.Random(4).shuffle(points)
+    builder = geom.EnclosingCircle()
+    for start in range(0, n, 10):
+        builder.extend(points[start:start+10])
+    assert builder.circle.radius == pytest.approx(1)
+    assert len(builder) <= n
+
+def test_errors():
+    """Test that bad points raise errors"""
+    with pytest.raises(ValueError):
+        geom.Circle.enclosing([])
+    with pytest.raises(ValueError):
+        geom.Circle.enclosing([(1, 2, 3)])
+    with pytest.raises(TypeError):
+        geom.Circle.enclosing(['ab'])
+    with pytest.raises(TypeError):
+        geom.EnclosingCircle().add('ab')
@@ -0,0 +1,24 @@
+"""Random inputs and brute-force oracles shared by the tests."""
+import geom
+import random
+
+def random_circles(n, seed, low=-20, high=20, max_radius=2):
+    """Circles centered in the square from `low` to `high`"""
+    rng = random.Random(seed)
+    return [geom.Circle((rng.uniform(low, high), rng.uniform(low, high)),
+                        rng.uniform(0, max_radius)) for _ in range(n)]
+
+def random_points(n, seed, low=-20, high=20):
+    """Points in the square from `low` to `high`"""
+    rng = random.Random(seed)
+    return [(rng.uniform(low, high), rng.uniform(low, high))
+            for _ in range(n)]
+
+def brute_force_pairs(A, B=None):
+    """The intersecting pairs of `A`, or of `A` and `B`, by Circle.intersects
+    """
+    if B is None:
+        return [(i, j) for i in range(len(A)) for j in range(i+1, len(A))
+                if A[i].intersects(A[j])]
+    return [(i, j) for i in range(len(A)) for j in range(len(B))
+            if A[i].intersects(B[j])]
@@ -0,0 +1,101 @@
+import geom
+import json
+import os
+import pytest
+import subprocess
+import sys
+
+@pytest.fixture
+def instrumented():
+    geom.reset_instrumentation()
+    geom.enable_instrumentation()
+    try:
+        yield
+    finally:
+        geom.disable_instrumentation()
+        geom.reset_instrumentation()
+
+def test_counts_creations(instrumented):
+    """Test that created vectors and circles are counted"""
+    a = geom.Vector([1, 2])
+    a + (1, 1)
+    geom.Vector3(1, 2, 3) * 2
+    geom.FrozenVector([1, 2])
+    geom.Circle((0, 0), 1).moved_by((1, 1))
+    counters = geom.instrumentation_snapshot()['counters']
+    assert counters['Vector.created'] == 4
+    assert counters['Vector3.created'] == 2
+    assert counters['FrozenVector.created'] == 1
+    assert counters['Circle.created'] == 2
+    assert counters['is_numeric'] > 0
+
+def test_lazy_vectors(instrumented):
+    """Test that lazy vectors are counted and timed"""
+    lazy = geom.LazyVector([1, 2, 3])
+    lazy = lazy + geom.Vector([1, 2, 3]).lazy()
+    assert lazy == [2, 4, 6]
+    snapshot = geom.instrumentation_snapshot()
+    assert snapshot['counters']['LazyVector.created'] == 3
+    assert 'LazyVector.__add__' in snapshot['timings']
+
+def test_times_operations(instrumented):
+    """Test that each operation gets a count and a timing histogram"""
+    a = geom.Vector([3, 4])
+    for _ in range(5):
+        a - (1, 1)
+    timing = geom.instrumentation_snapshot()['timings']['Vector.__sub__']
+    assert timing['count'] == 5
+    assert sum(timing['histogram'].values()) == 5
+    assert timing['min_ns'] <= timing['max_ns'] <= timing['total_ns']
+
+def test_call_sites(instrumented):
+    """Test that Circle.intersects is timed separately per call site"""
+    c = geom.Circle((0, 0), 1)
+    c.intersects((0, 0))
+    c.intersects((5, 5))
+    timings = geom.instrumentation_snapshot()['timings']
+    sites = [name for name in timings if name.startswith('Circle.intersects@')]
+    assert len(sites) == 2
+    assert all(__file__ in site for site in sites)
+    assert timings['Circle.intersects']['count'] == 2
+
+def test_snapshot_and_reset(instrumented):
+    """Test that snapshots are plain JSON-compatible copies"""
+    geom.Vector([1]) + (1,)
+    snapshot = geom.instrumentation_snapshot()
+    assert json.loads(geom.instrumentation_json()) == snapshot
+    geom.reset_instrumentation()
+    assert geom.instrumentation_snapshot() == {'counters': {}, 'timings': {}}
+    assert snapshot['counters']['Vector.__add__'] == 1
+
+def test_disabled_restores_methods():
+    """Test that disabled instrumentation leaves the original methods"""
+    originals = (geom.Vector.__add__, geom.Circle.intersects,
+                 geom.is_numeric, geom.Vector.__dict__['_from_trusted'])
+    geom.enable_instrumentation()
+    assert geom.instrumentation_enabled()
+    assert geom.Vector.__add__ is not originals[0]
+    geom.disable_instrumentation()
+    assert not geom.instrumentation_enabled()
+    assert (geom.Vector.__add__, geom.Circle.intersects, geom.is_numeric,
+            geom.Vector.__dict__['_from_trusted']) == originals
+    geom.reset_instrumentation()
+
+def test_results_unchanged(instrumented):
+    """Test that instrumented operations give the same results"""
+    a = geom.Vector([1.5, 2, -3])
+    assert a * (1, 2, 3) == geom.Vector([12, -7.5, 1])
+    with pytest.raises(TypeError):
+        a + ('1', 2, 3)
+    assert geom.Circle((0, 0), 1).intersects(geom.Circle((2, 0), 1))
+
+def test_environment_variable():
+    """Test that GEOM_INSTRUMENT turns instrumentation on at import"""
+    root = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)
+    env = dict(os.environ, GEOM_INSTRUMENT='1', PYTHONPATH=root)
+    code = ("import geom; geom.Vector([1]); "
+            "print(geom.instrumentation_snapshot()['counters']"
+            "['Vector.created'])")
+    result = subprocess.run([sys.executable, '-c', code], env=env,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == '1'
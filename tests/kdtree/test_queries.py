@@ -0,0 +1,77 @@
+import geom
+import pytest
+import random
+
+def random_vectors(n, dim, seed):
+    rng = random.Random(seed)
+    return [geom.Vector([rng.uniform(-10, 10) for _ in range(dim)])
+            for _ in range(n)]
+
+@pytest.mark.parametrize("dim", (1, 2, 3, 5))
+def test_nearest(dim):
+    """Test that k-nearest queries match a linear scan"""
+    points = random_vectors(500, dim, dim)
+    tree = geom.KDTree(points)
+    assert tree.dim == dim
+    for q in random_vectors(20, dim, dim + 100):
+        expected = sorted((abs(p - q), i) for i, p in enumerate(points))
+        assert tree.nearest(q) == expected[:1]
+        assert tree.nearest(q, k=7) == expected[:7]
+
+@pytest.mark.parametrize("dim", (1, 2, 3, 5))
+def test_radius(dim):
+    """Test that radius queries and counts match a linear scan"""
+    points = random_vectors(500, dim, dim)
+    tree = geom.KDTree(points, leaf_size=4)
+    rng = random.Random(dim)
+    for q in random_vectors(20, dim, dim + 200):
+        r = rng.uniform(0, 8)
+        expected = [i for i, p in enumerate(points) if abs(p - q) <= r]
+        assert tree.query_radius(q, r) == expected
+        assert tree.count_radius(q, r) == len(expected)
+
+def test_batched():
+    """Test that batched queries match single queries"""
+    points = random_vectors(200, 3, 1)
+    queries = random_vectors(10, 3, 2)
+    tree = geom.KDTree(points)
+    assert tree.nearest_many(queries, k=3) == [tree.nearest(q, 3)
+                                               for q in queries]
+    assert tree.query_radius_many(queries, 4) == [tree.query_radius(q, 4)
+                                                  for q in queries]
+    assert tree.count_radius_many(queries, 4) == [tree.count_radius(q, 4)
+                                                  for q in queries]
+
+def test_duplicates():
+    """Test that duplicate points are all found"""
+    tree = geom.KDTree([(0, 0)]*10 + [(1, 1)], leaf_size=2)
+    assert tree.nearest((0, 0), k=3) == [(0, 0), (0, 1), (0, 2)]
+    assert tree.query_radius((0, 0), 0) == list(range(10))
+    assert tree.count_radius((0, 0), 2) == 11
+    assert tree.nearest((5, 5)) == [(abs(geom.Vector([4, 4])), 10)]
+
+def test_array_input():
+    """Test that a tree can be built from a VectorArray or numpy array"""
+    np = pytest.importorskip("numpy")
+    points = random_vectors(100, 2, 3)
+    expected = geom.KDTree(points).nearest((0, 0), k=5)
+    assert geom.KDTree(geom.VectorArray(points)).nearest((0, 0), 5) == expected
+    array = np.array([list(p) for p in points])
+    assert geom.KDTree(array).nearest((0, 0), 5) == expected
+
+def test_errors():
+    """Test that invalid arguments raise errors"""
+    with pytest.raises(ValueError):
+        geom.KDTree([(1, 2), (1, 2, 3)])
+    with pytest.raises(TypeError):
+        geom.KDTree([('1', 2)])
+    tree = geom.KDTree([(1, 2), (3, 4)])
+    with pytest.raises(ValueError):
+        tree.nearest((1, 2, 3))
+    with pytest.raises(ValueError):
+        tree.nearest((1, 2), k=0)
+    with pytest.raises(ValueError):
+        tree.query_radius((1, 2), -1)
+    with pytest.raises(TypeError):
+        tree.count_radius('ab', 1)
+    assert geom.KDTree([]).nearest((1, 2)) == []
@@ -0,0 +1,87 @@
+import geom
+import pytest
+from tests.helpers import brute_force_pairs, random_circles, random_points
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture(scope="module")
+def engine():
+    with geom.ParallelEngine(workers=2, chunk_size=40) as engine:
+        yield engine
+
+def test_point_pairs(engine):
+    """Test that point pairs match brute force Circle.intersects"""
+    circles = random_circles(200, 1)
+    points = random_points(300, 2)
+    points += [(c.center.x + c.radius, c.center.y) for c in circles[:10]]
+    expected = [(i, j) for i, c in enumerate(circles)
+                for j, p in enumerate(points) if c.intersects(p)]
+    assert engine.point_pairs(circles, points) == expected
+    assert engine.point_pairs(geom.CircleArray(circles),
+                              geom.VectorArray(points)) == expected
+
+def test_circle_pairs(engine):
+    """Test that circle pairs match brute force Circle.intersects"""
+    circles = random_circles(200, 3)
+    others = random_circles(50, 4)
+    assert engine.circle_pairs(circles, others) == \
+        brute_force_pairs(circles, others)
+    assert engine.circle_pairs(circles) == geom.BVH(circles).pairs()
+
+def test_deterministic():
+    """Test that the worker and chunk counts don't change the results"""
+    circles = random_circles(150, 5)
+    points = random_points(150, 6)
+    results = []
+    for workers, size in ((1, 1000), (1, 7), (3, 16)):
+        with geom.ParallelEngine(workers, size) as engine:
+            results.append((engine.point_pairs(circles, points),
+                            engine.circle_pairs(circles)))
+    assert results[0] == results[1] == results[2]
+
+def test_blocks(monkeypatch):
+    """Test that splitting the points into blocks doesn't change results"""
+    circles = random_circles(60, 10)
+    points = random_points(400, 11)
+    with geom.ParallelEngine(1, 16) as engine:
+        expected = (engine.point_pairs(circles, points),
+                    engine.circle_pairs(circles))
+        monkeypatch.setattr(geom, '_PARALLEL_BLOCK', 40)
+        assert (engine.point_pairs(circles, points),
+                engine.circle_pairs(circles)) == expected
+
+def test_shared_once(monkeypatch):
+    """Test that circles paired with themselves are shared only once"""
+    from multiprocessing import shared_memory
+    sizes = []
+
+    class Recorded(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name, create, size)
+            if create:
+                sizes.append(size)
+    monkeypatch.setattr(shared_memory, 'SharedMemory', Recorded)
+    circles = random_circles(100, 12)
+    with geom.ParallelEngine(1, 30) as engine:
+        assert engine.circle_pairs(circles) == geom.BVH(circles).pairs()
+    assert sizes == [100 * 3 * 8]
+
+def test_empty(engine):
+    """Test that empty batches give no pairs"""
+    assert engine.point_pairs([], random_points(5, 7)) == []
+    assert engine.circle_pairs(random_circles(5, 8), []) == []
+
+def test_errors(engine):
+    """Test that bad arguments raise errors"""
+    with pytest.raises(TypeError):
+        geom.ParallelEngine(workers=1.5)
+    with pytest.raises(TypeError):
+        geom.ParallelEngine(workers=True)
+    with pytest.raises(TypeError):
+        geom.ParallelEngine(chunk_size=False)
+    with pytest.raises(ValueError):
+        geom.ParallelEngine(chunk_size=0)
+    with pytest.raises(ValueError):
+        engine.point_pairs(random_circles(3, 9), [(1, 2, 3)])
+    with pytest.raises(TypeError):
+        engine.circle_pairs(5)
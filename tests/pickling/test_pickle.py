@@ -0,0 +1,59 @@
+import array
+import geom
+import pickle
+import pytest
+
+def test_vectors():
+    """Test that every kind of vector survives a pickle round trip"""
+    vectors = [geom.Vector([1, 2.5, -3]), geom.Vector2(1, 2),
+               geom.Vector3(1, 2, 3), geom.FrozenVector([4, 5]),
+               geom.Vector([1, 2], storage='array')]
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(vectors, protocol))
+        assert loaded == vectors
+        assert [type(v) for v in loaded] == [type(v) for v in vectors]
+    assert hash(pickle.loads(pickle.dumps(vectors[3]))) == hash(vectors[3])
+
+def test_vector_view():
+    """Test that a vector view pickles as an ordinary vector"""
+    data = array.array('d', [3, 4])
+    loaded = pickle.loads(pickle.dumps(geom.Vector.view(data)))
+    loaded.x = 0
+    assert loaded == [0, 4] and data[0] == 3
+
+def test_circles():
+    """Test that circles survive a pickle round trip"""
+    circles = [geom.Circle((1, 2), 3), geom.Circle((0.5, -1), 0)]
+    loaded = pickle.loads(pickle.dumps(circles))
+    assert [(c.center, c.radius) for c in loaded] == \
+           [(c.center, c.radius) for c in circles]
+    loaded[0].center.x = 7
+    assert circles[0].center.x == 1
+
+def test_vector_array_out_of_band():
+    """Test that vector arrays pass their buffer out-of-band"""
+    np = pytest.importorskip("numpy")
+    vectors = geom.VectorArray(np.arange(30.0).reshape(10, 3))
+    buffers = []
+    data = pickle.dumps(vectors, 5, buffer_callback=buffers.append)
+    assert len(buffers) == 1 and len(data) < 200
+    loaded = pickle.loads(data, buffers=buffers)
+    assert np.shares_memory(loaded.array, vectors.array)
+    copied = pickle.loads(pickle.dumps(vectors, 5))
+    copied += [1, 1, 1]
+    assert copied.array.tolist() == (vectors.array + 1).tolist()
+    for protocol in (2, 4):
+        loaded = pickle.loads(pickle.dumps(vectors[::3], protocol))
+        assert loaded.array.tolist() == vectors.array[::3].tolist()
+
+def test_circle_array_out_of_band():
+    """Test that circle arrays pass their buffers out-of-band"""
+    np = pytest.importorskip("numpy")
+    circles = geom.CircleArray.from_arrays([[1, 2], [3, 4]], [5, 6])
+    buffers = []
+    data = pickle.dumps(circles, 5, buffer_callback=buffers.append)
+    loaded = pickle.loads(data, buffers=buffers)
+    assert len(buffers) == 2
+    assert np.shares_memory(loaded.radii, circles.radii)
+    assert loaded.centers.array.tolist() == [[1, 2], [3, 4]]
+    assert pickle.loads(pickle.dumps(circles, 2)).radii.tolist() == [5, 6]
@@ -0,0 +1,111 @@
+import geom
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+
+def random_bodies(n, seed, side=30):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, side, (n, 2)), rng.uniform(0.2, 1.0, n)
+
+def overlap_count(sim):
+    circles = [geom.Circle(c.center, c.radius - 1e-9) for c in sim.circles]
+    return len(geom.BVH(circles).pairs())
+
+def test_candidates():
+    """Test that every intersecting pair is a candidate pair"""
+    for seed in range(5):
+        positions, radii = random_bodies(300, seed)
+        sim = geom.Simulation(positions, radii)
+        I, J = sim.candidate_pairs()
+        candidates = {(min(i, j), max(i, j)) for i, j in zip(I, J)}
+        assert len(candidates) == len(I)
+        exact = geom.BVH(list(sim.circles)).pairs()
+        assert set(exact) <= candidates
+
+def test_oversized():
+    """Test that a few huge bodies don't widen the grid for every body"""
+    positions, radii = random_bodies(2000, 3, side=200)
+    radii[[7, 11]] = 150, 40
+    positions[11] = positions[7] + (100, 100)
+    sim = geom.Simulation(positions, radii)
+    I, J = sim.candidate_pairs()
+    candidates = {(min(i, j), max(i, j)) for i, j in zip(I, J)}
+    assert len(candidates) == len(I)
+    exact = geom.BVH(list(sim.circles)).pairs()
+    assert set(exact) <= candidates
+    assert (7, 11) in candidates
+    assert len(I) < 4*len(exact)
+
+def test_resolve():
+    """Test that resolving overlaps pushes bodies apart"""
+    positions, radii = random_bodies(200, 1, side=60)
+    sim = geom.Simulation(positions, radii, iterations=8)
+    before = overlap_count(sim)
+    assert before > 0
+    for _ in range(20):
+        sim.resolve()
+    assert overlap_count(sim) == 0
+
+def test_pair():
+    """Test that two overlapping bodies are pushed apart evenly"""
+    sim = geom.Simulation([(0, 0), (1.5, 0)], 1, iterations=1)
+    assert sim.resolve() == 1
+    assert list(sim.positions[0]) == pytest.approx([-0.25, 0])
+    assert list(sim.positions[1]) == pytest.approx([1.75, 0])
+    assert sim.resolve() == 0
+
+def test_coincident():
+    """Test that bodies at the same center are separated"""
+    sim = geom.Simulation([(1, 1), (1, 1)], 0.5)
+    sim.resolve()
+    assert abs(sim.positions[0] - sim.positions[1]) >= 1 - geom.EPSILON
+
+def test_step():
+    """Test that step moves bodies by their velocity"""
+    sim = geom.Simulation([(0, 0), (10, 0)], 1, [(1, 2), (-1, 0)])
+    assert sim.step(0.5) == 0
+    assert list(sim.positions[0]) == pytest.approx([0.5, 1])
+    assert list(sim.positions[1]) == pytest.approx([9.5, 0])
+    assert list(sim.velocities[1]) == pytest.approx([-1, 0])
+
+def test_workers():
+    """Test that threaded steps match single threaded steps"""
+    positions, radii = random_bodies(500, 2)
+    rng = random.Random(2)
+    velocities = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in radii]
+    single = geom.Simulation(positions, radii, velocities)
+    with geom.Simulation(positions, radii, velocities, workers=3) as multi:
+        for _ in range(5):
+            assert single.step(0.1) == multi.step(0.1)
+        assert np.allclose(single.positions.array, multi.positions.array)
+
+def test_empty():
+    """Test simulations with no bodies or one body"""
+    assert geom.Simulation([], []).step() == 0
+    assert len(geom.Simulation([(0, 0)], 1)) == 1
+
+def test_errors():
+    """Test invalid simulation arguments"""
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0, 0)], 1)
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0)], [1, 2])
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0)], -1)
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0)], 1, [(0, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0)], 1, iterations=0)
+    with pytest.raises(TypeError):
+        geom.Simulation([(0, 0)], 1, workers=1.5)
+    with pytest.raises(TypeError):
+        geom.Simulation([(0, 0)], 1, iterations=True)
+    with pytest.raises(TypeError):
+        geom.Simulation([(0, 0)], 1, workers=True)
+    with pytest.raises(TypeError):
+        geom.Simulation([(0, 0)], 1).resolve(True)
+    with pytest.raises(ValueError):
+        geom.Simulation([(0, 0)], 1).step(1, 0)
+    with pytest.raises(TypeError):
+        geom.Simulation([(0, 0)], 1).step("1")
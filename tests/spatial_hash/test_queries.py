@@ -0,0 +1,69 @@
+import geom
+import pytest
+import random
+from tests.helpers import brute_force_pairs, random_circles
+
+def test_intersecting_pairs():
+    """Test that intersecting pairs match brute force Circle.intersects"""
+    circles = random_circles(150, 1)
+    index = geom.SpatialHash(circles)
+    assert index.intersecting_pairs() == brute_force_pairs(circles)
+    assert set(index.intersecting_pairs()) <= index.candidate_pairs()
+
+def test_explicit_cell_size():
+    """Test that the cell size doesn't change the confirmed pairs"""
+    circles = random_circles(100, 2)
+    expected = brute_force_pairs(circles)
+    for size in (0.1, 1, 50):
+        index = geom.SpatialHash(circles, cell_size=size)
+        assert index.cell_size == size
+        assert index.intersecting_pairs() == expected
+
+def test_query_point():
+    """Test that point queries match brute force Circle.intersects"""
+    circles = random_circles(150, 3)
+    index = geom.SpatialHash(circles)
+    rng = random.Random(4)
+    points = [(rng.uniform(-20, 20), rng.uniform(-20, 20)) for _ in range(100)]
+    points += [(c.center.x + c.radius, c.center.y) for c in circles[:10]]
+    for p in points:
+        expected = [i for i, c in enumerate(circles) if c.intersects(p)]
+        assert index.query_point(p) == expected
+
+def test_skewed_radii():
+    """Test that a huge circle is kept out of the grid but still found"""
+    circles = random_circles(200, 7)
+    circles.append(geom.Circle((500, 0), 1000))
+    circles.append(geom.Circle((0, -1500), 60))
+    index = geom.SpatialHash(circles)
+    assert len(index._cells) < 10000
+    assert index.intersecting_pairs() == brute_force_pairs(circles)
+    for p in [(0, 0), (1400, 0), (1600, 0), (0, -1450)]:
+        expected = [i for i, c in enumerate(circles) if c.intersects(p)]
+        assert index.query_point(p) == expected
+
+def test_tangent_circles():
+    """Test that touching circles are reported as intersecting"""
+    circles = [geom.Circle((0, 0), 1), geom.Circle((2, 0), 1),
+               geom.Circle((5, 0), 1)]
+    assert geom.SpatialHash(circles).intersecting_pairs() == [(0, 1)]
+
+def test_circle_array():
+    """Test that a spatial hash can be built from a CircleArray"""
+    pytest.importorskip("numpy")
+    circles = random_circles(50, 5)
+    index = geom.SpatialHash(geom.CircleArray(circles))
+    assert len(index) == 50
+    assert index.intersecting_pairs() == brute_force_pairs(circles)
+
+def test_errors():
+    """Test that invalid arguments raise errors"""
+    with pytest.raises(TypeError):
+        geom.SpatialHash([(0, 0)])
+    with pytest.raises(ValueError):
+        geom.SpatialHash(random_circles(3, 6), cell_size=0)
+    index = geom.SpatialHash(random_circles(3, 6))
+    with pytest.raises(TypeError):
+        index.query_point('ab')
+    with pytest.raises(ValueError):
+        index.query_point((1, 2, 3))
@@ -0,0 +1,108 @@
+import asyncio
+import concurrent.futures
+import geom
+import pytest
+import time
+from tests import helpers
+
+def random_circles(n, seed):
+    return helpers.random_circles(n, seed, 0, 10)
+
+def random_points(n, seed):
+    return helpers.random_points(n, seed, 0, 10)
+
+async def feed(points, delay=0):
+    for p in points:
+        if delay:
+            await asyncio.sleep(delay)
+        yield p
+
+def classify(points, circles, **kwargs):
+    async def collect():
+        return [r async for r in geom.classify_stream(points, circles,
+                                                      **kwargs)]
+    return asyncio.run(collect())
+
+def test_classification():
+    """Test that each point is tagged with the circles containing it"""
+    circles = random_circles(40, 1)
+    points = random_points(500, 2)
+    expected = [(p, [i for i, c in enumerate(circles) if c.intersects(p)])
+                for p in points]
+    assert classify(feed(points), circles, batch_size=32) == expected
+    assert classify(feed(points), geom.BVH(circles)) == expected
+
+def test_time_window():
+    """Test that slow streams are classified before a batch fills up"""
+    circles = random_circles(10, 3)
+    points = random_points(5, 4)
+
+    async def first():
+        stream = geom.classify_stream(feed(points, 0.01), circles,
+                                      batch_size=1000, window=0.001)
+        result = await asyncio.wait_for(stream.__anext__(), 1)
+        await stream.aclose()
+        return result
+    assert asyncio.run(first())[0] == points[0]
+    assert len(classify(feed(points, 0.005), circles, window=0.01)) == 5
+
+def test_backpressure():
+    """Test that a slow consumer stops the stream from being read ahead"""
+    read = 0
+
+    async def counted():
+        nonlocal read
+        for p in random_points(1000, 5):
+            read += 1
+            yield p
+
+    async def consume_one():
+        stream = geom.classify_stream(counted(), random_circles(10, 6),
+                                      batch_size=10, max_pending=2)
+        await stream.__anext__()
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+    asyncio.run(consume_one())
+    assert read <= 50
+
+def test_close_cancels():
+    """Test that closing the stream cancels the batches still queued"""
+    calls = 0
+
+    class Slow:
+        def query_point(self, point):
+            nonlocal calls
+            calls += 1
+            time.sleep(0.02)
+            return []
+
+    async def consume_one(executor):
+        stream = geom.classify_stream(feed(random_points(100, 9)), Slow(),
+                                      batch_size=1, max_pending=4,
+                                      executor=executor)
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+        await stream.aclose()
+        assert len(asyncio.all_tasks()) == 1
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        asyncio.run(consume_one(executor))
+    assert calls <= 3
+
+def test_errors():
+    """Test that bad streams and arguments raise errors"""
+    circles = random_circles(5, 7)
+    with pytest.raises(TypeError):
+        classify(random_points(5, 8), circles)
+    with pytest.raises(TypeError):
+        classify(feed([(1, 2), 'ab']), circles)
+    with pytest.raises(ValueError):
+        classify(feed([(1, 2, 3)]), circles)
+    with pytest.raises(ValueError):
+        classify(feed([]), circles, batch_size=0)
+    with pytest.raises(ValueError):
+        classify(feed([]), circles, max_pending=-1)
+    for bad in (True, 2.0, '4'):
+        with pytest.raises(TypeError):
+            classify(feed([]), circles, batch_size=bad)
+        with pytest.raises(TypeError):
+            classify(feed([]), circles, max_pending=bad)
@@ -0,0 +1,78 @@
+import geom
+import pytest
+import random
+from tests.helpers import brute_force_pairs, random_circles
+
+def engine_pairs(engine):
+    """The intersecting pairs of handles in `engine`, by brute force"""
+    handles = sorted(h for h in range(1000) if h in engine)
+    pairs = brute_force_pairs([engine[h] for h in handles])
+    return {(handles[i], handles[j]) for i, j in pairs}
+
+def test_initial_pairs():
+    """Test that the first update reports every overlapping pair as entered"""
+    circles = random_circles(150, 1)
+    engine = geom.SweepAndPrune(circles)
+    events = engine.update()
+    assert events.entered == engine_pairs(engine)
+    assert events.stayed == set() and events.exited == set()
+    assert engine.pairs == events.entered
+
+def test_moving_circles():
+    """Test that events match brute force as circles move every frame"""
+    engine = geom.SweepAndPrune(random_circles(150, 2))
+    rng = random.Random(3)
+    previous = set()
+    for _ in range(30):
+        for h in range(len(engine)):
+            if rng.random() < 0.3:
+                engine.move_by(h, (rng.uniform(-1, 1), rng.uniform(-1, 1)))
+        events = engine.update()
+        current = engine_pairs(engine)
+        assert engine.pairs == current
+        assert events.entered == current - previous
+        assert events.stayed == current & previous
+        assert events.exited == previous - current
+        previous = current
+
+def test_enter_stay_exit():
+    """Test that a circle passing through another enters, stays and exits"""
+    engine = geom.SweepAndPrune([geom.Circle((0, 0), 1),
+                                 geom.Circle((5, 0), 1)])
+    assert engine.update().entered == set()
+    engine.move_to(1, (2, 0))
+    assert engine.update().entered == {(0, 1)}
+    engine.move_by(1, (-1, 0))
+    assert engine.update().stayed == {(0, 1)}
+    engine.move_to(1, (-3, 0))
+    events = engine.update()
+    assert events.exited == {(0, 1)} and engine.pairs == set()
+
+def test_add_remove_replace():
+    """Test that added, removed and replaced circles are tracked"""
+    engine = geom.SweepAndPrune([geom.Circle((0, 0), 1)])
+    engine.update()
+    h = engine.add(geom.Circle((1, 1), 1))
+    assert h == 1 and len(engine) == 2
+    assert engine.update().entered == {(0, 1)}
+    engine.replace(h, geom.Circle((10, 10), 1))
+    assert engine.update().exited == {(0, 1)}
+    engine.replace(h, geom.Circle((0, 0), 0.5))
+    engine.update()
+    engine.remove(0)
+    assert engine.update().exited == {(0, 1)}
+    assert 0 not in engine and engine[1].radius == 0.5
+
+def test_errors():
+    """Test that bad handles and arguments raise errors"""
+    engine = geom.SweepAndPrune(random_circles(3, 4))
+    with pytest.raises(KeyError):
+        engine.move_by(7, (1, 1))
+    with pytest.raises(TypeError):
+        engine.move_to(0, 'ab')
+    with pytest.raises(ValueError):
+        engine.move_by(0, (1, 2, 3))
+    with pytest.raises(TypeError):
+        engine.add(5)
+    with pytest.raises(TypeError):
+        geom.SweepAndPrune(5)
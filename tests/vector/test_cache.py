@@ -0,0 +1,70 @@
+import geom
+import pytest
+
+def test_frozen_hashable():
+    """Test that frozen vectors can key dicts and sets"""
+    a = geom.FrozenVector([1, 2, 3])
+    b = geom.FrozenVector((1.0, 2.0, 3.0))
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b, geom.FrozenVector([3, 2, 1])}) == 2
+    assert {a: 'a'}[b] == 'a'
+    assert a == geom.Vector([1, 2, 3])
+
+def test_frozen_mixed_dimensions():
+    """Test that frozen vectors of different dimensions share a set"""
+    vectors = {geom.FrozenVector([1, 2]), geom.FrozenVector([1, 2, 3]),
+               geom.FrozenVector([1]), geom.FrozenVector((1.0, 2.0))}
+    assert len(vectors) == 3
+    assert geom.FrozenVector([1, 2]) in vectors
+    assert geom.FrozenVector([1, 2, 4]) not in vectors
+    assert geom.FrozenVector([1, 2]) != geom.FrozenVector([1, 2, 0])
+    assert geom.Vector([1, 2]) != geom.FrozenVector([1, 2, 0])
+    assert geom.FrozenVector([1, 2]) != "ab"
+    assert {(1, 2): 'tuple'}.get(geom.FrozenVector([1, 2, 0])) is None
+
+def test_frozen_immutable():
+    """Test that frozen vectors can't be modified"""
+    a = geom.FrozenVector([3, 4])
+    for mutate in (lambda: a.__setitem__(0, 1), lambda: a.addOn((1, 1)),
+                   lambda: a.takeAway((1, 1)), lambda: a.mulBy(2),
+                   lambda: a.divBy(2), a.normalize):
+        with pytest.raises(TypeError):
+            mutate()
+    with pytest.raises(TypeError):
+        a.x = 5
+    assert a == (3, 4)
+
+def test_frozen_cached_normal():
+    """Test that a frozen vector computes its normal once"""
+    a = geom.FrozenVector([3, 4])
+    n = ~a
+    assert n is ~a and n is a.norm()
+    assert type(n) is geom.FrozenVector
+    assert n == ~geom.Vector([3, 4])
+    assert abs(a) == 5 and a.magSq() == 25
+    with pytest.raises(ValueError):
+        ~geom.FrozenVector([0, 0])
+
+def test_frozen_arithmetic():
+    """Test that arithmetic with frozen vectors gives ordinary vectors"""
+    a = geom.FrozenVector([1, 2, 3])
+    for result in (a + a, a - (1, 1, 1), a * 2, a * a, a / 2, -a):
+        assert type(result) is geom.Vector
+    assert repr(a) == "geom.FrozenVector([1, 2, 3])"
+
+def test_cache_invalidated():
+    """Test that mutating a vector invalidates its cached magnitude"""
+    v = geom.Vector([3, 4])
+    mutations = ((lambda: v.__setitem__(0, 0), 4),
+                 (lambda: v.addOn((3, 0)), 5),
+                 (lambda: v.takeAway((3, 0)), 4),
+                 (lambda: v.mulBy(2), 8),
+                 (lambda: v.divBy(4), 2),
+                 (v.normalize, 1))
+    for mutate, expected in mutations:
+        abs(v), v.magSq()
+        mutate()
+        assert abs(v) == expected
+        assert v.magSq() == expected**2
+    v.y = 3
+    assert abs(v) == 3
@@ -0,0 +1,103 @@
+import geom
+import pytest
+import sys
+
+def test_init():
+    """Test that fixed-dimension vectors accept separate or packed components"""
+    assert geom.Vector2(1, 2) == geom.Vector2((1, 2))
+    assert geom.Vector3(1, 2, 3) == geom.Vector3([1, 2, 3])
+    assert list(geom.Vector3(geom.Vector([4, 5, 6]))) == [4, 5, 6]
+    with pytest.raises(ValueError):
+        geom.Vector2(1, 2, 3)
+    with pytest.raises(ValueError):
+        geom.Vector3((1, 2))
+    with pytest.raises(TypeError):
+        geom.Vector2('1', 2)
+    with pytest.raises(TypeError):
+        geom.Vector3(1)
+
+def test_no_instance_dict():
+    """Test that fixed-dimension vectors don't carry a __dict__"""
+    for v in (geom.Vector([1, 2]), geom.Vector2(1, 2), geom.Vector3(1, 2, 3)):
+        assert not hasattr(v, '__dict__')
+    assert sys.getsizeof(geom.Vector3(1, 2, 3)) < \
+        sys.getsizeof(geom.Vector([1, 2, 3])) + sys.getsizeof([1, 2, 3])
+
+def test_only_coordinate_slots():
+    """Test that fixed-dimension vectors only store their coordinates"""
+    v2 = sys.getsizeof(geom.Vector2(1, 2))
+    assert v2 < sys.getsizeof(geom.Vector([1, 2]))
+    assert sys.getsizeof(geom.Vector3(1, 2, 3)) == v2 + 8
+    assert isinstance(geom.Vector2(1, 2), geom.Vector)
+    assert issubclass(geom.Vector3, geom.Vector)
+    assert not isinstance(geom.Vector2(1, 2), geom.Vector3)
+    assert not isinstance([1, 2], geom.Vector)
+    for cls in (geom.Vector2, geom.Vector3):
+        assert cls.addOn.__doc__ and cls.takeAway.__doc__
+
+@pytest.mark.parametrize("components,other", (((1.5, -2), (0.25, 4)),
+                                              ((1.5, -2, 3), (0.25, 4, -1))))
+def test_matches_vector(components, other):
+    """Test that every operation matches the generic Vector"""
+    fixed = {2: geom.Vector2, 3: geom.Vector3}[len(components)]
+    for b in (other, geom.Vector(other), fixed(other)):
+        v, f = geom.Vector(components), fixed(components)
+        assert f + b == v + b and b + f == b + v
+        assert f - b == v - b and b - f == b - v
+        assert f * 3 == v * 3 and 3 * f == 3 * v
+        assert f / 4 == v / 4 and f.mul(2) == v.mul(2)
+        assert f @ b == v @ b and b @ f == b @ v
+        assert abs(f) == abs(v) and f.magSq() == v.magSq()
+        assert ~f == ~v and -f == -v
+        if len(components) == 3:
+            assert f * b == v * b and b * f == b * v
+        v.addOn(b), f.addOn(b)
+        assert f == v
+        v.takeAway(b), f.takeAway(b)
+        v.mulBy(3), f.mulBy(3)
+        v.divBy(7), f.divBy(7)
+        v.normalize(), f.normalize()
+        assert f == v
+
+def test_results_keep_type():
+    """Test that operations on fixed-dimension vectors keep their type"""
+    a = geom.Vector3(1, 2, 3)
+    for result in (a + (1, 1, 1), (1, 1, 1) + a, geom.Vector([1, 1, 1]) - a,
+                   a * 2, a * a, a / 2, -a, ~a):
+        assert type(result) is geom.Vector3
+    assert type(geom.Vector([1, 2]) + geom.Vector2(3, 4)) is geom.Vector2
+
+def test_indexing():
+    """Test that indexing and components match the generic Vector"""
+    v = geom.Vector2(3, 4)
+    assert (v.x, v.y, v[0], v[1], v[-1]) == (3, 4, 3, 4, 4)
+    with pytest.raises(IndexError):
+        v.z
+    with pytest.raises(IndexError):
+        v[2]
+    v.x = 5
+    v[1] = 6
+    assert v == (5, 6)
+    with pytest.raises(TypeError):
+        v[0] = '1'
+    w = geom.Vector3(1, 2, 3)
+    w.z = 9
+    assert list(w) == [1, 2, 9]
+    assert len(w) == 3 and str(w) == "<1, 2, 9>"
+
+def test_errors():
+    """Test that invalid operands raise the same errors as Vector"""
+    v2 = geom.Vector2(1, 2)
+    v3 = geom.Vector3(1, 2, 3)
+    with pytest.raises(ValueError):
+        v2 + v3
+    with pytest.raises(ValueError):
+        v2 * v2
+    with pytest.raises(TypeError):
+        v3 * ('1', 2, 3)
+    with pytest.raises(TypeError):
+        v3 / True
+    with pytest.raises(ValueError):
+        v2 == (1, 2, 3)
+    with pytest.raises(ValueError):
+        ~geom.Vector3(0, 0, 0)
@@ -0,0 +1,96 @@
+import geom
+import pytest
+
+VECTOR_TYPES = ((geom.Vector, (1.5, -2, 3)),
+                (geom.Vector3, (1.5, -2, 3)),
+                (geom.Vector2, (1.5, -2)))
+
+@pytest.mark.parametrize("cls,components", VECTOR_TYPES)
+def test_in_place_operators(cls, components):
+    """Test that augmented assignment mutates the vector in place"""
+    other = tuple(range(1, len(components) + 1))
+    v = cls(components)
+    original = v
+    v += other
+    v -= (1,)*len(components)
+    v *= 3
+    v /= 2
+    assert v is original
+    expected = (geom.Vector(components) + other - (1,)*len(components))*3/2
+    assert v == expected
+
+def test_in_place_cross():
+    """Test that *= with a vector computes the cross product in place"""
+    v = geom.Vector([1, 0, 0])
+    original = v
+    v *= (0, 1, 0)
+    assert v is original
+    assert v == (0, 0, 1)
+    with pytest.raises(ValueError):
+        w = geom.Vector([1, 2])
+        w *= (1, 2)
+
+def test_in_place_errors():
+    """Test that augmented assignment raises the same errors"""
+    v = geom.Vector([1, 2])
+    with pytest.raises(TypeError):
+        v += ('1', 2)
+    with pytest.raises(ValueError):
+        v -= (1, 2, 3)
+    with pytest.raises(TypeError):
+        v /= True
+    assert v == (1, 2)
+
+def test_frozen_augmented_assignment():
+    """Test that augmented assignment on a frozen vector makes a new vector"""
+    f = geom.FrozenVector([1, 2])
+    g = f
+    g += (1, 1)
+    assert f == (1, 2) and g == (2, 3)
+    assert g is not f
+
+@pytest.mark.parametrize("cls,components", VECTOR_TYPES)
+def test_out(cls, components):
+    """Test that out= writes results into an existing vector"""
+    other = tuple(range(1, len(components) + 1))
+    v = cls(components)
+    out = cls((0,)*len(components))
+    cases = ((v.add, (other,), v + other), (v.sub, (other,), v - other),
+             (v.mul, (2.5,), v * 2.5), (v.div, (4,), v / 4),
+             (v.norm, (), ~v))
+    for method, args, expected in cases:
+        assert method(*args, out=out) is out
+        assert out == expected
+    assert v.add(other, out=v) is v
+    assert v == cls(components) + other
+
+def test_out_cross():
+    """Test that cross products can be written into their operand"""
+    a = geom.Vector([1, 2, 3])
+    b = geom.Vector([-1, 0.5, 2])
+    expected = a * b
+    assert a.cross(b, out=a) is a
+    assert a == expected
+
+def test_out_errors():
+    """Test that an unsuitable out vector raises errors"""
+    v = geom.Vector([1, 2])
+    with pytest.raises(TypeError):
+        v.add((1, 1), out=[0, 0])
+    with pytest.raises(ValueError):
+        v.mul(2, out=geom.Vector([0, 0, 0]))
+    with pytest.raises(TypeError):
+        v.norm(out=geom.FrozenVector([0, 0]))
+
+@pytest.mark.parametrize("cls,components", VECTOR_TYPES)
+def test_axpy(cls, components):
+    """Test that axpy matches v + a*w"""
+    w = cls(tuple(range(2, len(components) + 2)))
+    v = cls(components)
+    expected = v + w*0.25
+    assert v.axpy(0.25, w) is None
+    assert v == expected
+    v.axpy(2, tuple(w))
+    assert v == expected + w*2
+    with pytest.raises(TypeError):
+        v.axpy('2', w)
@@ -0,0 +1,102 @@
+import geom
+import pickle
+import pytest
+import random
+
+def random_vector(rng, n=4):
+    return geom.Vector([rng.uniform(-5, 5) for _ in range(n)])
+
+def test_same_as_eager():
+    """Test that lazy expressions give exactly the eager results"""
+    rng = random.Random(1)
+    for _ in range(100):
+        a, b, c = (random_vector(rng) for _ in range(3))
+        s = rng.uniform(-3, 3)
+        assert list(a.lazy() + b.lazy()*s - c) == list(a + b*s - c)
+        assert list(-(a.lazy() - b)/s + [1, 2, 3, 4] - 2*c.lazy()) == \
+               list(-(a - b)/s + [1, 2, 3, 4] - 2*c)
+        assert list([1, 2, 3, 4] - a.lazy() + (c - b.lazy())) == \
+               list([1, 2, 3, 4] - a + (c - b))
+        assert (a.lazy() + b) @ c == (a + b) @ c
+        assert abs(a.lazy() - c) == abs(a - c)
+
+def test_deferred():
+    """Test that the value is computed once, when it's first used"""
+    a = geom.Vector([1, 2])
+    b = geom.Vector([3, 4])
+    lazy = a.lazy() + b*2
+    assert isinstance(lazy, geom.LazyVector) and len(lazy) == 2
+    assert lazy._value is None
+    assert lazy[1] == 10 and lazy._value == [7, 10]
+    assert lazy.vector() == [7, 10] and type(lazy.vector()) is geom.Vector
+
+def test_long_chains():
+    """Test that long chains are evaluated in bounded parts"""
+    a = geom.Vector([1.5, -2, 0.25])
+    lazy = a.lazy()
+    eager = a
+    for i in range(100):
+        lazy = lazy + a*i
+        eager = eager + a*i
+    assert lazy == eager
+    assert lazy._leaves <= geom._LAZY_MAX_LEAVES
+
+def test_mutation():
+    """Test that lazy vectors can be mutated once evaluated"""
+    lazy = geom.Vector([1, 2, 3]).lazy() * 2
+    lazy += [1, 1, 1]
+    lazy[0] = 0
+    assert lazy == [0, 5, 7] and abs(lazy) == abs(geom.Vector([0, 5, 7]))
+
+def test_errors():
+    """Test that lazy operators raise the eager errors"""
+    lazy = geom.Vector([1, 2, 3]).lazy()
+    with pytest.raises(ValueError):
+        lazy + [1, 2]
+    with pytest.raises(ValueError):
+        lazy - geom.Vector([1, 2]).lazy()
+    with pytest.raises(TypeError):
+        lazy - 'abc'
+    with pytest.raises(TypeError):
+        lazy / 'x'
+    with pytest.raises(ValueError):
+        lazy * [1, 2]
+
+def test_eager_parity():
+    """Test that lazy vectors keep the eager errors and result types"""
+    lazy = geom.Vector([1, 2, 3]).lazy()
+    with pytest.raises(ZeroDivisionError):
+        lazy / 0
+    with pytest.raises(ZeroDivisionError):
+        (lazy + [1, 1, 1]) / 0.0
+    fixed = geom.Vector3(4, 5, 6)
+    for op in (lambda a, b: a + b, lambda a, b: a - b, lambda a, b: a * b):
+        result = op(lazy, fixed)
+        expected = op(geom.Vector([1, 2, 3]), fixed)
+        assert type(result) is type(expected) is geom.Vector3
+        assert result == expected
+    assert type(geom.Vector([1, 2]).lazy() + geom.Vector2(3, 4)) is \
+        geom.Vector2
+    copy = pickle.loads(pickle.dumps(lazy * 2 + [1, 1, 1]))
+    assert type(copy) is geom.LazyVector and copy == [3, 5, 7]
+    assert (copy * 2).vector() == [6, 10, 14]
+
+def test_constructor():
+    """Test that lazy vectors can be created from components"""
+    lazy = geom.LazyVector([1, 2, 3])
+    assert len(lazy) == 3 and lazy == [1, 2, 3]
+    assert (lazy*2 + [1, 1, 1]).vector() == [3, 5, 7]
+    with pytest.raises(ValueError):
+        geom.LazyVector([])
+
+def test_kernel_cache():
+    """Test that the compiled kernels are bounded"""
+    v = geom.Vector([1, 2]).lazy()
+    for i in range(geom._LAZY_MAX_KERNELS + 50):
+        expr = v
+        for bit in range(9):
+            expr = expr + v if (i >> bit) & 1 else expr - v
+        k = 2*bin(i).count('1') - 8
+        assert expr.vector() == [k, 2*k]
+    info = geom._lazy_kernel.cache_info()
+    assert info.currsize == geom._LAZY_MAX_KERNELS
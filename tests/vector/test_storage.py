@@ -0,0 +1,52 @@
+import array
+import geom
+import pytest
+
+@pytest.fixture
+def array_storage():
+    previous = geom.set_storage('array')
+    yield
+    geom.set_storage(previous)
+
+def test_array_storage():
+    """Test that vectors can store their components in a typed array"""
+    v = geom.Vector([1, 2, 3], storage='array')
+    assert type(v._components) is array.array
+    assert v == [1, 2, 3] and list(v) == [1.0, 2.0, 3.0]
+    assert repr(v) == "geom.Vector([1.0, 2.0, 3.0])"
+    assert type(geom.Vector([1, 2])._components) is list
+
+def test_array_operations():
+    """Test that array backed vectors give the same results as lists"""
+    a = geom.Vector([1.5, -2, 3], storage='array')
+    b = geom.Vector([1.5, -2, 3])
+    other = [0.5, 4, -1]
+    assert a + other == b + other and a - other == b - other
+    assert a * other == b * other and a @ other == b @ other
+    assert a * 3 == b * 3 and a / 4 == b / 4 and ~a == ~b and -a == -b
+    for v in (a, b):
+        v += other
+        v *= 2
+        v -= [1, 1, 1]
+        v /= 3
+        v.axpy(0.5, other)
+        v *= other
+    assert a == b and type(a._components) is array.array
+    a.normalize()
+    b.normalize()
+    assert a == b and a.cross([0, 0, 1]) == b.cross([0, 0, 1])
+
+def test_global_storage(array_storage):
+    """Test that the module setting chooses the default storage"""
+    assert type(geom.Vector([1, 2])._components) is array.array
+    assert type(geom.Vector([1, 2], storage='list')._components) is list
+    assert type((geom.Vector([1, 2]) + [1, 1])._components) is list
+    assert geom.FrozenVector([1, 2]) == [1, 2]
+    assert geom.set_storage('list') == 'array'
+
+def test_storage_errors():
+    """Test that unknown storages raise ValueError"""
+    with pytest.raises(ValueError):
+        geom.Vector([1, 2], storage='tuple')
+    with pytest.raises(ValueError):
+        geom.set_storage('numpy')
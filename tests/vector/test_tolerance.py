@@ -0,0 +1,64 @@
+import geom
+import pytest
+import random
+
+def test_isclose():
+    """Test that vectors compare within a tolerance"""
+    v = geom.Vector([1, 2, 3])
+    assert v.isclose([1 + geom.EPSILON/2, 2, 3 - geom.EPSILON/2])
+    assert not v.isclose([1 + 2*geom.EPSILON, 2, 3])
+    assert v.isclose([1.5, 2, 3], tol=0.5)
+    assert geom.Vector2(1, 2).isclose((1, 2))
+    with pytest.raises(ValueError):
+        v.isclose([1, 2])
+    with pytest.raises(TypeError):
+        v.isclose('abc')
+    with pytest.raises(ValueError):
+        v.isclose(v, tol=-1)
+
+def test_vector_array_isclose():
+    """Test that vector arrays compare within a tolerance row by row"""
+    np = pytest.importorskip("numpy")
+    a = geom.VectorArray([[0, 0], [1, 1], [2, 2]])
+    b = a + geom.VectorArray([[0, 1e-7], [0, 0], [0.1, 0]])
+    assert a.isclose(b).tolist() == [True, True, False]
+    assert a.allclose(b, tol=0.2) and not a.allclose(b)
+    assert a.isclose([1, 1]).tolist() == [False, True, False]
+
+def test_unique_vectors():
+    """Test that near-duplicates are merged into their first occurrence"""
+    unique, inverse = geom.unique_vectors([(0, 0), (1, 1), (1e-7, 0),
+                                           (1, 1 - 1e-7), (5, 5)])
+    assert unique == [geom.Vector([0, 0]), geom.Vector([1, 1]),
+                      geom.Vector([5, 5])]
+    assert inverse == [0, 1, 0, 1, 2]
+    assert geom.unique_vectors([(1, 2), (1, 2), (2, 1)], tol=0) == \
+           ([geom.Vector([1, 2]), geom.Vector([2, 1])], [0, 0, 1])
+    assert geom.unique_vectors([]) == ([], [])
+
+def test_unique_vectors_brute_force():
+    """Test that deduplication matches a brute force search"""
+    rng = random.Random(1)
+    tol = 1.5
+    points = [(rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 3))
+              for _ in range(300)]
+    expected_unique, expected_inverse = [], []
+    for p in points:
+        for j, q in enumerate(expected_unique):
+            if geom.Vector(q).isclose(p, tol):
+                expected_inverse.append(j)
+                break
+        else:
+            expected_inverse.append(len(expected_unique))
+            expected_unique.append(p)
+    unique, inverse = geom.unique_vectors(points, tol)
+    assert unique == [geom.Vector(p) for p in expected_unique]
+    assert inverse == expected_inverse
+
+def test_unique_vector_array():
+    """Test that vector arrays deduplicate into vector arrays"""
+    np = pytest.importorskip("numpy")
+    vectors = geom.VectorArray([[0, 0], [3, 4], [1e-8, 0]])
+    unique, inverse = geom.unique_vectors(vectors)
+    assert unique.array.tolist() == [[0, 0], [3, 4]]
+    assert inverse.tolist() == [0, 1, 0]
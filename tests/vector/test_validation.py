@@ -0,0 +1,61 @@
+import geom
+import pytest
+
+def test_from_trusted_uses_list():
+    """Test that trusted vectors use their component list without copying"""
+    components = [1, 2, 3]
+    v = geom.Vector._from_trusted(components)
+    assert v._components is components
+    assert v == geom.Vector([1, 2, 3])
+
+def test_operators_return_vectors():
+    """Test that operator results are ordinary vectors"""
+    a = geom.Vector([1, 2, 3])
+    b = geom.Vector([4, 5, 6])
+    for result in (a + b, a - b, a * 2, a * b, b * a, a / 2, -a, ~a,
+                   (1, 1, 1) - a, a.mul(3)):
+        assert type(result) is geom.Vector
+        assert type(result._components) is list
+
+def test_unchecked_restores_validation():
+    """Test that validation is restored when an unchecked block exits"""
+    with geom.unchecked():
+        geom.Vector(['a'])
+    with pytest.raises(TypeError):
+        geom.Vector(['a'])
+    with pytest.raises(RuntimeError):
+        with geom.unchecked():
+            raise RuntimeError
+    with pytest.raises(TypeError):
+        geom.Vector(['a'])
+
+def test_set_validation():
+    """Test that set_validation returns the previous setting"""
+    assert geom.set_validation(False) is True
+    try:
+        assert geom.set_validation(False) is False
+        geom.Circle(('a', 'b'), 1)
+    finally:
+        geom.set_validation(True)
+    with pytest.raises(TypeError):
+        geom.Circle(('a', 'b'), 1)
+
+def test_unchecked_results_match():
+    """Test that skipping validation doesn't change valid results"""
+    a = geom.Vector([1.5, -2, 3])
+    b = (0.25, 4, -1)
+    c = geom.Circle((0, 0), 2)
+    expected = [a + b, a - b, a * b, a * 3, a / 4, a @ b, abs(a), ~a,
+                c.moved_by((1, 1)).center, c.intersects((1, 1))]
+    with geom.unchecked():
+        results = [a + b, a - b, a * b, a * 3, a / 4, a @ b, abs(a), ~a,
+                   c.moved_by((1, 1)).center, c.intersects((1, 1))]
+    assert results == expected
+
+def test_circle_copies_are_independent():
+    """Test that circles made from other circles don't share centers"""
+    c = geom.Circle((1, 2), 3)
+    for other in (c.scaled_by(2), c.scaled_to(2), c.moved_to(c.center),
+                  c.moved_by((0, 0))):
+        other.center.x = 100
+        assert c.center.x == 1
@@ -0,0 +1,83 @@
+import array
+import geom
+import pytest
+import sys
+
+def test_view_shares_memory():
+    """Test that a vector view and its buffer see each other's changes"""
+    data = array.array('d', [1, 2, 3])
+    v = geom.Vector.view(data)
+    assert v == [1, 2, 3] and abs(v) == abs(geom.Vector([1, 2, 3]))
+    v += [1, 1, 1]
+    assert data.tolist() == [2, 3, 4]
+    data[0] = 0
+    assert v == [0, 3, 4] and v.x == 0
+    v.normalize()
+    assert data.tolist() == [0, 0.6, 0.8]
+    v.cross([1, 0, 0], out=v)
+    assert data.tolist() == list(geom.Vector([0, 0.6, 0.8]) * [1, 0, 0])
+
+def test_view_operations():
+    """Test that operations on a view give ordinary vectors"""
+    v = geom.Vector.view(array.array('d', [3, 4]))
+    w = v + [1, 1]
+    assert type(w) is geom.Vector and w == [4, 5]
+    assert v @ [1, 1] == 7 and ~v == ~geom.Vector([3, 4])
+    assert repr(v) == "geom.Vector([3.0, 4.0])"
+
+def test_view_raw_bytes():
+    """Test that raw byte buffers are read as doubles"""
+    data = bytearray(24)
+    v = geom.Vector.view(memoryview(data)[8:])
+    v[1] = 2.5
+    assert array.array('d', bytes(data)).tolist() == [0, 0, 2.5]
+    frozen = geom.Vector.view(bytes(16))
+    with pytest.raises(TypeError):
+        frozen[0] = 1.0
+
+def test_view_errors():
+    """Test that unsupported buffers raise errors"""
+    with pytest.raises(TypeError):
+        geom.Vector.view([1.0, 2.0])
+    with pytest.raises(TypeError):
+        geom.Vector.view(array.array('i', [1, 2]))
+    with pytest.raises(ValueError):
+        geom.Vector.view(array.array('d'))
+    with pytest.raises(ValueError):
+        geom.Vector.view(bytes(12))
+    with pytest.raises(ValueError):
+        geom.Vector.view(memoryview(array.array('d', [1, 2, 3, 4]))[::2])
+
+def test_numpy_views():
+    """Test that numpy rows can be viewed and views convert without copies"""
+    np = pytest.importorskip("numpy")
+    big = np.arange(12.0).reshape(4, 3)
+    v = geom.Vector.view(big[2])
+    v *= 2
+    assert big[2].tolist() == [12, 14, 16]
+    assert np.shares_memory(np.asarray(v), big)
+    assert not np.shares_memory(np.array(v, copy=True), big)
+    assert np.asarray(geom.Vector([1, 2])).tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        np.array(geom.Vector([1, 2]), copy=False)
+    with pytest.raises(ValueError):
+        geom.Vector.view(big)
+
+@pytest.mark.skipif(sys.version_info < (3, 12),
+                    reason="the buffer protocol for classes needs 3.12")
+def test_buffer_protocol():
+    """Test that vectors expose their components through memoryview"""
+    data = array.array('d', [1, 2])
+    view = memoryview(geom.Vector.view(data))
+    view[0] = 5
+    assert data[0] == 5
+    copy = memoryview(geom.Vector([1, 2]))
+    assert copy.tolist() == [1, 2] and copy.readonly
+
+def test_magnitude_after_buffer_write():
+    """Test that magnitudes follow writes made through the buffer"""
+    data = array.array('d', [3, 4])
+    v = geom.Vector.view(data)
+    assert abs(v) == 5 and v.magSq() == 25
+    data[0] = 0
+    assert abs(v) == 4 and v.magSq() == 16
@@ -0,0 +1,58 @@
+import geom
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def test_in_place_operators():
+    """Test that augmented assignment reuses the array's buffer"""
+    a = geom.VectorArray([(1, 2, 3), (4, 5, 6)])
+    buffer = a.array
+    a += (1, 1, 1)
+    a -= geom.VectorArray([(1, 0, 0), (0, 1, 0)])
+    a *= 2
+    a /= 4
+    a *= (0, 0, 1)
+    assert a.array is buffer
+    expected = [((u + (1, 1, 1) - w)*2/4)*(0, 0, 1) for u, w in
+                zip([geom.Vector([1, 2, 3]), geom.Vector([4, 5, 6])],
+                    [(1, 0, 0), (0, 1, 0)])]
+    assert list(a) == expected
+
+def test_out():
+    """Test that out= writes results into an existing vector array"""
+    a = geom.VectorArray([(3, 4, 0), (0, 0, 2)])
+    out = geom.VectorArray(np.zeros((2, 3)))
+    cases = ((a.add, ((1, 1, 1),), a + (1, 1, 1)),
+             (a.sub, (a,), a - a), (a.mul, (3,), a * 3), (a.div, (2,), a / 2),
+             (a.cross, ((1, 0, 0),), a * (1, 0, 0)), (a.norm, (), ~a))
+    for method, args, expected in cases:
+        assert method(*args, out=out) is out
+        assert np.array_equal(out.array, expected.array)
+    with pytest.raises(ValueError):
+        a.add(a, out=geom.VectorArray([(0, 0, 0)]))
+    with pytest.raises(TypeError):
+        a.add(a, out=geom.Vector([0, 0, 0]))
+
+def test_axpy():
+    """Test that axpy matches a + s*w"""
+    a = geom.VectorArray([(1, 2), (3, 4)])
+    w = geom.VectorArray([(1, -1), (0.5, 0.5)])
+    expected = a + w*0.5
+    a.axpy(0.5, w)
+    assert np.array_equal(a.array, expected.array)
+    a.axpy(2, (1, 1))
+    assert np.array_equal(a.array, (expected + (2, 2)).array)
+
+def test_axpy_blocks(monkeypatch):
+    """Test that blocked axpy matches a + s*w and reuses its buffer"""
+    monkeypatch.setattr(geom, '_AXPY_BLOCK', 3)
+    rng = np.random.default_rng(1)
+    a = geom.VectorArray(rng.normal(size=(10, 3)))
+    w = geom.VectorArray(rng.normal(size=(10, 3)))
+    expected = a + w*-1.5
+    a.axpy(-1.5, w)
+    assert np.allclose(a.array, expected.array)
+    scratch = a._scratch
+    a.axpy(1, a)
+    assert np.allclose(a.array, expected.array*2)
+    assert a._scratch is scratch
@@ -0,0 +1,91 @@
+import geom
+import pytest
+import math
+
+np = pytest.importorskip("numpy")
+
+def test_init_from_vectors():
+    """Test that a vector array can be created from a list of vectors"""
+    a = geom.VectorArray([geom.Vector([1, 2]), (3, 4), [5.0, 6.0]])
+    assert len(a) == 3
+    assert a.dim == 2
+    assert a.array.tolist() == [[1, 2], [3, 4], [5, 6]]
+
+def test_init_copies_array():
+    """Test that a vector array doesn't share memory with its input"""
+    data = np.zeros((4, 3))
+    a = geom.VectorArray(data)
+    data[0, 0] = 1
+    assert a[0] == geom.Vector([0, 0, 0])
+
+def test_init_errors():
+    """Test that invalid vector arrays raise the same errors as Vector"""
+    with pytest.raises(TypeError):
+        geom.VectorArray([('1', 2)])
+    with pytest.raises(TypeError):
+        geom.VectorArray(3)
+    with pytest.raises(ValueError):
+        geom.VectorArray([])
+    with pytest.raises(ValueError):
+        geom.VectorArray([(1, 2), (3,)])
+
+def test_round_trip():
+    """Test that vectors survive conversion to and from a vector array"""
+    vectors = [geom.Vector([i, -i, 2*i]) for i in range(10)]
+    a = geom.VectorArray.from_vectors(vectors)
+    assert a.to_vectors() == vectors
+    assert list(a) == vectors
+    assert a[-1] == vectors[-1]
+    assert a[2:4].to_vectors() == vectors[2:4]
+
+def test_matches_vector_operations():
+    """Test that every operator matches the equivalent Vector operator"""
+    A = [geom.Vector([1, 2, 3]), geom.Vector([-4, 0.5, 9])]
+    B = [geom.Vector([0.5, 0, -1]), geom.Vector([3, 3, 3])]
+    a = geom.VectorArray(A)
+    b = geom.VectorArray(B)
+    cases = ((a + b, [u + v for u, v in zip(A, B)]),
+             (a - b, [u - v for u, v in zip(A, B)]),
+             (a * b, [u * v for u, v in zip(A, B)]),
+             (a * 2.5, [u * 2.5 for u in A]),
+             (3 * a, [3 * u for u in A]),
+             (a / 4, [u / 4 for u in A]),
+             (-a, [-u for u in A]),
+             (~a, [~u for u in A]))
+    for result, expected in cases:
+        for r, e in zip(result, expected):
+            assert (r - e).magSq() < geom.EPSILON
+    for r, e in zip(a @ b, [u @ v for u, v in zip(A, B)]):
+        assert abs(r - e) < geom.EPSILON
+    for r, e in zip(abs(a), [abs(u) for u in A]):
+        assert abs(r - e) < geom.EPSILON
+
+def test_broadcast_vector():
+    """Test that a single vector is broadcast against every vector"""
+    a = geom.VectorArray([(1, 0, 0), (0, 1, 0)])
+    v = geom.Vector([0, 0, 1])
+    assert list(a + v) == [geom.Vector([1, 0, 1]), geom.Vector([0, 1, 1])]
+    assert list(v - a) == [geom.Vector([-1, 0, 1]), geom.Vector([0, -1, 1])]
+    assert list(a * v) == [u * v for u in a]
+    assert list(v * a) == [v * u for u in a]
+    assert (a @ (1, 2, 3)).tolist() == [1, 2]
+    assert (a == (1, 0, 0)).tolist() == [True, False]
+    assert (v @ a).tolist() == [0, 0]
+
+def test_operation_errors():
+    """Test that invalid operands raise the same errors as Vector"""
+    a = geom.VectorArray([(1, 2), (3, 4)])
+    with pytest.raises(TypeError):
+        a + ('1', 2)
+    with pytest.raises(ValueError):
+        a + (1, 2, 3)
+    with pytest.raises(ValueError):
+        a + geom.VectorArray([(1, 2)])
+    with pytest.raises(ValueError):
+        a * (1, 2)
+    with pytest.raises(TypeError):
+        a / True
+    with pytest.raises(ZeroDivisionError):
+        a / 0
+    with pytest.raises(ValueError):
+        ~geom.VectorArray([(0, 0), (1, 1)])